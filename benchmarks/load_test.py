@@ -0,0 +1,187 @@
+"""
+Load test for the MCP server against the synthetic Riot API.
+
+Starts `python src/server.py` with RIOT_CASSETTE_MODE=stub and drives it with many concurrent
+MCP client sessions, so JSON-RPC framing, schema validation and the transport are all measured.
+Over SSE every session shares one server process; over stdio each session spawns its own.
+
+    python benchmarks/load_test.py --sessions 50 --duration 10 --players 1000
+    python benchmarks/load_test.py --transport stdio --tools lol_get_player_summary
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+SERVER = Path(__file__).resolve().parent.parent / "src" / "server.py"
+
+# Tool -> arguments, "{player}" replaced by a stub player
+LOAD_TEST_TOOLS = {
+    "lol_get_player_summary": {"game_name": "{player}", "tag_line": "STUB"},
+    "lol_get_recent_matches": {"game_name": "{player}", "tag_line": "STUB", "count": 10},
+    "lol_get_champion_mastery": {"game_name": "{player}", "tag_line": "STUB", "champion_name": "Ahri"},
+    "lol_get_server_status": {},
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """q-th percentile (0-100) of already sorted values, nearest rank"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+async def run_load_test(
+    sessions: int = 50,
+    duration: float = 10.0,
+    tools: list[str] | None = None,
+    players: int = 1000,
+    transport: str = "sse",
+    port: int = 8765,
+) -> dict[str, dict[str, Any]]:
+    """
+    Drive a server process running against the stub Riot API with concurrent MCP client sessions.
+
+    Each tool runs as its own phase, every session calling it in a loop for `duration` seconds
+    with a random stub player, so server CPU and memory (read through riot_get_diagnostics)
+    can be attributed to that tool. Returns per-tool throughput, latency and resource use.
+    """
+    env = {
+        **os.environ,
+        "RIOT_CASSETTE_MODE": "stub",
+        "FASTMCP_PORT": str(port),
+        "FASTMCP_LOG_LEVEL": "WARNING",
+    }
+    command = [str(SERVER), "--transport", transport]
+    # Every MCP message is an HTTP request on the client side; keep them out of the report
+    for name in ("httpx", "mcp.client"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    async def usage(clients: list[ClientSession]) -> tuple[float, float]:
+        """Total CPU seconds and resident MB across the server processes"""
+        reports = await asyncio.gather(*(client.call_tool("riot_get_diagnostics", {}) for client in clients))
+        processes = [json.loads(report.content[0].text)["process"] for report in reports]
+        return sum(p["cpuSeconds"] for p in processes), sum(p["rssMb"] or 0 for p in processes)
+
+    results: dict[str, dict[str, Any]] = {}
+    async with AsyncExitStack() as stack:
+        if transport == "sse":
+            server = await asyncio.create_subprocess_exec(
+                sys.executable, *command, env=env, stdout=asyncio.subprocess.DEVNULL
+            )
+
+            async def stop_server() -> None:
+                # uvicorn's graceful shutdown can wait on SSE streams that never end
+                server.terminate()
+                try:
+                    await asyncio.wait_for(server.wait(), 5)
+                except TimeoutError:
+                    server.kill()
+                    await server.wait()
+
+            stack.push_async_callback(stop_server)
+            for _ in range(100):
+                try:
+                    _, writer = await asyncio.open_connection("127.0.0.1", port)
+                    writer.close()
+                    break
+                except OSError:
+                    if server.returncode is not None:
+                        raise RuntimeError(f"Server exited with code {server.returncode}")
+                    await asyncio.sleep(0.1)
+            streams = [
+                await stack.enter_async_context(sse_client(f"http://127.0.0.1:{port}/sse")) for _ in range(sessions)
+            ]
+        else:
+            params = StdioServerParameters(command=sys.executable, args=command, env=env)
+            streams = [await stack.enter_async_context(stdio_client(params)) for _ in range(sessions)]
+        clients = [await stack.enter_async_context(ClientSession(*stream)) for stream in streams]
+        await asyncio.gather(*(client.initialize() for client in clients))
+        servers = clients[:1] if transport == "sse" else clients
+
+        for tool in tools or list(LOAD_TEST_TOOLS):
+            arguments = LOAD_TEST_TOOLS.get(tool, {})
+            latencies: list[float] = []
+            errors = 0
+
+            async def session_loop(client: ClientSession, seed: int) -> None:
+                nonlocal errors
+                rng = random.Random(seed)
+                while time.monotonic() < stop_at:
+                    player = f"player{rng.randrange(players)}"
+                    args = {k: v.format(player=player) if isinstance(v, str) else v for k, v in arguments.items()}
+                    started = time.perf_counter()
+                    try:
+                        result = await client.call_tool(tool, args)
+                        errors += result.isError
+                    except Exception:
+                        errors += 1
+                    latencies.append(time.perf_counter() - started)
+
+            cpu_before, _ = await usage(servers)
+            client_cpu = time.process_time()
+            started_at = time.monotonic()
+            stop_at = started_at + duration
+            await asyncio.gather(*(session_loop(client, i) for i, client in enumerate(clients)))
+            elapsed = time.monotonic() - started_at
+            client_cpu = time.process_time() - client_cpu
+            cpu_after, rss = await usage(servers)
+
+            latencies.sort()
+            results[tool] = {
+                "calls": len(latencies),
+                "errors": errors,
+                "callsPerSecond": round(len(latencies) / elapsed, 1),
+                "p50Ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95Ms": round(percentile(latencies, 95) * 1000, 1),
+                "p99Ms": round(percentile(latencies, 99) * 1000, 1),
+                "maxMs": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+                "serverCpuPercent": round((cpu_after - cpu_before) / elapsed * 100, 1),
+                "serverRssMb": round(rss, 1),
+                "clientCpuPercent": round(client_cpu / elapsed * 100, 1),
+            }
+    return results
+
+
+def print_report(results: dict[str, dict[str, Any]], sessions: int, transport: str) -> None:
+    print(f"{sessions} concurrent {transport} sessions against the stub Riot API")
+    print(
+        f"{'tool':<28}{'calls/s':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'srv cpu%':>10}{'srv MB':>8}{'cli cpu%':>10}"
+    )
+    for tool, r in results.items():
+        print(
+            f"{tool:<28}{r['callsPerSecond']:>9}{r['errors']:>8}{r['p50Ms']:>9}{r['p95Ms']:>9}{r['p99Ms']:>9}"
+            f"{r['maxMs']:>9}{r['serverCpuPercent']:>10}{r['serverRssMb']:>8}{r['clientCpuPercent']:>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["stdio", "sse"], default="sse")
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent client sessions")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per tool")
+    parser.add_argument("--tools", help=f"comma-separated tools (default {','.join(LOAD_TEST_TOOLS)})")
+    parser.add_argument("--players", type=int, default=1000, help="distinct stub players")
+    parser.add_argument("--port", type=int, default=8765, help="SSE port")
+    args = parser.parse_args()
+
+    tools = args.tools.split(",") if args.tools else None
+    results = asyncio.run(run_load_test(args.sessions, args.duration, tools, args.players, args.transport, args.port))
+    print_report(results, args.sessions, args.transport)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Startup benchmark for the stdio server.
+
+Spawns `python src/server.py` repeatedly and measures the time from process start to the
+`initialize` response, to the `tools/list` response that follows it, and (in a separate
+process) to the response of a first `tools/call` made without listing tools. No Riot API
+traffic is made; a placeholder RIOT_API_KEY is used when none is set.
+
+    python benchmarks/startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVER = Path(__file__).resolve().parent.parent / "src" / "server.py"
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+# Answered from the local deck index, so it never reaches the Riot API
+CALL_TOOL = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "lor_get_deck_stats", "arguments": {}}}
+
+
+def _send(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def _wait_for(proc: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"server exited before answering request {request_id}")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def _spawn() -> subprocess.Popen:
+    env = {**os.environ, "RIOT_API_KEY": os.environ.get("RIOT_API_KEY", "RGAPI-startup-benchmark")}
+    return subprocess.Popen(
+        [sys.executable, str(SERVER)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+
+
+def measure_once(request: dict) -> tuple[float, float, dict]:
+    """Return (seconds to initialize response, seconds to the response to `request`, that response)"""
+    started = time.perf_counter()
+    proc = _spawn()
+    try:
+        _send(proc, INITIALIZE)
+        _wait_for(proc, 1)
+        initialized_at = time.perf_counter()
+        _send(proc, INITIALIZED)
+        _send(proc, request)
+        response = _wait_for(proc, 2)
+        answered_at = time.perf_counter()
+    finally:
+        proc.kill()
+        proc.wait()
+    return initialized_at - started, answered_at - started, response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    measure_once(LIST_TOOLS)  # warm the filesystem and bytecode caches
+    listed = [measure_once(LIST_TOOLS) for _ in range(args.runs)]
+    called = [measure_once(CALL_TOOL) for _ in range(args.runs)]
+    initialize = [s[0] * 1000 for s in listed + called]
+
+    print(f"runs: {args.runs}, tools: {len(listed[0][2]['result']['tools'])}")
+    print(f"initialize response: median {statistics.median(initialize):.0f} ms, max {max(initialize):.0f} ms")
+    for label, samples in (("tools/list", listed), ("first tools/call", called)):
+        ms = [s[1] * 1000 for s in samples]
+        print(f"{label} response: median {statistics.median(ms):.0f} ms, max {max(ms):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Synthetic Riot API for tests and load tests (RIOT_CASSETTE_MODE=stub).
+
+Kept out of server.py: the server only imports it when running in stub mode.
+"""
+
+import asyncio
+import os
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+# Seconds before every stub response
+RIOT_STUB_LATENCY = float(os.getenv("RIOT_STUB_LATENCY", "0.02"))
+# Rate limits the stub reports, high enough that the limiter never throttles a load test
+STUB_RATE_LIMIT_HEADERS = {
+    "X-App-Rate-Limit": "100000:1,6000000:120",
+    "X-App-Rate-Limit-Count": "1:1,1:120",
+}
+STUB_CHAMPIONS = {103: "Ahri", 157: "Yasuo", 777: "Yone", 145: "Kaisa", 62: "MonkeyKing", 238: "Zed"}
+# Challenge id -> (name, thresholds); every stub player sits at GOLD in each
+STUB_CHALLENGES = {
+    101000: ("ARAM Authority", {"IRON": 10, "GOLD": 100, "PLATINUM": 250, "MASTER": 1000}),
+    202303: ("Jungle Diff", {"IRON": 1, "GOLD": 20, "DIAMOND": 75}),
+    301100: ("Damage Dealer", {"IRON": 5, "GOLD": 50}),
+}
+# The only Data Dragon language the stub serves
+LANGUAGE = "en_US"
+
+
+class StubRiotTransport(httpx.AsyncBaseTransport):
+    """
+    Synthetic Riot API and Data Dragon for tests and load tests.
+
+    Answers the routes the LoL player tools use with deterministic payloads derived from the
+    URL, after a fixed latency and with rate limits that never throttle. Other routes 404.
+    """
+
+    def __init__(self, latency: float = RIOT_STUB_LATENCY):
+        self.latency = latency
+        self.routes: list[tuple[re.Pattern, Callable[[re.Match, httpx.QueryParams], Any]]] = [
+            (re.compile(r"/accounts/by-riot-id/([^/]+)/([^/]+)$"), self._account),
+            (re.compile(r"/accounts/by-puuid/([^/]+)$"), lambda m, q: self._account_by_puuid(m.group(1))),
+            (re.compile(r"/summoners/by-puuid/([^/]+)$"), lambda m, q: {"puuid": m.group(1), "summonerLevel": 250}),
+            (re.compile(r"/league/v4/entries/by-puuid/"), lambda m, q: [self._league_entry()]),
+            (re.compile(r"/champion-masteries/by-puuid/[^/]+/by-champion/(\d+)$"), self._mastery),
+            (re.compile(r"/champion-masteries/by-puuid/[^/]+(/top)?$"), self._masteries),
+            (re.compile(r"/challenges/v1/player-data/"), self._player_challenges),
+            (re.compile(r"/challenges/v1/challenges/config$"), self._challenge_config),
+            (re.compile(r"/challenges/v1/challenges/percentiles$"), self._challenge_percentiles),
+            (re.compile(r"/matches/by-puuid/([^/]+)/ids$"), self._match_ids),
+            (re.compile(r"/matches/(STUB_[^/]+)$"), self._match),
+            (re.compile(r"/status/v\d/platform-data$"), lambda m, q: {"maintenances": [], "incidents": []}),
+            (re.compile(r"/api/versions\.json$"), lambda m, q: ["0.0.1"]),
+            (re.compile(r"/cdn/languages\.json$"), lambda m, q: [LANGUAGE]),
+            (re.compile(r"/data/[^/]+/champion\.json$"), self._champions),
+        ]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        for pattern, payload in self.routes:
+            match = pattern.search(request.url.path)
+            if match:
+                return httpx.Response(200, headers=STUB_RATE_LIMIT_HEADERS, json=payload(match, request.url.params))
+        return httpx.Response(404, json={"status": {"status_code": 404, "message": "Not stubbed"}})
+
+    def _account(self, m: re.Match, params: httpx.QueryParams) -> dict[str, Any]:
+        return {"puuid": f"stub-{m.group(1)}", "gameName": m.group(1), "tagLine": m.group(2)}
+
+    def _account_by_puuid(self, puuid: str) -> dict[str, Any]:
+        return {"puuid": puuid, "gameName": puuid.removeprefix("stub-"), "tagLine": "STUB"}
+
+    def _league_entry(self) -> dict[str, Any]:
+        return {
+            "queueType": "RANKED_SOLO_5x5",
+            "tier": "GOLD",
+            "rank": "II",
+            "leaguePoints": 50,
+            "wins": 60,
+            "losses": 55,
+        }
+
+    def _mastery(self, m: re.Match, params: httpx.QueryParams) -> dict[str, Any]:
+        champion_id = int(m.group(1))
+        return {"championId": champion_id, "championLevel": 7, "championPoints": champion_id * 1000, "lastPlayTime": 0}
+
+    def _masteries(self, m: re.Match, params: httpx.QueryParams) -> list[dict[str, Any]]:
+        return [
+            {"championId": champion_id, "championLevel": 7, "championPoints": champion_id * 1000, "lastPlayTime": 0}
+            for champion_id in STUB_CHAMPIONS
+        ]
+
+    def _player_challenges(self, m: re.Match, params: httpx.QueryParams) -> dict[str, Any]:
+        return {
+            "totalPoints": {"level": "GOLD", "current": 1500, "max": 5000},
+            "challenges": [
+                {"challengeId": challenge_id, "level": "GOLD", "value": thresholds["GOLD"] + 1, "percentile": rank / 10}
+                for rank, (challenge_id, (_, thresholds)) in enumerate(STUB_CHALLENGES.items(), start=1)
+            ],
+        }
+
+    def _challenge_config(self, m: re.Match, params: httpx.QueryParams) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": challenge_id,
+                "localizedNames": {LANGUAGE: {"name": name, "shortDescription": f"Stub challenge {name}"}},
+                "thresholds": thresholds,
+            }
+            for challenge_id, (name, thresholds) in STUB_CHALLENGES.items()
+        ]
+
+    def _challenge_percentiles(self, m: re.Match, params: httpx.QueryParams) -> dict[str, dict[str, float]]:
+        return {
+            str(challenge_id): {level: 0.5 for level in thresholds}
+            for challenge_id, (_, thresholds) in STUB_CHALLENGES.items()
+        }
+
+    def _match_ids(self, m: re.Match, params: httpx.QueryParams) -> list[str]:
+        start, count = int(params.get("start", 0)), int(params.get("count", 20))
+        return [f"STUB_{m.group(1)}_{i}" for i in range(start, start + count)]
+
+    def _match(self, m: re.Match, params: httpx.QueryParams) -> dict[str, Any]:
+        owner, _, index = m.group(1).removeprefix("STUB_").rpartition("_")
+        created = (int(time.time()) // 3600 - int(index)) * 3600 * 1000
+        champions = list(STUB_CHAMPIONS.items())
+        participants = []
+        for slot, puuid in enumerate([owner] + [f"stub-filler{i}" for i in range(9)]):
+            champion_id, champion_name = champions[(slot + int(index)) % len(champions)]
+            participants.append(
+                {
+                    "puuid": puuid,
+                    "riotIdGameName": puuid.removeprefix("stub-"),
+                    "riotIdTagline": "STUB",
+                    "championId": champion_id,
+                    "championName": champion_name,
+                    "teamId": 100 if slot < 5 else 200,
+                    "teamPosition": ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")[slot % 5],
+                    "win": (slot < 5) == (int(index) % 2 == 0),
+                    "kills": slot + 2,
+                    "deaths": 3,
+                    "assists": 7,
+                    "goldEarned": 11000,
+                    "totalMinionsKilled": 180,
+                    "neutralMinionsKilled": 10,
+                    "totalDamageDealtToChampions": 20000,
+                    "visionScore": 25,
+                    **{f"item{i}": 1001 + i for i in range(7)},
+                }
+            )
+        return {
+            "metadata": {"matchId": m.group(1), "participants": [p["puuid"] for p in participants]},
+            "info": {
+                "gameCreation": created,
+                "gameEndTimestamp": created + 1800 * 1000,
+                "gameDuration": 1800,
+                "gameMode": "CLASSIC",
+                "queueId": 420,
+                "gameVersion": "0.0.1",
+                "participants": participants,
+                "teams": [],
+            },
+        }
+
+    def _champions(self, m: re.Match, params: httpx.QueryParams) -> dict[str, Any]:
+        return {"data": {name: {"key": str(key), "id": name, "name": name} for key, name in STUB_CHAMPIONS.items()}}
@@ -1,103 +1,1614 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import TextContent
+import asyncio
+import atexit
+import base64
+import bisect
+import gzip
+import hashlib
+import heapq
 import httpx
+import json
+import logging
 import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import Any, Literal
 from dotenv import load_dotenv
 from datetime import datetime
 
 load_dotenv()
 
-mcp = FastMCP("riot")
+# Diagnostics go to stderr through logging: stdout carries the stdio JSON-RPC stream
+logger = logging.getLogger("riot")
 
-RIOT_API_KEY = os.getenv("RIOT_API_KEY")
-if not RIOT_API_KEY:
-    raise EnvironmentError("RIOT_API_KEY is not set in the environment variables.")
+
+class RiotMCP(FastMCP):
+    """
+    FastMCP server that defers building tool schemas until a client asks for them.
+
+    Registering a tool builds a pydantic model of its arguments, which was a large part of
+    the server's startup time. `@mcp.tool()` only records the function here; tools are
+    registered in full on the first `tools/list`, or one at a time when a tool is called
+    before the list has been fetched.
+    """
+
+    def __init__(self, name: str | None = None, **settings: Any):
+        super().__init__(name, **settings)
+        # Tools are looked up through FastMCP's private tool manager, which is not a stable API
+        if not hasattr(getattr(self, "_tool_manager", None), "get_tool"):
+            raise RuntimeError("Unsupported mcp version: FastMCP no longer has a tool manager with get_tool()")
+        self._pending_tools: dict[str, tuple[Callable[..., Any], dict[str, Any]]] = {}
+        self._tool_lanes: dict[str, str] = {}
+        self._unbounded_tools: set[str] = set()
+
+    def tool(
+        self, name: str | None = None, description: str | None = None, lane: str = "interactive", bounded: bool = True
+    ):
+        """
+        Register a tool whose upstream requests are queued in the given priority lane.
+
+        Unbounded tools (long crawls and exports) get no default deadline; a call can still pass one.
+        """
+        register = super().tool(name, description)
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            self._tool_lanes[name or fn.__name__] = lane
+            if not bounded:
+                self._unbounded_tools.add(name or fn.__name__)
+            return register(fn)
+
+        return decorator
+
+    def add_tool(self, fn: Callable[..., Any], name: str | None = None, **options: Any) -> None:
+        # Other keyword arguments (description, and whatever newer FastMCP releases add) are passed on as given
+        self._pending_tools[name or fn.__name__] = (fn, options)
+
+    def _register_pending(self, name: str | None = None) -> None:
+        names = list(self._pending_tools) if name is None else [name]
+        for tool_name in names:
+            pending = self._pending_tools.pop(tool_name, None)
+            if pending:
+                super().add_tool(pending[0], name=tool_name, **pending[1])
+
+    async def list_tools(self):
+        self._register_pending()
+        tools = await super().list_tools()
+        for tool in tools:
+            argument = UNBOUNDED_DEADLINE_ARGUMENT if tool.name in self._unbounded_tools else DEADLINE_ARGUMENT
+            tool.inputSchema.setdefault("properties", {})["deadline"] = argument
+        return tools
+
+    def tool_function(self, name: str) -> Callable[..., Any] | None:
+        """The function behind a tool, registering it first if needed"""
+        self._register_pending(name)
+        tool = self._tool_manager.get_tool(name)
+        return tool.fn if tool else None
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        self._register_pending(name)
+        arguments = dict(arguments)
+        requested = arguments.pop("deadline", None)
+        budget = float(requested) if requested else None if name in self._unbounded_tools else TOOL_DEADLINE
+        token = _DEADLINE.set(time.monotonic() + budget if budget else None)
+        freshness_token = _FRESHNESS.set([])
+        lane_token = _LANE.set(self._tool_lanes.get(name, "interactive"))
+        try:
+            async with asyncio.timeout(budget):
+                profile = PROFILES.get(name)
+                if profile is not None and profile.claim():
+                    return await profile.run(super().call_tool(name, arguments))
+                return await super().call_tool(name, arguments)
+        except ToolError as e:
+            # A mistyped platform is the caller's input error, answered like any other bad argument
+            if not isinstance(e.__cause__, UnknownPlatform):
+                raise
+            error = {"error": str(e.__cause__), "suggestion": e.__cause__.suggestion}
+            return [TextContent(type="text", text=json.dumps(error, indent=2))]
+        except TimeoutError:
+            raise DeadlineExceeded(f"{name} did not finish within its {budget:g}s deadline") from None
+        finally:
+            _LANE.reset(lane_token)
+            _FRESHNESS.reset(freshness_token)
+            _DEADLINE.reset(token)
+
+
+mcp = RiotMCP("riot")
+
+# Checked when the server starts or first calls the Riot API (require_api_key), not at import
+RIOT_API_KEY = os.getenv("RIOT_API_KEY", "")
 
 # ============================================================================
 # CONSTANTS & TYPE DEFINITIONS
 # ============================================================================
 
 # Platform routing for platform-specific endpoints (summoner, league, etc.)
-PLATFORM_ROUTING = {
-    "na": "na1",
-    "euw": "euw1",
-    "kr": "kr",
-    "br": "br1",
-    "las": "la1",
-    "lan": "la2",
-    "ru": "ru",
-    "tr": "tr1",
-    "jp": "jp1",
-    "oc": "oc1",
-    "pbe": "pbe1",
+@dataclass(frozen=True)
+class Shard:
+    """Where one platform's requests go, per API family"""
+
+    # Platform host: summoner, league, mastery, spectator, status, clash, challenges
+    platform: str
+    # LoL and TFT match-v5 cluster
+    match: str
+    # Nearest account-v1 cluster; there is no SEA account cluster
+    account: str
+    # Legends of Runeterra match and ranked cluster
+    lor: str
+    # VALORANT shard, if the platform has one
+    valorant: str | None
+
+
+SHARDS = {
+    "na": Shard("na1", "americas", "americas", "americas", "na"),
+    "br": Shard("br1", "americas", "americas", "americas", "br"),
+    "lan": Shard("la1", "americas", "americas", "americas", "latam"),
+    "las": Shard("la2", "americas", "americas", "americas", "latam"),
+    "euw": Shard("euw1", "europe", "europe", "europe", "eu"),
+    "eune": Shard("eun1", "europe", "europe", "europe", "eu"),
+    "tr": Shard("tr1", "europe", "europe", "europe", "eu"),
+    "ru": Shard("ru", "europe", "europe", "europe", "eu"),
+    "me": Shard("me1", "europe", "europe", "europe", "eu"),
+    "kr": Shard("kr", "asia", "asia", "sea", "kr"),
+    "jp": Shard("jp1", "asia", "asia", "sea", "ap"),
+    "oc": Shard("oc1", "sea", "asia", "sea", "ap"),
+    "sg": Shard("sg2", "sea", "asia", "sea", "ap"),
+    "tw": Shard("tw2", "sea", "asia", "sea", "ap"),
+    "vn": Shard("vn2", "sea", "asia", "sea", "ap"),
+    "pbe": Shard("pbe1", "americas", "americas", "americas", None),
+}
+
+# Accepted spellings: short names, platform ids (euw1, la2...) and common alternatives
+PLATFORM_ALIASES = {
+    **{name: name for name in SHARDS},
+    **{shard.platform: name for name, shard in SHARDS.items()},
+    "oce": "oc",
+    # PH2 and TH2 were merged into SG2
+    "ph": "sg",
+    "ph2": "sg",
+    "th": "sg",
+    "th2": "sg",
 }
 
-# Regional routing for regional endpoints (match, summoner, clash, etc.)
-REGIONAL_ROUTING = {
-    "americas": "americas",
-    "europe": "europe",
-    "asia-pacific": "asia-pacific",
-    "sea": "sea",
+# Champion cache, keyed by Data Dragon language (validated, see resolve_language)
+CHAMPION_MAP: dict[str, dict[int, str]] = {}
+DEFAULT_LANGUAGE = "en_US"
+
+# Nicknames and alternate spellings, mapped to Data Dragon champion ids
+CHAMPION_ALIASES = {
+    "asol": "AurelionSol",
+    "blitz": "Blitzcrank",
+    "cait": "Caitlyn",
+    "cass": "Cassiopeia",
+    "cho": "Chogath",
+    "ez": "Ezreal",
+    "fiddle": "Fiddlesticks",
+    "gp": "Gangplank",
+    "heimer": "Heimerdinger",
+    "j4": "JarvanIV",
+    "jarvan": "JarvanIV",
+    "kass": "Kassadin",
+    "kat": "Katarina",
+    "kog": "KogMaw",
+    "lb": "Leblanc",
+    "leesin": "LeeSin",
+    "liss": "Lissandra",
+    "malph": "Malphite",
+    "mf": "MissFortune",
+    "mundo": "DrMundo",
+    "nid": "Nidalee",
+    "nunu": "Nunu",
+    "rene": "Renekton",
+    "renata": "Renata",
+    "sej": "Sejuani",
+    "tf": "TwistedFate",
+    "tk": "TahmKench",
+    "trist": "Tristana",
+    "trynd": "Tryndamere",
+    "voli": "Volibear",
+    "ww": "Warwick",
+    "xin": "XinZhao",
+    "yi": "MasterYi",
 }
 
-# VALORANT region mapping
-VALORANT_REGIONS = {
-    "na": "na",
-    "euw": "eu",
-    "kr": "ap",
-    "br": "br",
-    "las": "latam",
-    "lan": "latam",
+# Minimum similarity for a fuzzy champion name match, and the lead it needs over the next champion;
+# shorter queries are never guessed, only answered with suggestions
+CHAMPION_FUZZY_THRESHOLD = 0.5
+CHAMPION_FUZZY_MARGIN = 0.05
+CHAMPION_FUZZY_MIN_LENGTH = 3
+CHAMPION_SUGGESTIONS = 5
+
+# Riot ID -> PUUID lookups rarely change
+PUUID_CACHE_TTL = 3600.0
+
+# (platform_routing, puuid) -> successive full champion-mastery snapshots, oldest first. Kept in
+# this process only, even with a shared backend; past MASTERY_SNAPSHOT_PLAYERS the least recently
+# used player is dropped, so players polled often keep their baseline
+MASTERY_SNAPSHOTS: OrderedDict[tuple[str, str], list[dict[str, Any]]] = OrderedDict()
+MASTERY_SNAPSHOT_TTL = 300.0
+MASTERY_SNAPSHOT_HISTORY = 24
+MASTERY_SNAPSHOT_PLAYERS = 2000
+
+# Live games change slowly enough for overlays polling every few seconds to share a response
+SPECTATOR_CACHE_TTL = 10.0
+
+# Shared backend for the response cache, single-flight locks and rate limit counters:
+# "memory" (this process only) or a redis:// URL shared by every server instance
+RIOT_SHARED_BACKEND = os.getenv("RIOT_SHARED_BACKEND", "memory")
+RIOT_BACKEND_PREFIX = os.getenv("RIOT_BACKEND_PREFIX", "riot:")
+RATE_COUNTER_MAX_ENTRIES = 1024
+# Negative-cache markers and rate limit pauses; kept apart from cached responses in memory, so they
+# are neither counted as cache hits/misses nor budgeted and evicted with them
+CONTROL_KEY_PREFIXES = ("404:", "rl:blocked:")
+
+# In-process response cache: an approximate memory budget shared by named partitions, each
+# with its own eviction policy. Keys go to the first partition with a matching fragment
+RIOT_CACHE_MEMORY_MB = float(os.getenv("RIOT_CACHE_MEMORY_MB", "256"))
+CACHE_PARTITIONS = [
+    ("static", "lfu", ("ddragon:",)),
+    ("matches", "lru", ("/matches/", "ids:")),
+    ("accounts", "lru", ("/riot/account/",)),
+    ("ranks", "lru", ("/league/", "/summoner/")),
+    ("other", "lru", ("",)),
+]
+# Parsed JSON takes about this many times its encoded size in memory
+CACHE_OBJECT_OVERHEAD = 3
+SINGLE_FLIGHT_POLL = 0.05
+
+# App rate limit ("count:seconds,...") assumed until Riot reports the key's real limits
+DEFAULT_APP_RATE_LIMIT = os.getenv("RIOT_APP_RATE_LIMIT", "20:1,100:120")
+
+# Finished matches never change; challenge progress moves slowly
+MATCH_CACHE_TTL = 3600.0
+CHALLENGES_CACHE_TTL = 300.0
+DDRAGON_CACHE_TTL = 6 * 3600.0
+# Challenge names, thresholds and level percentiles change with patches and nightly recounts
+CHALLENGE_CONFIG_TTL = 6 * 3600.0
+CHALLENGE_LEVELS = (
+    "NONE", "IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER"
+)
+# Items cheaper than this (components, consumables, starters) are left out of build summaries
+COMPLETED_ITEM_MIN_GOLD = 1000
+# Rune stat shards are not part of runesReforged.json
+STAT_SHARDS = {
+    5001: "Health Scaling",
+    5002: "Armor",
+    5003: "Magic Resist",
+    5005: "Attack Speed",
+    5007: "Ability Haste",
+    5008: "Adaptive Force",
+    5010: "Move Speed",
+    5011: "Health",
+    5013: "Tenacity and Slow Resist",
+}
+# Position codes for the build index; 0 is a missing or unknown position
+LOL_POSITIONS = ("", "TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+# Local match indexes keep the most recently ingested matches; past their cap the oldest
+# INDEX_TRIM_FRACTION of the cap is dropped in one pass
+LOL_BUILDS_MAX_MATCHES = 50000
+TFT_META_MAX_MATCHES = 20000
+LOR_DECKS_MAX_MATCHES = 20000
+INDEX_TRIM_FRACTION = 0.1
+
+# Stale-while-revalidate: past its fresh TTL an entry is still served at once and refreshed in
+# the background, until it is SWR_MAX_STALE seconds past that TTL and must be refetched inline
+RANK_CACHE_TTL = 60.0
+SUMMONER_CACHE_TTL = 300.0
+STATUS_CACHE_TTL = 60.0
+SWR_MAX_STALE = float(os.getenv("RIOT_SWR_MAX_STALE", "900"))
+SWR_STATS = {"fresh": 0, "stale": 0, "miss": 0, "revalidated": 0}
+
+# 404s are cached briefly so bots polling offline players or misspelled Riot IDs spend no
+# rate budget; per-endpoint TTLs are matched against the method key (see method_key)
+NOT_FOUND_CACHE_TTL = 30.0
+SPECTATOR_NOT_FOUND_TTL = 60.0
+RIOT_ID_NOT_FOUND_TTL = 300.0
+NOT_FOUND_TTLS = [
+    ("/spectator/", SPECTATOR_NOT_FOUND_TTL),
+    ("/accounts/by-riot-id/", RIOT_ID_NOT_FOUND_TTL),
+]
+NOT_FOUND_STATS = {"cached": 0, "avoided": 0}
+
+# (age_seconds, stale) of every stale-while-revalidate response served to the current tool call
+_FRESHNESS: ContextVar[list[tuple[float, bool]] | None] = ContextVar("riot_freshness", default=None)
+
+MATCH_PATHS = {
+    "lol": "/lol/match/v5/matches",
+    "tft": "/tft/match/v1/matches",
+    "lor": "/lor/match/v1/matches",
 }
 
-# Map platform to region for cases where both are needed
-PLATFORM_TO_REGION = {
-    "na": "americas",
-    "br": "americas",
-    "las": "americas",
-    "lan": "americas",
-    "euw": "europe",
-    "kr": "asia-pacific",
-    "jp": "asia-pacific",
-    "oc": "asia-pacific",
-    "ru": "europe",
-    "tr": "europe",
-    "pbe": "americas",
+# Match id lists are paged by the API in at most 100 ids per request. Lists are cached per
+# player and game: served as-is while fresh, then brought up to date with one short head
+# request merged at the first known id, and kept for MATCH_IDS_CACHE_TTL for that merge
+MATCH_IDS_PAGE_SIZE = 100
+MATCH_IDS_FRESH_TTL = 60.0
+MATCH_IDS_CACHE_TTL = 3600.0
+MATCH_IDS_HEAD_PAGE = 20
+MATCH_IDS_STATS = {"served": 0, "extended": 0, "headRefreshed": 0, "fetched": 0}
+
+# Apex ladders, per game, for crawls and exports
+LADDER_PATHS = {
+    "lol": "/lol/league/v4/{tier}leagues/by-queue/RANKED_SOLO_5x5",
+    "tft": "/tft/league/v1/{tier}",
 }
 
-# Champion cache
-CHAMPION_MAP: dict[str, dict[int, str]] = {}
+# Match exports land here, written in chunks of EXPORT_CHUNK_SIZE matches to bound memory
+RIOT_EXPORT_DIR = os.getenv("RIOT_EXPORT_DIR", "exports")
+EXPORT_CHUNK_SIZE = 250
+
+# Flattened participant-row schema per game: (column, type)
+EXPORT_COLUMNS = {
+    "lol": [
+        ("matchId", "string"),
+        ("gameCreation", "int"),
+        ("gameDuration", "int"),
+        ("gameVersion", "string"),
+        ("queueId", "int"),
+        ("puuid", "string"),
+        ("riotId", "string"),
+        ("teamId", "int"),
+        ("win", "bool"),
+        ("championId", "int"),
+        ("championName", "string"),
+        ("teamPosition", "string"),
+        ("champLevel", "int"),
+        ("kills", "int"),
+        ("deaths", "int"),
+        ("assists", "int"),
+        ("cs", "int"),
+        ("goldEarned", "int"),
+        ("damageToChampions", "int"),
+        ("visionScore", "int"),
+        ("items", "list<int>"),
+        ("summonerSpells", "list<int>"),
+    ],
+    "tft": [
+        ("matchId", "string"),
+        ("gameDatetime", "int"),
+        ("gameLength", "float"),
+        ("gameVersion", "string"),
+        ("queueId", "int"),
+        ("setNumber", "int"),
+        ("puuid", "string"),
+        ("placement", "int"),
+        ("level", "int"),
+        ("goldLeft", "int"),
+        ("lastRound", "int"),
+        ("totalDamageToPlayers", "int"),
+        ("traits", "list<string>"),
+        ("units", "list<string>"),
+    ],
+}
+
+# Local indexes fed with every match the server fetches, per game
+MATCH_INGESTORS: dict[str, list[Callable[[dict[str, Any]], None]]] = {"lol": [], "tft": [], "lor": []}
+
+# TFT meta aggregation only counts ranked games
+TFT_RANKED_QUEUE_ID = 1100
+
+# Champion leaderboards: rolling window over a tracked player pool, top-K kept per champion/queue
+LEADERBOARD_WINDOW_DAYS = 30
+LEADERBOARD_TOP_K = 100
+# Queue key holding every queue's games together
+ALL_QUEUES = 0
+
+# LoR deck code faction ids (github.com/RiotGames/LoRDeckCodes)
+LOR_FACTIONS = {0: "DE", 1: "FR", 2: "IO", 3: "NX", 4: "PZ", 5: "SI", 6: "BW", 7: "SH", 9: "MT", 10: "BC", 12: "RU"}
+
+# Rate limit windows from the last response per host: (limit, count, window_seconds, observed_at)
+RATE_LIMIT_WINDOWS: dict[str, list[tuple[int, int, int, float]]] = {}
+RATE_LIMIT_BLOCKED_UNTIL: dict[str, float] = {}
+
+# Rate limits (count, window_seconds) reported by Riot, per host and per (host, method)
+APP_RATE_LIMITS: dict[str, list[tuple[int, int]]] = {}
+METHOD_RATE_LIMITS: dict[tuple[str, str], list[tuple[int, int]]] = {}
+
+# Path segments replaced by placeholders when naming a rate-limited method
+METHOD_PATH_PARAMS = [
+    (re.compile(r"/by-riot-id/[^/]+/[^/]+"), "/by-riot-id/{gameName}/{tagLine}"),
+    (re.compile(r"/(by-puuid|by-summoner|by-champion|by-team|player-data|teams)/[^/]+"), r"/\1/{id}"),
+    (re.compile(r"/matches/(?!by-puuid)[^/]+"), "/matches/{matchId}"),
+    (re.compile(r"/entries/(RANKED_[^/]+)/[A-Z]+/[IV]+"), r"/entries/\1/{tier}/{division}"),
+]
+
+# Background prefetch of likely follow-up requests
+PREFETCH_ENABLED = os.getenv("RIOT_PREFETCH", "1") != "0"
+PREFETCH_MIN_SPARE = 0.5
+PREFETCH_QUEUE_SIZE = 200
+PREFETCH_IDLE_POLL = 0.25
+PREFETCH_STATS = {"queued": 0, "completed": 0, "dropped": 0}
+
+_PREFETCHING: ContextVar[bool] = ContextVar("riot_prefetching", default=False)
+_FOREGROUND_IN_FLIGHT = 0
+_PREFETCH_QUEUE: asyncio.Queue | None = None
+_PREFETCH_PENDING: set[str] = set()
+_PREFETCH_WORKER: asyncio.Task | None = None
+
+# Upper bound on concurrent fetches within one tool call; the per-host adaptive limit decides how many
+# of them are in flight upstream at once. Fetches still queued hold no rate budget and are cancelled
+# (in flight requests included) when the call is cancelled or runs out of deadline.
+FAN_OUT_CONCURRENCY = 32
+
+# Record upstream HTTP traffic to a cassette file, or replay it with no network:
+# RIOT_CASSETTE_MODE=record|replay, replay latencies scaled by RIOT_CASSETTE_LATENCY (0 = instant).
+# RIOT_CASSETTE_MODE=stub answers from the synthetic Riot API in riot_stub.py (tests and load tests)
+RIOT_CASSETTE_MODE = os.getenv("RIOT_CASSETTE_MODE", "")
+RIOT_CASSETTE = os.getenv("RIOT_CASSETTE", "riot-cassette.jsonl.gz")
+RIOT_CASSETTE_LATENCY = float(os.getenv("RIOT_CASSETTE_LATENCY", "1.0"))
+RIOT_CASSETTE_REDACT = os.getenv("RIOT_CASSETTE_REDACT", "1") != "0"
+# Response headers kept in a cassette; the rate limiter reads these
+CASSETTE_HEADERS = (
+    "content-type",
+    "retry-after",
+    "x-app-rate-limit",
+    "x-app-rate-limit-count",
+    "x-method-rate-limit",
+    "x-method-rate-limit-count",
+)
+# Recorded responses are buffered and appended to the cassette this many at a time, off the event loop
+CASSETTE_FLUSH_RECORDS = 50
+PUUID_PATTERN = re.compile(r"(?<![A-Za-z0-9_-])[A-Za-z0-9_-]{78}(?![A-Za-z0-9_-])")
+
+# End-to-end budget (seconds) for one tool call; a call may pass its own "deadline" argument
+TOOL_DEADLINE = float(os.getenv("RIOT_TOOL_DEADLINE", "30"))
+# Budget held back from optional branches so the tool can still assemble its partial result
+DEADLINE_RESERVE = 1.0
+DEADLINE_ARGUMENT = {
+    "type": "number",
+    "title": "Deadline",
+    "description": f"Seconds this call may take end-to-end (default {TOOL_DEADLINE:g})",
+}
+UNBOUNDED_DEADLINE_ARGUMENT = {
+    **DEADLINE_ARGUMENT,
+    "description": "Seconds this call may take end-to-end (default no limit)",
+}
+
+# time.monotonic() by which the current tool call must finish
+_DEADLINE: ContextVar[float | None] = ContextVar("riot_deadline", default=None)
+
+# Priority lanes for upstream requests, highest first; tools declare theirs with @mcp.tool(lane=...)
+REQUEST_LANES = ("interactive", "background", "bulk")
+# Share of admissions a lower lane is guaranteed while higher lanes keep a host busy
+LANE_MIN_SHARE = {"background": 0.2, "bulk": 0.1}
+LANE_STATS = {lane: {"admitted": 0, "queued": 0, "totalWait": 0.0, "maxWait": 0.0} for lane in REQUEST_LANES}
+
+_LANE: ContextVar[str] = ContextVar("riot_lane", default="interactive")
+
+# Adaptive (AIMD) limit on requests in flight per routing host: it grows while responses stay fast
+# and is cut by ADAPTIVE_BACKOFF on 429s, upstream timeouts and 5xx, and latency spikes
+RIOT_MAX_CONCURRENCY = int(os.getenv("RIOT_MAX_CONCURRENCY", "64"))
+ADAPTIVE_INITIAL_CONCURRENCY = 4
+ADAPTIVE_MIN_CONCURRENCY = 1
+ADAPTIVE_BACKOFF = 0.5
+# A response slower than LATENCY_SPIKE_RATIO x the host's baseline latency (and LATENCY_SPIKE_FLOOR seconds)
+LATENCY_SPIKE_RATIO = 2.0
+LATENCY_SPIKE_FLOOR = 0.25
+LATENCY_BASELINE_ALPHA = 0.05
+CONGESTION_STATUSES = {429: "throttled", 502: "unavailable", 503: "unavailable", 504: "timeout"}
+CONGESTION_SIGNALS = ("throttled", "unavailable", "timeout", "latency")
+
+# Tool profiling (riot_profile_tool); sampled stacks and .prof files are written to RIOT_PROFILE_DIR
+RIOT_PROFILE_DIR = os.getenv("RIOT_PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+# ============================================================================
+# SHARED BACKEND - CACHE, SINGLE-FLIGHT LOCKS, RATE LIMIT COUNTERS
+# ============================================================================
+
+
+def approximate_size(value: Any, encoded_size: int | None = None) -> int:
+    """Approximate resident bytes of a cached JSON-like value, from its encoded size when it is known"""
+    if encoded_size is None:
+        encoded_size = len(json.dumps(value, separators=(",", ":"), default=str))
+    return encoded_size * CACHE_OBJECT_OVERHEAD
+
+
+class BoundedCache:
+    """
+    One named partition of the in-process cache, with byte accounting and LRU or LFU eviction.
+
+    LFU keeps keys in buckets by use count, so a hit moves a key up one bucket and an eviction
+    takes the oldest key of the lowest bucket, both without scanning the cache.
+    """
+
+    def __init__(self, name: str, policy: str = "lru"):
+        self.name = name
+        self.policy = policy
+        # key -> (expires_at, value, size); dict order is recency for LRU
+        self.entries: dict[str, tuple[float, Any, int]] = {}
+        # LFU only: key -> use count, and use count -> keys in the order they reached it
+        self.uses: dict[str, int] = {}
+        self.buckets: dict[int, dict[str, None]] = {}
+        self.min_uses = 0
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: str, now: float) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= now:
+            self.discard(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lfu":
+            uses = self.uses[key]
+            self._unlink(key, uses)
+            if uses == self.min_uses and uses not in self.buckets:
+                self.min_uses = uses + 1
+            self._link(key, uses + 1)
+        else:
+            self.entries[key] = self.entries.pop(key)
+        return entry[1]
+
+    def put(self, key: str, value: Any, expires_at: float, size: int) -> None:
+        self.discard(key)
+        self.entries[key] = (expires_at, value, size)
+        self.bytes += size
+        if self.policy == "lfu":
+            self._link(key, 1)
+            self.min_uses = 1
+
+    def _link(self, key: str, uses: int) -> None:
+        self.uses[key] = uses
+        self.buckets.setdefault(uses, {})[key] = None
+
+    def _unlink(self, key: str, uses: int) -> None:
+        bucket = self.buckets[uses]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[uses]
+
+    def discard(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+            uses = self.uses.pop(key, None)
+            if uses is not None:
+                self._unlink(key, uses)
+
+    def evict_one(self) -> None:
+        if self.policy == "lfu":
+            # Discards can empty the lowest bucket; only then is the (short) list of counts searched
+            if self.min_uses not in self.buckets:
+                self.min_uses = min(self.buckets)
+            key = next(iter(self.buckets[self.min_uses]))
+        else:
+            key = next(iter(self.entries))
+        self.discard(key)
+        self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class MemoryBackend:
+    """
+    In-process backend; nothing is shared between server instances.
+
+    Cached values live in the CACHE_PARTITIONS caches. When their combined size passes the
+    memory budget, the largest partition evicts by its own policy until it fits again.
+    """
+
+    shared = False
+
+    def __init__(self, memory_budget: float = RIOT_CACHE_MEMORY_MB * 1024 * 1024):
+        self.memory_budget = memory_budget
+        self.caches = {name: BoundedCache(name, policy) for name, policy, _ in CACHE_PARTITIONS}
+        self.counters: dict[str, tuple[float, int]] = {}
+        self.control: dict[str, tuple[float, Any]] = {}
+        self.locks: dict[str, float] = {}
+
+    def cache_for(self, key: str) -> BoundedCache:
+        for name, _, fragments in CACHE_PARTITIONS:
+            if any(fragment in key for fragment in fragments):
+                return self.caches[name]
+        return self.caches[CACHE_PARTITIONS[-1][0]]
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(cache.bytes for cache in self.caches.values())
+
+    async def get(self, key: str) -> Any | None:
+        if key.startswith(CONTROL_KEY_PREFIXES):
+            expires_at, value = self.control.get(key, (0.0, None))
+            return value if expires_at > time.time() else None
+        return self.cache_for(key).get(key, time.time())
+
+    async def set(self, key: str, value: Any, ttl: float, encoded_size: int | None = None) -> None:
+        """Store a value; `encoded_size` (its JSON size in bytes, when known) saves encoding it to size it"""
+        now = time.time()
+        if key.startswith(CONTROL_KEY_PREFIXES):
+            self.control[key] = (now + ttl, value)
+            if len(self.control) > RATE_COUNTER_MAX_ENTRIES:
+                self.control = {k: v for k, v in self.control.items() if v[0] > now}
+            return
+        self.cache_for(key).put(key, value, now + ttl, approximate_size(value, encoded_size))
+        while self.resident_bytes > self.memory_budget:
+            largest = max(self.caches.values(), key=lambda cache: cache.bytes)
+            if not largest.entries:
+                break
+            largest.evict_one()
+
+    async def incr(self, key: str, ttl: float, amount: int = 1) -> int:
+        now = time.time()
+        expires_at, count = self.counters.get(key, (now + ttl, 0))
+        if expires_at <= now:
+            expires_at, count = now + ttl, 0
+        count = max(count + amount, 0)
+        self.counters[key] = (expires_at, count)
+        if len(self.counters) > RATE_COUNTER_MAX_ENTRIES:
+            self.counters = {k: v for k, v in self.counters.items() if v[0] > now}
+        return count
+
+    async def acquire_lock(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        if self.locks.get(key, 0) > now:
+            return False
+        self.locks[key] = now + ttl
+        return True
+
+    async def release_lock(self, key: str) -> None:
+        self.locks.pop(key, None)
+
+
+class RedisBackend:
+    """Redis (or any Redis-protocol server) backend shared by every server instance"""
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = RIOT_BACKEND_PREFIX):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError("RIOT_SHARED_BACKEND=redis://... needs the 'redis' package (pip install redis)") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float, encoded_size: int | None = None) -> None:
+        await self.client.set(self.prefix + key, json.dumps(value), px=max(int(ttl * 1000), 1))
+
+    async def incr(self, key: str, ttl: float, amount: int = 1) -> int:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incrby(self.prefix + key, amount)
+            pipe.expire(self.prefix + key, max(int(ttl + 0.999), 1), nx=True)
+            count, _ = await pipe.execute()
+        return count
+
+    async def acquire_lock(self, key: str, ttl: float) -> bool:
+        return bool(await self.client.set(self.prefix + key, "1", nx=True, px=max(int(ttl * 1000), 1)))
+
+    async def release_lock(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+
+def create_backend(spec: str) -> MemoryBackend | RedisBackend:
+    """Create the backend named by RIOT_SHARED_BACKEND ("memory" or a redis:// / rediss:// URL)"""
+    if spec == "memory":
+        return MemoryBackend()
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(spec)
+    raise ValueError(f"Unknown RIOT_SHARED_BACKEND: {spec!r}")
+
+
+RIOT_BACKEND = create_backend(RIOT_SHARED_BACKEND)
+
+
+def parse_rate_limits(header: str) -> list[tuple[int, int]]:
+    """Parse a "20:1,100:120" rate limit header into (count, window_seconds) pairs"""
+    return [(int(count), int(window)) for count, window in (pair.split(":") for pair in header.split(","))]
+
+
+def method_key(url: str) -> str:
+    """Name the Riot API method behind a request path, e.g. /lol/match/v5/matches/{matchId}"""
+    for pattern, placeholder in METHOD_PATH_PARAMS:
+        url = pattern.sub(placeholder, url)
+    return url
+
+
+async def acquire_rate_limit(host: str, method: str) -> None:
+    """
+    Wait until one more request fits every app and method window for the host.
+
+    Windows are fixed-interval counters in the shared backend, matching how Riot counts, so
+    every server instance using the same backend draws from one budget. A 429 Retry-After
+    seen by any instance pauses all of them. A request is counted only once it is admitted:
+    when any window is full, the increments made for it are rolled back before waiting.
+    """
+    scopes = [(f"app:{host}", APP_RATE_LIMITS.get(host) or parse_rate_limits(DEFAULT_APP_RATE_LIMIT))]
+    if (host, method) in METHOD_RATE_LIMITS:
+        scopes.append((f"method:{host}:{method}", METHOD_RATE_LIMITS[(host, method)]))
+
+    while True:
+        blocked_until = await RIOT_BACKEND.get(f"rl:blocked:{host}")
+        now = time.time()
+        wait = blocked_until - now if blocked_until else 0.0
+        if wait <= 0:
+            counted = []
+            for scope, limits in scopes:
+                for limit, window in limits:
+                    slot = int(now // window)
+                    key = f"rl:{scope}:{window}:{slot}"
+                    counted.append((key, window))
+                    if await RIOT_BACKEND.incr(key, ttl=window + 1) > limit:
+                        wait = max(wait, (slot + 1) * window - now)
+            if wait > 0:
+                for key, window in counted:
+                    await RIOT_BACKEND.incr(key, ttl=window + 1, amount=-1)
+        if wait <= 0:
+            return
+        await asyncio.sleep(wait)
+
+
+_SINGLE_FLIGHT: dict[str, asyncio.Task] = {}
+# Callers still waiting on each shared fetch
+_SINGLE_FLIGHT_WAITERS: dict[asyncio.Task, int] = {}
+
+
+async def single_flight(key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Share one in-progress fetch between every concurrent caller asking for the same key.
+
+    A cancelled caller leaves the fetch running for the others; once the last waiting caller
+    is cancelled the fetch is cancelled too, so no upstream budget is spent for nobody.
+    """
+    task = _SINGLE_FLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _SINGLE_FLIGHT[key] = task
+        task.add_done_callback(lambda _: _SINGLE_FLIGHT.pop(key, None) if _SINGLE_FLIGHT.get(key) is task else None)
+    _SINGLE_FLIGHT_WAITERS[task] = _SINGLE_FLIGHT_WAITERS.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        waiters = _SINGLE_FLIGHT_WAITERS.pop(task) - 1
+        if waiters:
+            _SINGLE_FLIGHT_WAITERS[task] = waiters
+        elif not task.done():
+            if _SINGLE_FLIGHT.get(key) is task:
+                del _SINGLE_FLIGHT[key]
+            task.cancel()
+
+
+# ============================================================================
+# HELPER FUNCTIONS - ROUTING
+# ============================================================================
+
+
+class UnknownPlatform(ValueError):
+    """A platform that is not in SHARDS or PLATFORM_ALIASES, with a suggestion of what to pass instead"""
+
+    def __init__(self, message: str, suggestion: str):
+        super().__init__(message)
+        self.suggestion = suggestion
+
+
+def resolve_route(platform: str, family: str = "platform") -> str:
+    """
+    Routing value of a platform for an API family: "platform", "match", "account", "lor" or "valorant".
+
+    Unknown platforms raise instead of falling back to NA, so a mistyped platform fails fast
+    rather than sending requests to another continent and returning the wrong player.
+    """
+    name = PLATFORM_ALIASES.get(str(platform).strip().lower())
+    if name is None:
+        import difflib
+
+        close = difflib.get_close_matches(str(platform).strip().lower(), PLATFORM_ALIASES, n=1)
+        suggestion = f"Did you mean {PLATFORM_ALIASES[close[0]]!r}?" if close else f"Use one of {', '.join(SHARDS)}."
+        raise UnknownPlatform(f"Unknown platform {platform!r}; expected one of {', '.join(SHARDS)}.", suggestion)
+    route = getattr(SHARDS[name], family)
+    if route is None:
+        supported = [shard for shard, routes in SHARDS.items() if getattr(routes, family) is not None]
+        raise UnknownPlatform(f"Platform {platform!r} has no {family} routing", f"Use one of {', '.join(supported)}.")
+    return route
+
+
+# ============================================================================
+# HELPER FUNCTIONS - DEADLINES
+# ============================================================================
+
+
+class DeadlineExceeded(Exception):
+    """The current tool call has no time budget left for another upstream request"""
+
+
+def remaining_budget() -> float | None:
+    """Seconds left before the current tool call's deadline, or None outside a tool call"""
+    deadline = _DEADLINE.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def budget_timeout(timeout: float) -> float:
+    """Clamp a per-request timeout to the remaining budget, raising once none is left"""
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded("Tool deadline exceeded")
+    return min(timeout, remaining)
+
+
+@contextmanager
+def optional_budget(reserve: float = DEADLINE_RESERVE):
+    """
+    Run an optional branch of a tool against a deadline `reserve` seconds earlier.
+
+    Requests inside the block give up first, leaving the tool time to return what it has
+    instead of the whole call hitting its deadline.
+    """
+    deadline = _DEADLINE.get()
+    token = _DEADLINE.set(None if deadline is None else deadline - reserve)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def budget_exhausted() -> bool:
+    """Whether the current (possibly shortened) deadline has passed"""
+    remaining = remaining_budget()
+    return remaining is not None and remaining <= 0
+
+
+# ============================================================================
+# HELPER FUNCTIONS - PROFILING
+# ============================================================================
+
+
+def frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)})"
+
+
+class ToolProfile:
+    """
+    Profile of one tool's next `calls` calls, or of its calls until `seconds` have passed.
+
+    "deterministic" runs each call under cProfile (one call at a time; anything else the event
+    loop runs meanwhile is counted too). "sampling" registers the call's task with the stack
+    sampler, which attributes CPU samples to it and its child tasks and records where it
+    waits otherwise, as flamegraph-ready collapsed stacks.
+    """
+
+    def __init__(self, tool: str, fn: Callable[..., Any], mode: str, calls: int, seconds: float | None):
+        self.tool = tool
+        self.code = fn.__code__
+        self.mode = mode
+        self.calls_left = calls
+        self.until = time.monotonic() + seconds if seconds else None
+        self.calls = 0
+        self.wall_time = 0.0
+        self.stacks: Counter[str] = Counter()
+        self.tasks: set[asyncio.Task] = set()
+        self.profiler = None
+        self.running = False
+
+    @property
+    def armed(self) -> bool:
+        return self.calls_left > 0 and (self.until is None or time.monotonic() < self.until)
+
+    def claim(self) -> bool:
+        """Whether to profile the call about to start"""
+        if not self.armed or (self.mode == "deterministic" and self.running):
+            return False
+        self.calls_left -= 1
+        return True
+
+    async def run(self, call: Awaitable[Any]) -> Any:
+        started = time.perf_counter()
+        self.running = True
+        if self.mode == "deterministic":
+            import cProfile
+
+            self.profiler = self.profiler or cProfile.Profile()
+            self.profiler.enable()
+        else:
+            task = asyncio.current_task()
+            self.tasks.add(task)
+            token = _PROFILING.set(self)
+            StackSampler.ensure_running()
+        try:
+            return await call
+        finally:
+            if self.mode == "deterministic":
+                self.profiler.disable()
+            else:
+                _PROFILING.reset(token)
+                self.tasks.discard(task)
+            self.running = False
+            self.calls += 1
+            self.wall_time += time.perf_counter() - started
+
+    def waiting_stack(self, task: asyncio.Task) -> str | None:
+        """Collapsed await chain of a suspended profiled task, from the tool function down"""
+        frames = []
+        coro = task.get_coro()
+        while coro is not None:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            frames.append(frame)
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+        start = next((i for i, frame in enumerate(frames) if frame.f_code is self.code), None)
+        if start is None:
+            return None
+        return ";".join([self.tool] + [frame_label(frame) for frame in frames[start:]] + ["(waiting)"])
+
+
+# Tool name -> armed or finished profile
+PROFILES: dict[str, ToolProfile] = {}
+
+# Sampling profile of the tool call a task (or its child tasks) belongs to
+_PROFILING: ContextVar[ToolProfile | None] = ContextVar("riot_profiling", default=None)
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the event loop thread while any sampling profile has a call in flight.
+
+    The running task's context tells which profile a CPU sample belongs to; every profiled
+    task that is not running at that moment is sampled at the await it is suspended in.
+    """
+
+    _instance: "StackSampler | None" = None
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__(name="riot-stack-sampler", daemon=True)
+        self.loop = loop
+        self.loop_thread = threading.get_ident()
+
+    @classmethod
+    def ensure_running(cls) -> None:
+        if cls._instance is None or not cls._instance.is_alive():
+            cls._instance = cls(asyncio.get_running_loop())
+            cls._instance.start()
+
+    def run(self) -> None:
+        while True:
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+            # list() copies are atomic; the event loop thread adds and removes entries meanwhile
+            armed = [p for p in list(PROFILES.values()) if p.mode == "sampling"]
+            profiles = [p for p in armed if p.tasks]
+            if not profiles:
+                if not any(p.armed for p in armed):
+                    StackSampler._instance = None
+                    return
+                continue
+            self.sample(profiles)
+
+    def sample(self, profiles: list[ToolProfile]) -> None:
+        frame = sys._current_frames().get(self.loop_thread)
+        task = asyncio.current_task(self.loop)
+        running = task.get_context().get(_PROFILING) if task is not None else None
+        if running is not None and frame is not None:
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            frames.reverse()
+            # Start at the task's own coroutine, below the event loop machinery
+            start = max((i + 1 for i, f in enumerate(frames) if f.f_code.co_name == "_run"), default=0)
+            tool_frame = next((i for i, f in enumerate(frames) if f.f_code is running.code), None)
+            labels = [frame_label(f) for f in frames[tool_frame if tool_frame is not None else start :]]
+            running.stacks[";".join([running.tool] + labels)] += 1
+        for profile in profiles:
+            if profile is running:
+                continue
+            for profiled_task in list(profile.tasks):
+                stack = profile.waiting_stack(profiled_task)
+                if stack:
+                    profile.stacks[stack] += 1
+
+
+# ============================================================================
+# HELPER FUNCTIONS - ADAPTIVE CONCURRENCY
+# ============================================================================
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on requests in flight to one host.
+
+    Every fast response while the limit is fully used adds 1/limit, so it grows by about one
+    slot per round trip. A 429, an upstream timeout or 5xx, or a latency spike against the
+    host's baseline multiplies it by ADAPTIVE_BACKOFF. Only requests sent after the last cut
+    can cut it again, so one burst of failures halves the limit once, not once per request.
+    """
+
+    def __init__(self) -> None:
+        self.limit = float(max(min(ADAPTIVE_INITIAL_CONCURRENCY, RIOT_MAX_CONCURRENCY), ADAPTIVE_MIN_CONCURRENCY))
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.baseline: float | None = None
+        self.last_latency: float | None = None
+        self.last_cut = 0.0
+        self.last_signal: str | None = None
+        self.increases = 0
+        self.decreases = 0
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self, started: float, outcome: str) -> None:
+        """Hand back a slot for a request sent at `started` that ended with `outcome` ("ok", "error" or a signal)"""
+        now = time.monotonic()
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if outcome == "ok":
+            latency = now - started
+            if self.baseline is None:
+                self.baseline = latency
+            spike = latency > max(self.baseline * LATENCY_SPIKE_RATIO, LATENCY_SPIKE_FLOOR)
+            self.baseline += (latency - self.baseline) * LATENCY_BASELINE_ALPHA
+            self.last_latency = latency
+            if spike:
+                outcome = "latency"
+            elif saturated and self.limit < RIOT_MAX_CONCURRENCY:
+                self.limit = min(self.limit + 1 / self.limit, float(RIOT_MAX_CONCURRENCY))
+                self.increases += 1
+        if outcome in CONGESTION_SIGNALS and started >= self.last_cut:
+            self.limit = max(self.limit * ADAPTIVE_BACKOFF, float(ADAPTIVE_MIN_CONCURRENCY))
+            self.last_cut = now
+            self.last_signal = outcome
+            self.decreases += 1
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+_HOST_CONCURRENCY: dict[str, AdaptiveConcurrency] = {}
+
+
+def concurrency_metrics() -> dict[str, dict[str, Any]]:
+    """Current adaptive concurrency limit, requests in flight and latency baseline per host"""
+    return {
+        host: {
+            "limit": round(limiter.limit, 2),
+            "inFlight": limiter.in_flight,
+            "baselineMs": round(limiter.baseline * 1000, 1) if limiter.baseline is not None else None,
+            "lastLatencyMs": round(limiter.last_latency * 1000, 1) if limiter.last_latency is not None else None,
+            "increases": limiter.increases,
+            "decreases": limiter.decreases,
+            "lastCutReason": limiter.last_signal,
+        }
+        for host, limiter in sorted(_HOST_CONCURRENCY.items())
+    }
+
+
+# ============================================================================
+# HELPER FUNCTIONS - PRIORITY LANES
+# ============================================================================
+
+
+class PriorityLanes:
+    """
+    Admission queue in front of one host's rate limiter.
+
+    Requests pass the rate limiter one at a time; while one waits for a window to open the
+    rest queue by lane, so an interactive call never sits behind a crawl's backlog. Every
+    1/share-th admission goes to a waiting lower lane so bulk work still progresses.
+    """
+
+    def __init__(self) -> None:
+        self.waiters: dict[str, deque[asyncio.Future]] = {lane: deque() for lane in REQUEST_LANES}
+        self.busy = False
+        self.admissions = 0
+
+    def depth(self, lane: str) -> int:
+        return sum(1 for waiter in self.waiters[lane] if not waiter.done())
+
+    def _next_lane(self) -> str | None:
+        turn = self.admissions + 1
+        for lane in reversed(REQUEST_LANES):
+            share = LANE_MIN_SHARE.get(lane)
+            if share and self.waiters[lane] and int(turn * share) > int((turn - 1) * share):
+                return lane
+        return next((lane for lane in REQUEST_LANES if self.waiters[lane]), None)
+
+    async def admit(self, lane: str) -> None:
+        started = time.monotonic()
+        if self.busy or any(self.waiters.values()):
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters[lane].append(waiter)
+            LANE_STATS[lane]["queued"] += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release()
+                elif waiter in self.waiters[lane]:
+                    self.waiters[lane].remove(waiter)
+                raise
+        else:
+            self.busy = True
+        waited = time.monotonic() - started
+        stats = LANE_STATS[lane]
+        stats["admitted"] += 1
+        stats["totalWait"] += waited
+        stats["maxWait"] = max(stats["maxWait"], waited)
+
+    def release(self) -> None:
+        """Hand the host to the next waiting request, or mark it idle"""
+        while (lane := self._next_lane()) is not None:
+            waiter = self.waiters[lane].popleft()
+            if not waiter.done():
+                self.admissions += 1
+                waiter.set_result(None)
+                return
+        self.busy = False
+
+
+_HOST_LANES: dict[str, PriorityLanes] = {}
+
+
+async def acquire_request_slot(host: str, method: str) -> AdaptiveConcurrency:
+    """
+    Wait for this call's lane to be admitted to the host, then for a concurrency slot and rate
+    limit budget. The caller hands the slot back through the returned limiter's release().
+    """
+    lanes = _HOST_LANES.setdefault(host, PriorityLanes())
+    limiter = _HOST_CONCURRENCY.setdefault(host, AdaptiveConcurrency())
+    await lanes.admit(_LANE.get())
+    try:
+        await limiter.acquire()
+        try:
+            await acquire_rate_limit(host, method)
+        except BaseException:
+            limiter.release(time.monotonic(), "error")
+            raise
+    finally:
+        lanes.release()
+    return limiter
+
+
+def lane_metrics() -> dict[str, dict[str, Any]]:
+    """Per-lane queue depth and admission wait times across all hosts"""
+    return {
+        lane: {
+            "queueDepth": sum(lanes.depth(lane) for lanes in _HOST_LANES.values()),
+            "admitted": stats["admitted"],
+            "queued": stats["queued"],
+            "avgWaitMs": round(stats["totalWait"] / stats["admitted"] * 1000, 1) if stats["admitted"] else 0.0,
+            "maxWaitMs": round(stats["maxWait"] * 1000, 1),
+        }
+        for lane, stats in LANE_STATS.items()
+    }
+
+
+# ============================================================================
+# HELPER FUNCTIONS - RECORD & REPLAY
+# ============================================================================
+
+
+def redact_puuids(text: str) -> str:
+    """Replace PUUIDs with stable placeholders, so redacted URLs still line up with redacted payloads"""
+    return PUUID_PATTERN.sub(lambda m: "puuid-" + hashlib.blake2b(m.group(0).encode(), digest_size=8).hexdigest(), text)
+
+
+class Cassette:
+    """
+    Upstream request/response pairs, one JSON object per line (gzipped when the path ends in .gz).
+
+    Recording buffers responses as they arrive and appends them CASSETTE_FLUSH_RECORDS at a time
+    from a worker thread (and the rest on close or exit). Replay serves responses per "METHOD url"
+    in recorded order, repeating the last one once a key's recordings are used up.
+    """
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 1.0, redact: bool = True):
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.redact = redact
+        self.responses: dict[str, deque[dict[str, Any]]] = {}
+        self.misses = 0
+        self.pending: list[str] = []
+        # One writer thread, so batches land in the file in recording order
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="riot-cassette")
+        if mode == "record":
+            atexit.register(lambda: self._append(self.pending))
+        if mode == "replay":
+            with self._open("rt") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.responses.setdefault(entry["request"], deque()).append(entry)
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def key(self, request: httpx.Request) -> str:
+        url = str(request.url)
+        return f"{request.method} {redact_puuids(url) if self.redact else url}"
+
+    async def record(self, request: httpx.Request, response: httpx.Response, body: bytes, elapsed: float) -> None:
+        text = body.decode("utf-8", errors="replace")
+        entry = {
+            "request": self.key(request),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in CASSETTE_HEADERS},
+            "body": redact_puuids(text) if self.redact else text,
+            "elapsed": round(elapsed, 4),
+        }
+        self.pending.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        if len(self.pending) >= CASSETTE_FLUSH_RECORDS:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Append the buffered recordings to the cassette file from the writer thread"""
+        lines, self.pending = self.pending, []
+        if lines:
+            await asyncio.get_running_loop().run_in_executor(self.writer, self._append, lines)
+
+    def _append(self, lines: list[str]) -> None:
+        if lines:
+            with self._open("at") as f:
+                f.writelines(lines)
+
+    def replay(self, request: httpx.Request) -> dict[str, Any] | None:
+        recorded = self.responses.get(self.key(request))
+        if not recorded:
+            self.misses += 1
+            logger.warning("Cassette miss: %s", self.key(request))
+            return None
+        return recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records to, or replays from, the process-wide cassette"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self.inner = httpx.AsyncHTTPTransport() if cassette.mode == "record" else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.inner is None:
+            entry = self.cassette.replay(request)
+            if entry is None:
+                return httpx.Response(404, json={"status": {"status_code": 404, "message": "Not in cassette"}})
+            await asyncio.sleep(entry["elapsed"] * self.cassette.latency_scale)
+            return httpx.Response(entry["status"], headers=entry["headers"], content=entry["body"].encode("utf-8"))
+
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        await self.cassette.record(request, response, body, time.monotonic() - started)
+        # The body was already decoded, so drop the headers describing its wire encoding
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=body)
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
+            await self.cassette.flush()
+
+
+_CASSETTE: Cassette | None = None
+
+
+def cassette_transport() -> httpx.AsyncBaseTransport | None:
+    """Transport for a new httpx client: the cassette's when recording or replaying, the stub's, else the default"""
+    global _CASSETTE
+    if RIOT_CASSETTE_MODE == "stub":
+        from riot_stub import StubRiotTransport
+
+        return StubRiotTransport()
+    if RIOT_CASSETTE_MODE not in ("record", "replay"):
+        return None
+    if _CASSETTE is None:
+        _CASSETTE = Cassette(RIOT_CASSETTE, RIOT_CASSETTE_MODE, RIOT_CASSETTE_LATENCY, RIOT_CASSETTE_REDACT)
+    return CassetteTransport(_CASSETTE)
+
 
 # ============================================================================
 # HELPER FUNCTIONS - API REQUESTS
 # ============================================================================
 
 
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+
+
+def require_api_key() -> None:
+    """Fail when the Riot API would be called without a key; replaying a cassette and the stub need none"""
+    if not RIOT_API_KEY and RIOT_CASSETTE_MODE not in ("replay", "stub"):
+        raise EnvironmentError("RIOT_API_KEY is not set in the environment variables.")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Riot API client, creating its connection pool on first use"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        require_api_key()
+        _HTTP_CLIENT = httpx.AsyncClient(
+            headers={
+                "X-Riot-Token": RIOT_API_KEY,
+                "Content-Type": "application/json",
+            },
+            transport=cassette_transport(),
+        )
+    return _HTTP_CLIENT
+
+
+async def _record_rate_limits(host: str, method: str, res: httpx.Response) -> None:
+    """Remember the app/method rate limits and usage reported in the response headers"""
+    now = time.time()
+    windows = []
+    for limit_header, count_header in (
+        ("X-App-Rate-Limit", "X-App-Rate-Limit-Count"),
+        ("X-Method-Rate-Limit", "X-Method-Rate-Limit-Count"),
+    ):
+        limits = res.headers.get(limit_header)
+        counts = res.headers.get(count_header)
+        if not limits or not counts:
+            continue
+        used = {window: count for count, window in parse_rate_limits(counts)}
+        for limit, window in parse_rate_limits(limits):
+            windows.append((limit, used.get(window, 0), window, now))
+    if windows:
+        RATE_LIMIT_WINDOWS[host] = windows
+    if res.headers.get("X-App-Rate-Limit"):
+        APP_RATE_LIMITS[host] = parse_rate_limits(res.headers["X-App-Rate-Limit"])
+    if res.headers.get("X-Method-Rate-Limit"):
+        METHOD_RATE_LIMITS[(host, method)] = parse_rate_limits(res.headers["X-Method-Rate-Limit"])
+    if res.status_code == 429:
+        retry_after = float(res.headers.get("Retry-After", 1))
+        RATE_LIMIT_BLOCKED_UNTIL[host] = now + retry_after
+        await RIOT_BACKEND.set(f"rl:blocked:{host}", now + retry_after, ttl=retry_after)
+
+
+def rate_limit_spare() -> float:
+    """Smallest fraction of rate limit budget left in any open window across all hosts (0.0-1.0)"""
+    now = time.time()
+    if any(until > now for until in RATE_LIMIT_BLOCKED_UNTIL.values()):
+        return 0.0
+    spare = 1.0
+    for windows in RATE_LIMIT_WINDOWS.values():
+        for limit, count, window, observed_at in windows:
+            if now - observed_at < window:
+                spare = min(spare, max(limit - count, 0) / limit)
+    return spare
+
+
+def response_cache_key(host: str, url: str, params: dict[str, Any] | None) -> str:
+    """Key a Riot API response is cached under in the shared backend"""
+    return f"https://{host}.api.riotgames.com{url}?{sorted((params or {}).items())}"
+
+
+def not_found_ttl(method: str) -> float:
+    """How long a 404 from this method is remembered"""
+    return next((ttl for fragment, ttl in NOT_FOUND_TTLS if fragment in method), NOT_FOUND_CACHE_TTL)
+
+
+async def _fetch(
+    host: str, url: str, params: dict[str, Any] | None, timeout: float
+) -> dict[str, Any] | list[Any] | None:
+    """Perform one rate-limited GET against a routing host, within the tool call's remaining budget"""
+    return (await _fetch_sized(host, url, params, timeout))[0]
+
+
+async def _fetch_sized(
+    host: str, url: str, params: dict[str, Any] | None, timeout: float
+) -> tuple[dict[str, Any] | list[Any] | None, int]:
+    """_fetch, also returning the response body's size in bytes (0 without a payload) for cache accounting"""
+    global _FOREGROUND_IN_FLIGHT
+    method = method_key(url)
+    try:
+        async with asyncio.timeout(budget_timeout(timeout) if _DEADLINE.get() else None):
+            limiter = await acquire_request_slot(host, method)
+    except TimeoutError:
+        raise DeadlineExceeded("Tool deadline exceeded waiting for rate limit") from None
+
+    foreground = not _PREFETCHING.get()
+    if foreground:
+        _FOREGROUND_IN_FLIGHT += 1
+    started = time.monotonic()
+    outcome = "error"
+    try:
+        timeout = budget_timeout(timeout)
+        res = await get_http_client().get(f"https://{host}.api.riotgames.com{url}", params=params, timeout=timeout)
+        outcome = CONGESTION_STATUSES.get(res.status_code, "ok")
+        await _record_rate_limits(host, method, res)
+        res.raise_for_status()
+        return res.json(), len(res.content)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            await RIOT_BACKEND.set(f"404:{response_cache_key(host, url, params)}", True, not_found_ttl(method))
+            NOT_FOUND_STATS["cached"] += 1
+            return None, 0
+        logger.warning("Riot API error (%s): %s", e.response.status_code, e)
+        return None, 0
+    except Exception as e:
+        if budget_exhausted():
+            raise DeadlineExceeded("Tool deadline exceeded") from None
+        if isinstance(e, httpx.TimeoutException):
+            outcome = "timeout"
+        logger.warning("Riot API error: %s", e)
+        return None, 0
+    finally:
+        limiter.release(started, outcome)
+        if foreground:
+            _FOREGROUND_IN_FLIGHT -= 1
+
+
+async def _fetch_and_cache(
+    host: str, url: str, params: dict[str, Any] | None, timeout: float, cache_key: str, cache_ttl: float
+) -> dict[str, Any] | list[Any] | None:
+    """Fetch a cacheable response, letting only one server instance fetch it at a time"""
+    lock_key = f"lock:{cache_key}"
+    while RIOT_BACKEND.shared and not await RIOT_BACKEND.acquire_lock(lock_key, ttl=timeout):
+        await asyncio.sleep(SINGLE_FLIGHT_POLL)
+        cached = await RIOT_BACKEND.get(cache_key)
+        if cached is not None:
+            return cached
+    try:
+        payload, size = await _fetch_sized(host, url, params, timeout)
+        if payload is not None:
+            await RIOT_BACKEND.set(cache_key, payload, cache_ttl, encoded_size=size)
+        return payload
+    finally:
+        if RIOT_BACKEND.shared:
+            await RIOT_BACKEND.release_lock(lock_key)
+
+
+_REVALIDATIONS: set[asyncio.Task] = set()
+
+
+def _record_freshness(age: float, stale: bool) -> None:
+    served = _FRESHNESS.get()
+    if served is not None:
+        served.append((age, stale))
+
+
+def cache_freshness() -> dict[str, Any]:
+    """Freshness of the stale-while-revalidate data the current tool call was served"""
+    served = _FRESHNESS.get() or []
+    return {
+        "ageSeconds": round(max((age for age, _ in served), default=0.0)),
+        "stale": any(stale for _, stale in served),
+    }
+
+
+async def _fetch_and_stamp(
+    host: str,
+    url: str,
+    params: dict[str, Any] | None,
+    timeout: float,
+    cache_key: str,
+    cache_ttl: float,
+    stale_ttl: float,
+) -> dict[str, Any] | list[Any] | None:
+    """Fetch a stale-while-revalidate response and store it with the time it was fetched"""
+    payload, size = await _fetch_sized(host, url, params, timeout)
+    if payload is not None:
+        entry = {"payload": payload, "fetchedAt": time.time()}
+        await RIOT_BACKEND.set(f"swr:{cache_key}", entry, cache_ttl + stale_ttl, encoded_size=size)
+    return payload
+
+
+def _revalidate(cache_key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+    """Refresh a stale entry in the background, outside the current tool call's deadline"""
+    if cache_key in _SINGLE_FLIGHT:
+        return
+
+    async def run() -> None:
+        _DEADLINE.set(None)
+        _PREFETCHING.set(True)
+        _LANE.set("background")
+        try:
+            if await single_flight(cache_key, fetch) is not None:
+                SWR_STATS["revalidated"] += 1
+        except Exception as e:
+            logger.warning("Revalidation error (%s): %s", cache_key, e)
+
+    task = asyncio.create_task(run())
+    _REVALIDATIONS.add(task)
+    task.add_done_callback(_REVALIDATIONS.discard)
+
+
+async def _riot_get_stale_while_revalidate(
+    host: str,
+    url: str,
+    params: dict[str, Any] | None,
+    timeout: float,
+    cache_key: str,
+    cache_ttl: float,
+    stale_ttl: float,
+) -> dict[str, Any] | list[Any] | None:
+    """Serve a cached entry however stale (up to stale_ttl past cache_ttl), refreshing it once expired"""
+    fetch = lambda: _fetch_and_stamp(host, url, params, timeout, cache_key, cache_ttl, stale_ttl)
+    entry = await RIOT_BACKEND.get(f"swr:{cache_key}")
+    if entry is None:
+        SWR_STATS["miss"] += 1
+        payload = await single_flight(cache_key, fetch)
+        _record_freshness(0.0, False)
+        return payload
+
+    age = time.time() - entry["fetchedAt"]
+    stale = age >= cache_ttl
+    SWR_STATS["stale" if stale else "fresh"] += 1
+    if stale:
+        _revalidate(cache_key, fetch)
+    _record_freshness(age, stale)
+    return entry["payload"]
+
+
+async def _riot_get(
+    host: str,
+    url: str,
+    params: dict[str, Any] | None,
+    timeout: float,
+    cache_ttl: float | None,
+    stale_ttl: float | None = None,
+) -> dict[str, Any] | list[Any] | None:
+    """GET a Riot API path on a routing host, serving from and filling the shared response cache"""
+    cache_key = response_cache_key(host, url, params)
+    if await RIOT_BACKEND.get(f"404:{cache_key}"):
+        NOT_FOUND_STATS["avoided"] += 1
+        return None
+    if cache_ttl and stale_ttl:
+        return await _riot_get_stale_while_revalidate(host, url, params, timeout, cache_key, cache_ttl, stale_ttl)
+    if not cache_ttl:
+        return await single_flight(cache_key, lambda: _fetch(host, url, params, timeout))
+
+    cached = await RIOT_BACKEND.get(cache_key)
+    if cached is not None:
+        return cached
+    return await single_flight(
+        cache_key, lambda: _fetch_and_cache(host, url, params, timeout, cache_key, cache_ttl)
+    )
+
+
 async def riot_request(
     url: str,
     platform_routing: str = "na1",
     params: dict[str, Any] | None = None,
     timeout: float = 30.0,
+    cache_ttl: float | None = None,
+    stale_ttl: float | None = None,
 ) -> dict[str, Any] | list[Any] | None:
     """Make a request to the Riot API using platform routing (na1, euw1, kr, etc.)"""
-    headers = {
-        "X-Riot-Token": RIOT_API_KEY,
-        "Content-Type": "application/json",
-    }
-    async with httpx.AsyncClient() as client:
-        try:
-            full_url = f"https://{platform_routing}.api.riotgames.com{url}"
-            res = await client.get(full_url, headers=headers, params=params, timeout=timeout)
-            res.raise_for_status()
-            return res.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return None
-            print(f"Riot API Error ({e.response.status_code}): {e}")
-            return None
-        except Exception as e:
-            print(f"Riot API Error: {e}")
-            return None
+    return await _riot_get(platform_routing, url, params, timeout, cache_ttl, stale_ttl)
 
 
 async def riot_regional_request(
@@ -105,26 +1616,57 @@ async def riot_regional_request(
     regional_routing: str = "americas",
     params: dict[str, Any] | None = None,
     timeout: float = 30.0,
+    cache_ttl: float | None = None,
+    stale_ttl: float | None = None,
 ) -> dict[str, Any] | list[Any] | None:
     """Make a request to the Riot API using regional routing"""
-    headers = {
-        "X-Riot-Token": RIOT_API_KEY,
-        "Content-Type": "application/json",
-    }
-    async with httpx.AsyncClient() as client:
+    return await _riot_get(regional_routing, url, params, timeout, cache_ttl, stale_ttl)
+
+
+# ============================================================================
+# HELPER FUNCTIONS - BACKGROUND PREFETCH
+# ============================================================================
+
+
+def enqueue_prefetch(key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Queue a low-priority warm-up fetch, deduplicated by key.
+
+    The worker only runs a fetch while no foreground request is in flight and at least
+    PREFETCH_MIN_SPARE of the rate limit budget is left, so results land in the caches
+    before the follow-up tool call without competing with it.
+    """
+    global _PREFETCH_QUEUE, _PREFETCH_WORKER
+    if not PREFETCH_ENABLED or key in _PREFETCH_PENDING:
+        return
+    if _PREFETCH_QUEUE is None:
+        _PREFETCH_QUEUE = asyncio.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+    try:
+        _PREFETCH_QUEUE.put_nowait((key, fetch))
+    except asyncio.QueueFull:
+        PREFETCH_STATS["dropped"] += 1
+        return
+    _PREFETCH_PENDING.add(key)
+    PREFETCH_STATS["queued"] += 1
+    if _PREFETCH_WORKER is None or _PREFETCH_WORKER.done():
+        _PREFETCH_WORKER = asyncio.create_task(_prefetch_worker())
+
+
+async def _prefetch_worker() -> None:
+    _PREFETCHING.set(True)
+    _DEADLINE.set(None)
+    _LANE.set("background")
+    while True:
+        key, fetch = await _PREFETCH_QUEUE.get()
         try:
-            full_url = f"https://{regional_routing}.api.riotgames.com{url}"
-            res = await client.get(full_url, headers=headers, params=params, timeout=timeout)
-            res.raise_for_status()
-            return res.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return None
-            print(f"Riot API Error ({e.response.status_code}): {e}")
-            return None
+            while _FOREGROUND_IN_FLIGHT or rate_limit_spare() < PREFETCH_MIN_SPARE:
+                await asyncio.sleep(PREFETCH_IDLE_POLL)
+            await fetch()
+            PREFETCH_STATS["completed"] += 1
         except Exception as e:
-            print(f"Riot API Error: {e}")
-            return None
+            logger.warning("Prefetch error (%s): %s", key, e)
+        finally:
+            _PREFETCH_PENDING.discard(key)
 
 
 # ============================================================================
@@ -132,17 +1674,288 @@ async def riot_regional_request(
 # ============================================================================
 
 
-async def get_puuid(game_name: str, tag_line: str) -> str | None:
-    """Get PUUID from game name and tag line (Riot Account)"""
+async def get_puuid(game_name: str, tag_line: str, platform: str = "na") -> str | None:
+    """Get PUUID from game name and tag line (Riot Account), from the account cluster nearest the platform"""
     url = f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    result = await riot_regional_request(url, regional_routing="americas")
+    regional_routing = resolve_route(platform, "account")
+    result = await riot_regional_request(url, regional_routing=regional_routing, cache_ttl=PUUID_CACHE_TTL)
     return result.get("puuid") if result else None
 
 
-async def get_riot_account(game_name: str, tag_line: str) -> dict[str, Any] | None:
+async def get_riot_account(game_name: str, tag_line: str, platform: str = "na") -> dict[str, Any] | None:
     """Get full Riot account info"""
     url = f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    return await riot_regional_request(url, regional_routing="americas")
+    return await riot_regional_request(url, regional_routing=resolve_route(platform, "account"))
+
+
+async def get_account_by_puuid(puuid: str, platform: str = "na") -> dict[str, Any] | None:
+    """Get Riot account info (gameName, tagLine) by PUUID"""
+    url = f"/riot/account/v1/accounts/by-puuid/{puuid}"
+    regional_routing = resolve_route(platform, "account")
+    return await riot_regional_request(url, regional_routing=regional_routing, cache_ttl=PUUID_CACHE_TTL)
+
+
+def split_riot_id(riot_id: str) -> tuple[str, str] | None:
+    """Split "gameName#tagLine" into its parts"""
+    game_name, _, tag_line = riot_id.rpartition("#")
+    if not game_name or not tag_line:
+        return None
+    return game_name.strip(), tag_line.strip()
+
+
+# ============================================================================
+# HELPER FUNCTIONS - FAN-OUT & PROGRESS
+# ============================================================================
+
+
+async def report_progress(ctx: Context | None, done: int, total: int, message: str) -> None:
+    """Send a progress notification plus a human-readable status line to the client"""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(done, total)
+        await ctx.info(message)
+    except Exception as e:
+        logger.warning("Progress notification failed: %s", e)
+
+
+async def stream_partial(ctx: Context | None, kind: str, item: dict[str, Any]) -> None:
+    """Stream one finished result row to the client as a log notification"""
+    if ctx is None:
+        return
+    try:
+        await ctx.session.send_log_message(level="info", data={kind: item}, logger="riot.partial")
+    except Exception as e:
+        logger.warning("Partial result notification failed: %s", e)
+
+
+async def fan_out(
+    items: list[Any],
+    fetch: Callable[[Any], Awaitable[Any]],
+    ctx: Context | None = None,
+    label: str = "items",
+    concurrency: int = FAN_OUT_CONCURRENCY,
+    partial: bool = False,
+) -> list[Any]:
+    """
+    Run fetch(item) for every item with bounded concurrency, returning results in input order.
+
+    Reports "fetched i/n <label>" progress through the MCP context. All fetches run in one
+    TaskGroup, so when the tool call is cancelled the queued fetches are cancelled before
+    they ever reach the upstream API. Each fetch only gets the call's remaining budget; with
+    `partial`, items that run out of budget are left as None instead of failing the call.
+    """
+    results: list[Any] = [None] * len(items)
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def run(position: int, item: Any) -> None:
+        nonlocal done
+        async with semaphore:
+            try:
+                results[position] = await fetch(item)
+            except DeadlineExceeded:
+                if not partial:
+                    raise
+                return
+        done += 1
+        await report_progress(ctx, done, len(items), f"fetched {done}/{len(items)} {label}")
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for position, item in enumerate(items):
+                group.create_task(run(position, item))
+    except* DeadlineExceeded as group:
+        raise group.exceptions[0] from None
+    return results
+
+
+# ============================================================================
+# HELPER FUNCTIONS - MATCHES
+# ============================================================================
+
+
+async def get_match(match_id: str, regional_routing: str = "americas", game: str = "lol") -> dict[str, Any] | None:
+    """Get a LoL/TFT/LoR match payload, cached since finished matches never change"""
+    match = await riot_regional_request(
+        f"{MATCH_PATHS[game]}/{match_id}", regional_routing=regional_routing, cache_ttl=MATCH_CACHE_TTL
+    )
+    if match:
+        ingest_match(game, match)
+    return match
+
+
+def compact_vocab(codes: dict[Any, int], columns: list[array]) -> dict[Any, int]:
+    """Re-intern a vocabulary to the codes `columns` still use, rewriting the columns in place"""
+    values = list(codes)
+    used = sorted(set().union(*columns))
+    remap = {old: new for new, old in enumerate(used)}
+    for column in columns:
+        column[:] = array(column.typecode, (remap[code] for code in column))
+    return {values[old]: new for new, old in enumerate(used)}
+
+
+def array_bytes(columns: Any) -> int:
+    """Bytes held by a collection of arrays"""
+    return sum(column.itemsize * len(column) for column in columns)
+
+
+def ingest_match(game: str, match: dict[str, Any]) -> None:
+    """Feed a match payload to every local index registered for its game"""
+    for ingest in MATCH_INGESTORS[game]:
+        try:
+            ingest(match)
+        except Exception as e:
+            logger.warning("Match ingest error (%s): %s", game, e)
+
+
+async def fetch_matches(
+    match_ids: list[str],
+    summarize: Callable[[str, dict[str, Any]], dict[str, Any] | None],
+    regional_routing: str = "americas",
+    game: str = "lol",
+    ctx: Context | None = None,
+    partial: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Fetch matches concurrently and reduce each to a summary row, in match id order.
+
+    Each row is streamed to the client as soon as its match arrives, so a cancelled or
+    timed-out call still leaves the client with the rows fetched so far. With `partial`,
+    matches that run out of deadline budget are dropped from the result.
+    """
+
+    async def fetch(match_id: str) -> dict[str, Any] | None:
+        match = await get_match(match_id, regional_routing=regional_routing, game=game)
+        row = summarize(match_id, match) if match else None
+        if row:
+            await stream_partial(ctx, "match", row)
+        return row
+
+    rows = await fan_out(match_ids, fetch, ctx=ctx, label="matches", partial=partial)
+    return [row for row in rows if row]
+
+
+async def _fetch_match_ids(
+    puuid: str, regional_routing: str, game: str, start: int, count: int
+) -> tuple[list[str], bool] | None:
+    """Fetch `count` match ids from `start`, paging as needed; also reports whether history ran out"""
+    match_ids: list[str] = []
+    while len(match_ids) < count:
+        page_size = min(MATCH_IDS_PAGE_SIZE, count - len(match_ids))
+        page = await riot_regional_request(
+            f"{MATCH_PATHS[game]}/by-puuid/{puuid}/ids",
+            regional_routing=regional_routing,
+            params={"start": start + len(match_ids), "count": page_size},
+        )
+        if page is None:
+            return (match_ids, False) if match_ids else None
+        match_ids.extend(page)
+        if len(page) < page_size:
+            return match_ids, True
+    return match_ids, False
+
+
+async def _refresh_match_id_head(
+    entry: dict[str, Any], puuid: str, regional_routing: str, game: str
+) -> dict[str, Any] | None:
+    """
+    Prepend matches played since a cached id list was fetched, or None when the list no longer overlaps.
+    The list is returned unchanged when the head request fails.
+    """
+    fetched = await _fetch_match_ids(puuid, regional_routing, game, 0, MATCH_IDS_HEAD_PAGE)
+    if fetched is None:
+        return entry
+    head, exhausted = fetched
+    known = entry["ids"]
+    if not known:
+        MATCH_IDS_STATS["headRefreshed"] += 1
+        return {"ids": head, "complete": exhausted, "fetchedAt": time.time()}
+    if known[0] not in head:
+        return None
+    MATCH_IDS_STATS["headRefreshed"] += 1
+    return {"ids": head[: head.index(known[0])] + known, "complete": entry["complete"], "fetchedAt": time.time()}
+
+
+async def get_match_ids(
+    puuid: str, regional_routing: str = "americas", game: str = "lol", count: int = 20
+) -> list[str]:
+    """
+    Get up to `count` of a player's most recent match ids (newest first).
+
+    A new list is fetched a full page at a time, since 100 ids cost one request just like 10,
+    so later windows of any size up to that are served from the cache. Larger windows only
+    fetch the missing tail.
+    """
+    key = f"ids:{game}:{regional_routing}:{puuid}"
+    entry = await RIOT_BACKEND.get(key)
+    if entry is not None and time.time() - entry["fetchedAt"] >= MATCH_IDS_FRESH_TTL:
+        entry = await _refresh_match_id_head(entry, puuid, regional_routing, game)
+    elif entry is not None and (len(entry["ids"]) >= count or entry["complete"]):
+        MATCH_IDS_STATS["served"] += 1
+        return entry["ids"][:count]
+
+    if entry is None:
+        fetched = await _fetch_match_ids(puuid, regional_routing, game, 0, max(count, MATCH_IDS_PAGE_SIZE))
+        if fetched is None:
+            return []
+        MATCH_IDS_STATS["fetched"] += 1
+        entry = {"ids": fetched[0], "complete": fetched[1], "fetchedAt": time.time()}
+    elif len(entry["ids"]) < count and not entry["complete"]:
+        fetched = await _fetch_match_ids(puuid, regional_routing, game, len(entry["ids"]), count - len(entry["ids"]))
+        if fetched is not None:
+            known = set(entry["ids"])
+            entry["ids"] += [match_id for match_id in fetched[0] if match_id not in known]
+            entry["complete"] = fetched[1]
+            MATCH_IDS_STATS["extended"] += 1
+
+    await RIOT_BACKEND.set(key, entry, MATCH_IDS_CACHE_TTL)
+    return entry["ids"][:count]
+
+
+async def get_ladder_puuids(game: str, tier: str, platform: str = "na", players: int = 50) -> list[str] | None:
+    """PUUIDs of the top `players` on an apex ladder (CHALLENGER, GRANDMASTER or MASTER), by LP"""
+    platform_routing = resolve_route(platform)
+    league = await riot_request(LADDER_PATHS[game].format(tier=tier.lower()), platform_routing=platform_routing)
+    if not league:
+        return None
+    entries = sorted(league.get("entries", []), key=lambda e: e.get("leaguePoints", 0), reverse=True)
+    return [e["puuid"] for e in entries if e.get("puuid")][:players]
+
+
+async def get_player_pool(
+    riot_ids: list[str] | None,
+    ladder_tier: str | None,
+    ladder_players: int,
+    platform: str = "na",
+    game: str = "lol",
+    ctx: Context | None = None,
+) -> list[str] | dict[str, Any]:
+    """PUUIDs of a Riot ID list and/or apex ladder snapshot, deduplicated; an error dict on bad input"""
+    if not riot_ids and not ladder_tier:
+        return {"error": "Provide riot_ids and/or a ladder_tier"}
+    puuids: list[str] = []
+    if riot_ids:
+        parsed = [split_riot_id(riot_id) for riot_id in riot_ids]
+        if None in parsed:
+            return {"error": "riot_ids must look like gameName#tagLine"}
+        found = await fan_out(parsed, lambda parts: get_puuid(*parts, platform), ctx=ctx, label="players")
+        puuids.extend(puuid for puuid in found if puuid)
+    if ladder_tier:
+        ladder = await get_ladder_puuids(game, ladder_tier, platform, ladder_players)
+        if ladder is None:
+            return {"error": f"Could not retrieve the {ladder_tier} ladder"}
+        puuids.extend(ladder)
+    return list(dict.fromkeys(puuids))
+
+
+def prefetch_matches(match_ids: list[str], regional_routing: str = "americas", game: str = "lol") -> None:
+    """Warm the match cache for match ids a tool returned but did not fetch"""
+    for match_id in match_ids:
+        enqueue_prefetch(
+            f"match:{match_id}",
+            lambda match_id=match_id: get_match(match_id, regional_routing=regional_routing, game=game),
+        )
 
 
 # ============================================================================
@@ -150,26 +1963,310 @@ async def get_riot_account(game_name: str, tag_line: str) -> dict[str, Any] | No
 # ============================================================================
 
 
+def normalize_champion_name(name: str) -> str:
+    """Fold a champion name to lowercase ASCII letters and digits ("Kai'Sa" -> "kaisa")"""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return "".join(ch for ch in folded.lower() if ch.isalnum())
+
+
+def _trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)"""
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+@dataclass
+class ChampionMatch:
+    """Outcome of a champion name lookup; kind is exact, fuzzy, ambiguous or none"""
+
+    key: int | None
+    kind: str
+    alternatives: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ChampionIndex:
+    """Lookup structures for resolving user-supplied champion names to champion keys"""
+
+    names: dict[int, str] = field(default_factory=dict)
+    terms: dict[str, int] = field(default_factory=dict)
+    trigrams: dict[str, set[str]] = field(default_factory=dict)
+
+    def add_term(self, term: str, key: int) -> None:
+        term = normalize_champion_name(term)
+        if not term or term in self.terms:
+            return
+        self.terms[term] = key
+        for gram in _trigrams(term):
+            self.trigrams.setdefault(gram, set()).add(term)
+
+    def resolve(self, champion_name: str) -> int | None:
+        """Resolve a name to a champion key, or None when it is unknown or ambiguous"""
+        return self.lookup(champion_name).key
+
+    def lookup(self, champion_name: str) -> ChampionMatch:
+        """
+        Resolve a name, Data Dragon id, alias or numeric key.
+
+        Falls back to fuzzy matching: terms sharing a trigram with the query are scored by
+        trigram overlap and by edit distance, ties broken by edit distance, length difference
+        and name. The best champion wins only when it clears the threshold by a margin over
+        the next one; otherwise the close candidates come back as alternatives. Queries
+        shorter than CHAMPION_FUZZY_MIN_LENGTH only get the champions they are a prefix of.
+        """
+        query = normalize_champion_name(champion_name)
+        if not query:
+            return ChampionMatch(None, "none")
+        if query in self.terms:
+            return ChampionMatch(self.terms[query], "exact")
+        if query.isdigit() and int(query) in self.names:
+            return ChampionMatch(int(query), "exact")
+        if len(query) < CHAMPION_FUZZY_MIN_LENGTH:
+            prefixed = sorted({self.names[key] for term, key in self.terms.items() if term.startswith(query)})
+            return ChampionMatch(None, "ambiguous" if prefixed else "none", prefixed[:CHAMPION_SUGGESTIONS])
+
+        query_grams = _trigrams(query)
+        shared: dict[str, int] = {}
+        for gram in query_grams:
+            for term in self.trigrams.get(gram, ()):
+                shared[term] = shared.get(term, 0) + 1
+
+        # champion key -> best (-score, edit distance, length difference, name) over its terms
+        ranked: dict[int, tuple[float, int, int, str]] = {}
+        for term, count in shared.items():
+            distance = _edit_distance(query, term)
+            score = max(
+                2 * count / (len(query_grams) + len(_trigrams(term))),
+                1 - distance / max(len(query), len(term)),
+            )
+            key = self.terms[term]
+            rank = (-score, distance, abs(len(query) - len(term)), self.names.get(key, term))
+            if key not in ranked or rank < ranked[key]:
+                ranked[key] = rank
+        candidates = sorted(
+            ((rank, key) for key, rank in ranked.items() if -rank[0] >= CHAMPION_FUZZY_THRESHOLD), key=lambda c: c[0]
+        )
+        if not candidates:
+            return ChampionMatch(None, "none")
+        best_score = -candidates[0][0][0]
+        close = [rank[3] for rank, _ in candidates if best_score + rank[0] < CHAMPION_FUZZY_MARGIN]
+        if len(close) > 1:
+            return ChampionMatch(None, "ambiguous", close[:CHAMPION_SUGGESTIONS])
+        return ChampionMatch(candidates[0][1], "fuzzy", [rank[3] for rank, _ in candidates[1:CHAMPION_SUGGESTIONS]])
+
+
+def unknown_champion(champion_name: str, match: ChampionMatch) -> dict[str, Any]:
+    """Error response for a champion name that did not resolve, with suggestions when there are any"""
+    error: dict[str, Any] = {"error": f"Champion '{champion_name}' not found"}
+    if match.alternatives:
+        error["didYouMean"] = match.alternatives
+    return error
+
+
+# Champion name index, keyed by language (built alongside CHAMPION_MAP)
+CHAMPION_INDEX: dict[str, ChampionIndex] = {}
+
+
+@dataclass
+class StaticData:
+    """Item, rune and summoner spell names for one Data Dragon version and language"""
+
+    version: str = ""
+    items: dict[int, str] = field(default_factory=dict)
+    completed_items: set[int] = field(default_factory=set)
+    runes: dict[int, str] = field(default_factory=lambda: dict(STAT_SHARDS))
+    spells: dict[int, str] = field(default_factory=dict)
+
+    def item(self, item_id: int) -> str:
+        return self.items.get(item_id, str(item_id))
+
+    def rune(self, rune_id: int) -> str:
+        return self.runes.get(rune_id, str(rune_id))
+
+    def spell(self, spell_id: int) -> str:
+        return self.spells.get(spell_id, str(spell_id))
+
+
+# Language -> static data of the patch it was loaded for
+STATIC_DATA: dict[str, StaticData] = {}
+
+
+def build_champion_index(data: dict[str, Any]) -> ChampionIndex:
+    """Build a ChampionIndex from Data Dragon champion.json data"""
+    index = ChampionIndex(names={int(c["key"]): c["name"] for c in data.values()})
+    ids = {c["id"]: int(c["key"]) for c in data.values()}
+    for champ in data.values():
+        index.add_term(champ["name"], int(champ["key"]))
+        index.add_term(champ["id"], int(champ["key"]))
+    for alias, champ_id in CHAMPION_ALIASES.items():
+        if champ_id in ids:
+            index.add_term(alias, ids[champ_id])
+    return index
+
+
+async def get_ddragon_languages() -> list[str] | None:
+    """Languages Data Dragon publishes static data in"""
+    languages = await RIOT_BACKEND.get("ddragon:languages")
+    if languages is None:
+        try:
+            async with httpx.AsyncClient(transport=cassette_transport()) as client:
+                res = await client.get("https://ddragon.leagueoflegends.com/cdn/languages.json")
+                res.raise_for_status()
+                languages = res.json()
+        except Exception as e:
+            logger.warning("Error fetching Data Dragon languages: %s", e)
+            return None
+        await RIOT_BACKEND.set("ddragon:languages", languages, DDRAGON_CACHE_TTL)
+    return languages
+
+
+async def resolve_language(language: str) -> str:
+    """Validate a client-supplied language against Data Dragon, falling back to en_US"""
+    if language in CHAMPION_MAP:
+        return language
+    languages = await get_ddragon_languages()
+    if languages is None or language in languages:
+        return language
+    logger.warning("Unknown Data Dragon language %r, using %s", language, DEFAULT_LANGUAGE)
+    return DEFAULT_LANGUAGE
+
+
+async def get_ddragon_version() -> str:
+    """Current Data Dragon patch version; raises if it cannot be fetched"""
+    version = await RIOT_BACKEND.get("ddragon:version")
+    if version is None:
+        async with httpx.AsyncClient(transport=cassette_transport()) as client:
+            res = await client.get("https://ddragon.leagueoflegends.com/api/versions.json")
+            res.raise_for_status()
+            version = res.json()[0]
+        await RIOT_BACKEND.set("ddragon:version", version, DDRAGON_CACHE_TTL)
+    return version
+
+
 async def get_champion_map(language: str = "en_US") -> dict[int, str]:
     """Get champion ID to name mapping"""
     if language in CHAMPION_MAP:
         return CHAMPION_MAP[language]
 
+    language = await resolve_language(language)
+    if language in CHAMPION_MAP:
+        return CHAMPION_MAP[language]
     try:
-        async with httpx.AsyncClient() as client:
-            version_res = await client.get("https://ddragon.leagueoflegends.com/api/versions.json")
-            version = version_res.json()[0]
-            champ_res = await client.get(
-                f"https://ddragon.leagueoflegends.com/cdn/{version}/data/{language}/champion.json"
-            )
-            data = champ_res.json()["data"]
-            CHAMPION_MAP[language] = {int(c["key"]): c["name"] for c in data.values()}
-            return CHAMPION_MAP[language]
+        # Another server instance may already have downloaded this language
+        data = await RIOT_BACKEND.get(f"ddragon:champion:{language}")
+        if data is None:
+            version = await get_ddragon_version()
+            async with httpx.AsyncClient(transport=cassette_transport()) as client:
+                champ_res = await client.get(
+                    f"https://ddragon.leagueoflegends.com/cdn/{version}/data/{language}/champion.json"
+                )
+                data = champ_res.json()["data"]
+            await RIOT_BACKEND.set(f"ddragon:champion:{language}", data, DDRAGON_CACHE_TTL)
+        CHAMPION_INDEX[language] = build_champion_index(data)
+        CHAMPION_MAP[language] = CHAMPION_INDEX[language].names
+        return CHAMPION_MAP[language]
     except Exception as e:
-        print(f"Error fetching champion map: {e}")
+        logger.warning("Error fetching champion map: %s", e)
         return {}
 
 
+async def get_champion_index(language: str = "en_US") -> ChampionIndex:
+    """Get the champion name index for a language, loading champion data if needed"""
+    await get_champion_map(language)
+    return CHAMPION_INDEX.get(language) or CHAMPION_INDEX.get(DEFAULT_LANGUAGE, ChampionIndex())
+
+
+def build_static_data(version: str, tables: dict[str, dict[str, Any]]) -> StaticData:
+    """Static data from the trimmed tables stored by get_static_data (JSON object keys are strings)"""
+    static = StaticData(version=version)
+    for item_id, (name, completed) in tables["items"].items():
+        static.items[int(item_id)] = name
+        if completed:
+            static.completed_items.add(int(item_id))
+    static.runes.update((int(rune_id), name) for rune_id, name in tables["runes"].items())
+    static.spells.update((int(spell_id), name) for spell_id, name in tables["spells"].items())
+    return static
+
+
+async def get_static_data(language: str = "en_US") -> StaticData:
+    """
+    Item, rune and summoner spell names for the current patch.
+
+    Loaded once per patch and language; the trimmed tables are also stored in the backend
+    so other server instances skip the three Data Dragon downloads.
+    """
+    language = await resolve_language(language)
+    cached = STATIC_DATA.get(language)
+    try:
+        version = await get_ddragon_version()
+        if cached and cached.version == version:
+            return cached
+        tables = await RIOT_BACKEND.get(f"ddragon:static:{version}:{language}")
+        if tables is None:
+            base = f"https://ddragon.leagueoflegends.com/cdn/{version}/data/{language}"
+            async with httpx.AsyncClient(transport=cassette_transport()) as client:
+                responses = await asyncio.gather(
+                    *(client.get(f"{base}/{name}.json") for name in ("item", "runesReforged", "summoner"))
+                )
+            for res in responses:
+                res.raise_for_status()
+            items, styles, spells = (res.json() for res in responses)
+            tables = {
+                "items": {
+                    item_id: [item["name"], not item.get("into") and item["gold"]["total"] >= COMPLETED_ITEM_MIN_GOLD]
+                    for item_id, item in items["data"].items()
+                },
+                "runes": {
+                    str(rune["id"]): rune["name"]
+                    for style in styles
+                    for rune in [style] + [rune for slot in style["slots"] for rune in slot["runes"]]
+                },
+                "spells": {spell["key"]: spell["name"] for spell in spells["data"].values()},
+            }
+            await RIOT_BACKEND.set(f"ddragon:static:{version}:{language}", tables, DDRAGON_CACHE_TTL)
+        STATIC_DATA[language] = build_static_data(version, tables)
+        return STATIC_DATA[language]
+    except Exception as e:
+        logger.warning("Error fetching static data: %s", e)
+        return cached or StaticData()
+
+
+def decode_loadout(participant: dict[str, Any], static: StaticData) -> dict[str, Any]:
+    """Names of a match participant's items, summoner spells and rune page"""
+    styles = {style.get("description"): style for style in participant.get("perks", {}).get("styles", [])}
+    primary, secondary = styles.get("primaryStyle", {}), styles.get("subStyle", {})
+    primary_runes = [static.rune(s["perk"]) for s in primary.get("selections", [])]
+    shards = participant.get("perks", {}).get("statPerks", {})
+    return {
+        "itemNames": [static.item(participant.get(f"item{i}")) for i in range(7) if participant.get(f"item{i}")],
+        "summonerSpells": [static.spell(participant[k]) for k in ("summoner1Id", "summoner2Id") if k in participant],
+        "runes": {
+            "keystone": primary_runes[0] if primary_runes else None,
+            "primaryStyle": static.rune(primary["style"]) if "style" in primary else None,
+            "primary": primary_runes[1:],
+            "subStyle": static.rune(secondary["style"]) if "style" in secondary else None,
+            "secondary": [static.rune(s["perk"]) for s in secondary.get("selections", [])],
+            "shards": [static.rune(shards[key]) for key in ("offense", "flex", "defense") if key in shards],
+        }
+        if styles
+        else None,
+    }
+
+
 # ============================================================================
 # HELPER FUNCTIONS - LEAGUE OF LEGENDS
 # ============================================================================
@@ -177,21 +2274,31 @@ async def get_champion_map(language: str = "en_US") -> dict[int, str]:
 
 async def get_summoner_by_puuid(puuid: str, platform: str = "na") -> dict[str, Any] | None:
     """Get summoner info by PUUID"""
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    return await riot_request(f"/lol/summoner/v4/summoners/by-puuid/{puuid}", platform_routing=platform_routing)
+    platform_routing = resolve_route(platform)
+    return await riot_request(
+        f"/lol/summoner/v4/summoners/by-puuid/{puuid}",
+        platform_routing=platform_routing,
+        cache_ttl=SUMMONER_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
 
 
 async def get_rank_by_puuid(puuid: str, platform: str = "na") -> dict[str, Any] | list[dict] | None:
     """Get rank data by PUUID"""
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    return await riot_request(f"/lol/league/v4/entries/by-puuid/{puuid}", platform_routing=platform_routing)
+    platform_routing = resolve_route(platform)
+    return await riot_request(
+        f"/lol/league/v4/entries/by-puuid/{puuid}",
+        platform_routing=platform_routing,
+        cache_ttl=RANK_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
 
 
 async def get_top_champions(
     puuid: str, champ_map: dict[int, str], count: int = 3, platform: str = "na"
 ) -> list[dict[str, Any]]:
     """Get top champions for player"""
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
+    platform_routing = resolve_route(platform)
     mastery_data = await riot_request(
         f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}/top",
         platform_routing=platform_routing,
@@ -211,6 +2318,190 @@ async def get_top_champions(
     ]
 
 
+def mastery_history(puuid: str, platform: str = "na", create: bool = False) -> list[dict[str, Any]] | None:
+    """A player's stored mastery snapshots, marking the player as recently used"""
+    key = (resolve_route(platform), puuid)
+    history = MASTERY_SNAPSHOTS.get(key)
+    if history is not None:
+        MASTERY_SNAPSHOTS.move_to_end(key)
+    elif create:
+        history = MASTERY_SNAPSHOTS[key] = []
+        while len(MASTERY_SNAPSHOTS) > MASTERY_SNAPSHOT_PLAYERS:
+            MASTERY_SNAPSHOTS.popitem(last=False)
+    return history
+
+
+async def get_mastery_snapshot(puuid: str, platform: str = "na", refresh: bool = False) -> dict[str, Any] | None:
+    """
+    Get the player's full champion mastery list as a snapshot.
+
+    The latest snapshot is reused for MASTERY_SNAPSHOT_TTL seconds; each refetch is appended
+    to MASTERY_SNAPSHOTS (kept per process) so point gains can be computed without refetching history.
+    """
+    platform_routing = resolve_route(platform)
+    history = mastery_history(puuid, platform, create=True)
+    if history and not refresh and time.time() - history[-1]["takenAt"] < MASTERY_SNAPSHOT_TTL:
+        return history[-1]
+
+    mastery_data = await riot_request(
+        f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}",
+        platform_routing=platform_routing,
+    )
+    if mastery_data is None:
+        return history[-1] if history else None
+
+    snapshot = {
+        "takenAt": time.time(),
+        "masteries": {c["championId"]: c for c in mastery_data},
+    }
+    history.append(snapshot)
+    del history[:-MASTERY_SNAPSHOT_HISTORY]
+    return snapshot
+
+
+def cached_mastery_snapshot(puuid: str, platform: str = "na") -> dict[str, Any] | None:
+    """Return the latest mastery snapshot if it is still fresh, without any network call"""
+    history = mastery_history(puuid, platform)
+    if history and time.time() - history[-1]["takenAt"] < MASTERY_SNAPSHOT_TTL:
+        return history[-1]
+    return None
+
+
+def mastery_point_gains(puuid: str, platform: str = "na") -> tuple[float | None, dict[int, int]]:
+    """Compute per-champion point gains between the oldest and latest stored snapshot"""
+    history = mastery_history(puuid, platform) or []
+    if len(history) < 2:
+        return None, {}
+
+    baseline, latest = history[0]["masteries"], history[-1]["masteries"]
+    gains = {}
+    for champion_id, mastery in latest.items():
+        gained = mastery.get("championPoints", 0) - baseline.get(champion_id, {}).get("championPoints", 0)
+        if gained > 0:
+            gains[champion_id] = gained
+    return history[0]["takenAt"], gains
+
+
+async def get_player_challenges(puuid: str, platform: str = "na") -> dict[str, Any] | None:
+    """Get a player's challenge progress (challenges-v1 is served per platform)"""
+    url = f"/lol/challenges/v1/player-data/{puuid}"
+    return await riot_request(url, platform_routing=resolve_route(platform), cache_ttl=CHALLENGES_CACHE_TTL)
+
+
+@dataclass
+class ChallengeConfig:
+    """Challenge names, level thresholds and share of players at each level for one platform"""
+
+    loaded_at: float = 0.0
+    names: dict[int, dict[str, tuple[str, str]]] = field(default_factory=dict)
+    thresholds: dict[int, dict[str, float]] = field(default_factory=dict)
+    percentiles: dict[int, dict[str, float]] = field(default_factory=dict)
+
+    def name(self, challenge_id: int, language: str = DEFAULT_LANGUAGE) -> tuple[str, str]:
+        """(name, short description) of a challenge, in English when the language is missing"""
+        names = self.names.get(challenge_id, {})
+        return names.get(language) or names.get(DEFAULT_LANGUAGE) or (str(challenge_id), "")
+
+    def next_level(self, challenge_id: int, level: str) -> tuple[str, float] | None:
+        """The level after `level` that has a threshold, with that threshold"""
+        thresholds = self.thresholds.get(challenge_id, {})
+        start = CHALLENGE_LEVELS.index(level) + 1 if level in CHALLENGE_LEVELS else 0
+        return next(((lvl, thresholds[lvl]) for lvl in CHALLENGE_LEVELS[start:] if lvl in thresholds), None)
+
+
+# Platform host -> challenge config
+CHALLENGE_CONFIGS: dict[str, ChallengeConfig] = {}
+
+
+def build_challenge_config(tables: dict[str, dict[str, Any]]) -> ChallengeConfig:
+    """Challenge config from the trimmed tables stored by get_challenge_config (JSON object keys are strings)"""
+    config = ChallengeConfig(loaded_at=time.time())
+    for challenge_id, names in tables["names"].items():
+        config.names[int(challenge_id)] = {language: tuple(text) for language, text in names.items()}
+    config.thresholds = {int(challenge_id): levels for challenge_id, levels in tables["thresholds"].items()}
+    config.percentiles = {int(challenge_id): levels for challenge_id, levels in tables["percentiles"].items()}
+    return config
+
+
+async def get_challenge_config(platform: str = "na") -> ChallengeConfig | None:
+    """
+    Challenge config and level percentiles for a platform.
+
+    Loaded once per CHALLENGE_CONFIG_TTL; only names, thresholds and percentiles are kept, and
+    the trimmed tables are also stored in the backend so other server instances skip both calls.
+    """
+    host = resolve_route(platform)
+    cached = CHALLENGE_CONFIGS.get(host)
+    if cached and time.time() - cached.loaded_at < CHALLENGE_CONFIG_TTL:
+        return cached
+
+    async def load() -> ChallengeConfig | None:
+        tables = await RIOT_BACKEND.get(f"challenges:config:{host}")
+        if tables is None:
+            challenges, percentiles = await asyncio.gather(
+                riot_request("/lol/challenges/v1/challenges/config", platform_routing=host),
+                riot_request("/lol/challenges/v1/challenges/percentiles", platform_routing=host),
+            )
+            if challenges is None:
+                return cached
+            tables = {
+                "names": {
+                    str(challenge["id"]): {
+                        language: [text.get("name", ""), text.get("shortDescription", "")]
+                        for language, text in challenge.get("localizedNames", {}).items()
+                    }
+                    for challenge in challenges
+                },
+                "thresholds": {str(challenge["id"]): challenge.get("thresholds", {}) for challenge in challenges},
+                "percentiles": percentiles or {},
+            }
+            await RIOT_BACKEND.set(f"challenges:config:{host}", tables, CHALLENGE_CONFIG_TTL)
+        CHALLENGE_CONFIGS[host] = build_challenge_config(tables)
+        return CHALLENGE_CONFIGS[host]
+
+    return await single_flight(f"challenges:config:{host}", load)
+
+
+def format_challenge(
+    entry: dict[str, Any], config: ChallengeConfig, language: str = DEFAULT_LANGUAGE
+) -> dict[str, Any]:
+    """A player's progress in one challenge, with its name, next threshold and how rare the level is"""
+    challenge_id, level = entry.get("challengeId"), entry.get("level", "NONE")
+    name, description = config.name(challenge_id, language)
+    next_level = config.next_level(challenge_id, level)
+    level_share = config.percentiles.get(challenge_id, {}).get(level)
+    return {
+        "challengeId": challenge_id,
+        "name": name,
+        "description": description,
+        "level": level,
+        "value": entry.get("value"),
+        "topPercent": round(entry["percentile"] * 100, 2) if entry.get("percentile") is not None else None,
+        "levelTopPercent": round(level_share * 100, 2) if level_share is not None else None,
+        "nextLevel": next_level[0] if next_level else None,
+        "nextThreshold": next_level[1] if next_level else None,
+    }
+
+
+async def get_champion_mastery_entry(puuid: str, champion_id: int, platform: str = "na") -> dict[str, Any] | None:
+    """Get one champion's mastery, from the cached snapshot when there is one"""
+    snapshot = cached_mastery_snapshot(puuid, platform)
+    if snapshot is not None:
+        return snapshot["masteries"].get(champion_id)
+    platform_routing = resolve_route(platform)
+    return await riot_request(
+        f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}/by-champion/{champion_id}",
+        platform_routing=platform_routing,
+        cache_ttl=MASTERY_SNAPSHOT_TTL,
+    )
+
+
+def prefetch_player(puuid: str, platform: str = "na") -> None:
+    """Warm the resources usually asked for after a player lookup (challenges, full mastery)"""
+    enqueue_prefetch(f"challenges:{platform}:{puuid}", lambda: get_player_challenges(puuid, platform))
+    enqueue_prefetch(f"mastery:{platform}:{puuid}", lambda: get_mastery_snapshot(puuid, platform))
+
+
 # ============================================================================
 # LEAGUE OF LEGENDS - PLAYER & RANK TOOLS
 # ============================================================================
@@ -222,19 +2513,20 @@ async def lol_get_player_summary(
     tag_line: str,
     platform: str = "na",
     language: str = "en_US",
+    ctx: Context = None,
 ) -> dict[str, Any]:
     """
     🧾 Get a complete League of Legends player profile summary.
 
     Returns: level, solo rank, flex rank, top champions, recent matches, and challenge progress.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
     champ_map = await get_champion_map(language)
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
+    platform_routing = resolve_route(platform)
+    regional_routing = resolve_route(platform, "match")
 
     summoner = await get_summoner_by_puuid(puuid, platform)
     if not summoner:
@@ -253,29 +2545,33 @@ async def lol_get_player_summary(
 
     top_champs = await get_top_champions(puuid, champ_map, count=5, platform=platform)
 
-    # Get recent matches
-    match_ids = await riot_regional_request(
-        f"/lol/match/v5/matches/by-puuid/{puuid}/ids",
-        regional_routing=regional_routing,
-        params={"count": 10},
-    )
+    def summarize(match_id: str, match: dict[str, Any]) -> dict[str, Any] | None:
+        participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
+        if not participant:
+            return None
+        return {
+            "matchId": match_id,
+            "champion": participant["championName"],
+            "kda": f"{participant['kills']}/{participant['deaths']}/{participant['assists']}",
+            "result": "Win" if participant["win"] else "Loss",
+            "position": participant.get("teamPosition", "UNKNOWN"),
+        }
 
+    # Recent matches are optional: once the deadline budget runs out, return what was fetched
     recent_matches = []
-    if match_ids:
-        for match_id in match_ids[:5]:  # Limit to 5 for summary
-            match = await riot_regional_request(f"/lol/match/v5/matches/{match_id}", regional_routing=regional_routing)
-            if match:
-                participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
-                if participant:
-                    recent_matches.append(
-                        {
-                            "matchId": match_id,
-                            "champion": participant["championName"],
-                            "kda": f"{participant['kills']}/{participant['deaths']}/{participant['assists']}",
-                            "result": "Win" if participant["win"] else "Loss",
-                            "position": participant.get("teamPosition", "UNKNOWN"),
-                        }
-                    )
+    with optional_budget():
+        try:
+            match_ids = await get_match_ids(puuid, regional_routing=regional_routing, game="lol", count=10)
+            if match_ids:
+                # Limit to 5 for summary
+                recent_matches = await fetch_matches(
+                    match_ids[:5], summarize, regional_routing=regional_routing, ctx=ctx, partial=True
+                )
+                prefetch_matches(match_ids[5:], regional_routing=regional_routing)
+        except DeadlineExceeded:
+            pass
+        partial = budget_exhausted()
+    prefetch_player(puuid, platform)
 
     return {
         "gameName": game_name,
@@ -308,143 +2604,287 @@ async def lol_get_player_summary(
         else None,
         "topChampions": top_champs,
         "recentMatches": recent_matches,
+        "partial": partial,
+        "freshness": cache_freshness(),
+    }
+
+
+@mcp.tool()
+async def lol_get_top_champions(
+    game_name: str, tag_line: str, platform: str = "na", language: str = "en_US", count: int = 5
+) -> dict[str, Any]:
+    """
+    🔝 Get a League of Legends player's top champion masteries.
+
+    Returns the player's most-played champions ranked by mastery points.
+    """
+    puuid = await get_puuid(game_name, tag_line, platform)
+    if not puuid:
+        return {"error": "Failed to find player"}
+
+    champ_map = await get_champion_map(language)
+    top_champs = await get_top_champions(puuid, champ_map, count=count, platform=platform)
+    prefetch_player(puuid, platform)
+
+    return {
+        "gameName": game_name,
+        "tagLine": tag_line,
+        "puuid": puuid,
+        "topChampions": top_champs,
+    }
+
+
+@mcp.tool()
+async def lol_get_recent_matches(
+    game_name: str, tag_line: str, platform: str = "na", count: int = 10, ctx: Context = None
+) -> dict[str, Any]:
+    """
+    🕹️ Get a League of Legends player's recent match history.
+
+    Returns brief summaries of recent matches including champion, KDA, and outcome.
+    Matches are fetched concurrently; progress and each finished row are streamed to the client.
+    """
+    puuid = await get_puuid(game_name, tag_line, platform)
+    if not puuid:
+        return {"error": "Failed to find player"}
+
+    regional_routing = resolve_route(platform, "match")
+    match_ids = await get_match_ids(puuid, regional_routing=regional_routing, game="lol", count=count)
+
+    if not match_ids:
+        return {"gameName": game_name, "tagLine": tag_line, "puuid": puuid, "recentMatches": []}
+
+    def summarize(match_id: str, match: dict[str, Any]) -> dict[str, Any] | None:
+        participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
+        if not participant:
+            return None
+        return {
+            "matchId": match_id,
+            "champion": participant["championName"],
+            "kills": participant["kills"],
+            "deaths": participant["deaths"],
+            "assists": participant["assists"],
+            "kda": f"{participant['kills']}/{participant['deaths']}/{participant['assists']}",
+            "position": participant.get("teamPosition", "UNKNOWN"),
+            "lane": participant.get("lane", "UNKNOWN"),
+            "result": "Win" if participant["win"] else "Loss",
+            "gold": participant.get("goldEarned"),
+            "cs": participant.get("totalMinionsKilled", 0) + participant.get("neutralMinionsKilled", 0),
+        }
+
+    matches = await fetch_matches(match_ids, summarize, regional_routing=regional_routing, ctx=ctx)
+    prefetch_player(puuid, platform)
+
+    return {
+        "gameName": game_name,
+        "tagLine": tag_line,
+        "puuid": puuid,
+        "recentMatches": matches,
+    }
+
+
+def format_champion_mastery(mastery: dict[str, Any], champ_map: dict[int, str]) -> dict[str, Any]:
+    """Shape a champion-mastery-v4 entry for tool output"""
+    # Convert Unix timestamp to readable format
+    last_play_time = None
+    if mastery.get("lastPlayTime"):
+        last_play_time = datetime.fromtimestamp(mastery["lastPlayTime"] / 1000).isoformat()
+
+    champion_id = mastery.get("championId")
+    return {
+        "championName": champ_map.get(champion_id, f"ID({champion_id})"),
+        "championId": champion_id,
+        "level": mastery.get("championLevel"),
+        "points": mastery.get("championPoints"),
+        "pointsSinceLastLevel": mastery.get("championPointsSinceLastLevel"),
+        "pointsUntilNextLevel": mastery.get("championPointsUntilNextLevel"),
+        "lastPlayTime": last_play_time,
+        "tokensEarned": mastery.get("tokensEarned"),
+        "chestGranted": mastery.get("chestGranted"),
+        "nextMilestone": mastery.get("nextSeasonMilestone"),
     }
 
 
 @mcp.tool()
-async def lol_get_top_champions(
-    game_name: str, tag_line: str, platform: str = "na", language: str = "en_US", count: int = 5
+async def lol_get_champion_mastery(
+    game_name: str, tag_line: str, champion_name: str, platform: str = "na", language: str = "en_US"
 ) -> dict[str, Any]:
     """
-    🔝 Get a League of Legends player's top champion masteries.
+    🎯 Get detailed League of Legends champion mastery information.
 
-    Returns the player's most-played champions ranked by mastery points.
+    Returns mastery level, points, last play time, progression, and milestone data.
+    Champion names are matched loosely ("wukong", "MonkeyKing", "kaisa", "mf").
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    champ_map = await get_champion_map(language)
-    top_champs = await get_top_champions(puuid, champ_map, count=count, platform=platform)
+    champion_index = await get_champion_index(language)
+    match = champion_index.lookup(champion_name)
+    champion_id = match.key
+    if champion_id is None:
+        return unknown_champion(champion_name, match)
+
+    mastery = await get_champion_mastery_entry(puuid, champion_id, platform)
+    if not mastery:
+        return {"error": f"Could not find mastery data for {champion_name}"}
 
     return {
         "gameName": game_name,
         "tagLine": tag_line,
         "puuid": puuid,
-        "topChampions": top_champs,
+        **format_champion_mastery(mastery, champion_index.names),
+        **({"matchedFrom": champion_name} if match.kind == "fuzzy" else {}),
     }
 
 
 @mcp.tool()
-async def lol_get_recent_matches(
-    game_name: str, tag_line: str, platform: str = "na", count: int = 10
+async def lol_get_champion_masteries(
+    game_name: str, tag_line: str, champion_names: list[str], platform: str = "na", language: str = "en_US"
 ) -> dict[str, Any]:
     """
-    🕹️ Get a League of Legends player's recent match history.
+    🎯 Get League of Legends champion mastery for several champions at once.
 
-    Returns brief summaries of recent matches including champion, KDA, and outcome.
+    Resolves every champion name in one pass and answers all of them from a single
+    full-mastery snapshot, plus the names that could not be matched to a champion.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
-    match_ids = await riot_regional_request(
-        f"/lol/match/v5/matches/by-puuid/{puuid}/ids", regional_routing=regional_routing, params={"count": count}
-    )
-
-    if not match_ids:
-        return {"gameName": game_name, "tagLine": tag_line, "puuid": puuid, "recentMatches": []}
-
-    matches = []
-    for match_id in match_ids:
-        match = await riot_regional_request(f"/lol/match/v5/matches/{match_id}", regional_routing=regional_routing)
-        if match:
-            participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
-            if participant:
-                matches.append(
-                    {
-                        "matchId": match_id,
-                        "champion": participant["championName"],
-                        "kills": participant["kills"],
-                        "deaths": participant["deaths"],
-                        "assists": participant["assists"],
-                        "kda": f"{participant['kills']}/{participant['deaths']}/{participant['assists']}",
-                        "position": participant.get("teamPosition", "UNKNOWN"),
-                        "lane": participant.get("lane", "UNKNOWN"),
-                        "result": "Win" if participant["win"] else "Loss",
-                        "gold": participant.get("goldEarned"),
-                        "cs": participant.get("totalMinionsKilled", 0) + participant.get("neutralMinionsKilled", 0),
-                    }
-                )
+    champion_index = await get_champion_index(language)
+    champion_ids: list[int] = []
+    unresolved: list[str] = []
+    suggestions: dict[str, list[str]] = {}
+    for name in champion_names:
+        match = champion_index.lookup(name)
+        if match.key is None:
+            unresolved.append(name)
+            if match.alternatives:
+                suggestions[name] = match.alternatives
+        elif match.key not in champion_ids:
+            champion_ids.append(match.key)
+
+    snapshot = await get_mastery_snapshot(puuid, platform)
+    if snapshot is None:
+        return {"error": "Could not retrieve champion mastery data"}
+
+    masteries = []
+    for champion_id in champion_ids:
+        mastery = snapshot["masteries"].get(champion_id)
+        if mastery:
+            masteries.append(format_champion_mastery(mastery, champion_index.names))
+        else:
+            masteries.append(
+                {
+                    "championName": champion_index.names.get(champion_id),
+                    "championId": champion_id,
+                    "level": 0,
+                    "points": 0,
+                }
+            )
 
     return {
         "gameName": game_name,
         "tagLine": tag_line,
         "puuid": puuid,
-        "recentMatches": matches,
+        "masteries": masteries,
+        "unresolved": unresolved,
+        "didYouMean": suggestions,
     }
 
 
 @mcp.tool()
-async def lol_get_champion_mastery(
-    game_name: str, tag_line: str, champion_name: str, platform: str = "na", language: str = "en_US"
+async def lol_get_mastery_snapshot(
+    game_name: str,
+    tag_line: str,
+    platform: str = "na",
+    language: str = "en_US",
+    champion_names: list[str] | None = None,
+    top: int | None = None,
+    min_level: int | None = None,
+    played_within_days: int | None = None,
+    refresh: bool = False,
 ) -> dict[str, Any]:
     """
-    🎯 Get detailed League of Legends champion mastery information.
+    📚 Get a League of Legends player's full champion mastery snapshot.
 
-    Returns mastery level, points, last play time, progression, and milestone data.
+    Fetches every champion mastery once (reused for a few minutes) and filters it locally:
+    by champion names, minimum level, recent play, or top-N by points. Also returns the
+    mastery points gained per champion since the oldest stored snapshot.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    champion_map = await get_champion_map(language)
-    champion_id = next((cid for cid, name in champion_map.items() if name.lower() == champion_name.lower()), None)
-    if not champion_id:
-        return {"error": f"Champion '{champion_name}' not found"}
-
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    mastery = await riot_request(
-        f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}/by-champion/{champion_id}",
-        platform_routing=platform_routing,
-    )
-    if not mastery:
-        return {"error": f"Could not find mastery data for {champion_name}"}
-
-    # Convert Unix timestamp to readable format
-    last_play_time = None
-    if mastery.get("lastPlayTime"):
-        last_play_time = datetime.fromtimestamp(mastery["lastPlayTime"] / 1000).isoformat()
+    snapshot = await get_mastery_snapshot(puuid, platform, refresh=refresh)
+    if snapshot is None:
+        return {"error": "Could not retrieve champion mastery data"}
+
+    champion_index = await get_champion_index(language)
+    entries = sorted(snapshot["masteries"].values(), key=lambda c: c.get("championPoints", 0), reverse=True)
+
+    unresolved = []
+    suggestions: dict[str, list[str]] = {}
+    if champion_names:
+        wanted = set()
+        for name in champion_names:
+            match = champion_index.lookup(name)
+            if match.key is None:
+                unresolved.append(name)
+                if match.alternatives:
+                    suggestions[name] = match.alternatives
+            else:
+                wanted.add(match.key)
+        entries = [c for c in entries if c["championId"] in wanted]
+    if min_level is not None:
+        entries = [c for c in entries if c.get("championLevel", 0) >= min_level]
+    if played_within_days is not None:
+        cutoff_ms = (time.time() - played_within_days * 86400) * 1000
+        entries = [c for c in entries if c.get("lastPlayTime", 0) >= cutoff_ms]
+    if top is not None:
+        entries = entries[:top]
+
+    since, gains = mastery_point_gains(puuid, platform)
 
     return {
         "gameName": game_name,
         "tagLine": tag_line,
         "puuid": puuid,
-        "championName": champion_name,
-        "championId": champion_id,
-        "level": mastery.get("championLevel"),
-        "points": mastery.get("championPoints"),
-        "pointsSinceLastLevel": mastery.get("championPointsSinceLastLevel"),
-        "pointsUntilNextLevel": mastery.get("championPointsUntilNextLevel"),
-        "lastPlayTime": last_play_time,
-        "tokensEarned": mastery.get("tokensEarned"),
-        "chestGranted": mastery.get("chestGranted"),
-        "nextMilestone": mastery.get("nextSeasonMilestone"),
+        "snapshotTakenAt": datetime.fromtimestamp(snapshot["takenAt"]).isoformat(),
+        "totalChampions": len(snapshot["masteries"]),
+        "totalPoints": sum(c.get("championPoints", 0) for c in snapshot["masteries"].values()),
+        "masteries": [format_champion_mastery(c, champion_index.names) for c in entries],
+        "unresolved": unresolved,
+        "didYouMean": suggestions,
+        "pointGains": {
+            "since": datetime.fromtimestamp(since).isoformat() if since else None,
+            "champions": [
+                {
+                    "championName": champion_index.names.get(champion_id, f"ID({champion_id})"),
+                    "championId": champion_id,
+                    "pointsGained": gained,
+                }
+                for champion_id, gained in sorted(gains.items(), key=lambda g: g[1], reverse=True)
+            ],
+        },
     }
 
 
 @mcp.tool()
 async def lol_get_match_details(
-    match_id: str, puuid: str, platform: str = "na"
+    match_id: str, puuid: str, platform: str = "na", language: str = "en_US"
 ) -> dict[str, Any]:
     """
     📊 Get detailed League of Legends match statistics.
 
-    Returns comprehensive stats including KDA, damage, vision, gold, CS, and more.
+    Returns comprehensive stats including KDA, damage, vision, gold, CS, and more, plus
+    item, summoner spell and rune names decoded from the current patch's Data Dragon data.
     """
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
-    match = await riot_regional_request(f"/lol/match/v5/matches/{match_id}", regional_routing=regional_routing)
+    regional_routing = resolve_route(platform, "match")
+    match, static = await asyncio.gather(
+        get_match(match_id, regional_routing=regional_routing), get_static_data(language)
+    )
     if not match:
         return {"error": "Failed to load match data"}
 
@@ -458,6 +2898,7 @@ async def lol_get_match_details(
     # Calculate CS per minute
     total_cs = participant.get("totalMinionsKilled", 0) + participant.get("neutralMinionsKilled", 0)
     cs_per_minute = round(total_cs / game_duration_minutes, 2) if game_duration_minutes > 0 else 0
+    loadout = decode_loadout(participant, static)
 
     return {
         "matchId": match_id,
@@ -506,7 +2947,10 @@ async def lol_get_match_details(
             "itemsBuilt": [
                 participant.get(f"item{i}") for i in range(7) if participant.get(f"item{i}") != 0
             ],
+            "itemNames": loadout["itemNames"],
         },
+        "summonerSpells": loadout["summonerSpells"],
+        "runes": loadout["runes"],
         "gameDuration": {"seconds": game_duration_seconds, "minutes": round(game_duration_minutes, 1)},
         "gameQueueId": match["info"]["queueId"],
         "gameMode": match["info"].get("gameMode", "UNKNOWN"),
@@ -514,23 +2958,35 @@ async def lol_get_match_details(
 
 
 @mcp.tool()
-async def lol_get_challenges(game_name: str, tag_line: str, platform: str = "na") -> dict[str, Any]:
+async def lol_get_challenges(
+    game_name: str, tag_line: str, platform: str = "na", language: str = "en_US"
+) -> dict[str, Any]:
     """
     🏆 Get League of Legends player challenge progress.
 
-    Returns information about challenges the player is progressing through.
+    Returns information about challenges the player is progressing through, with each
+    challenge's name and next level threshold.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
-    challenges = await riot_regional_request(
-        f"/lol/challenges/v1/player-data/{puuid}", regional_routing=regional_routing
-    )
-
+    challenges, config = await asyncio.gather(get_player_challenges(puuid, platform), get_challenge_config(platform))
     if not challenges:
         return {"error": "Could not retrieve challenge data"}
+    prefetch_player(puuid, platform)
+
+    entries = challenges.get("challenges", [])
+    if config:
+        named = []
+        for entry in entries:
+            next_level = config.next_level(entry.get("challengeId"), entry.get("level", "NONE"))
+            named.append({
+                **entry,
+                "name": config.name(entry.get("challengeId"), language)[0],
+                "nextThreshold": next_level[1] if next_level else None,
+            })
+        entries = named
 
     return {
         "gameName": game_name,
@@ -538,10 +2994,92 @@ async def lol_get_challenges(game_name: str, tag_line: str, platform: str = "na"
         "puuid": puuid,
         "totalPoints": challenges.get("totalPoints"),
         "categoryPoints": challenges.get("categoryPoints"),
-        "challenges": challenges.get("challenges", []),
+        "challenges": entries,
     }
 
 
+@mcp.tool()
+async def lol_get_top_challenges(
+    riot_ids: list[str],
+    platform: str = "na",
+    top: int = 10,
+    challenge_ids: list[int] | None = None,
+    language: str = "en_US",
+    ctx: Context = None,
+) -> dict[str, Any]:
+    """
+    🏅 Get players' rarest challenges and compare them side by side.
+
+    For each Riot ID (gameName#tagLine) returns the `top` challenges the player ranks highest
+    in by percentile, with names, levels and the next threshold. With several players, each
+    challenge in `challenge_ids` (default: every listed top challenge) is compared across them.
+    Challenge names and percentiles come from a per-platform cache; only player data is fetched.
+    """
+    parsed = [split_riot_id(riot_id) for riot_id in riot_ids]
+    if not parsed or None in parsed:
+        return {"error": "riot_ids must look like gameName#tagLine"}
+    config = await get_challenge_config(platform)
+    if config is None:
+        return {"error": "Could not retrieve the challenge config"}
+
+    async def player_challenges(parts: tuple[str, str]) -> dict[str, Any] | None:
+        puuid = await get_puuid(*parts, platform)
+        return await get_player_challenges(puuid, platform) if puuid else None
+
+    found = await fan_out(parsed, player_challenges, ctx=ctx, label="players")
+
+    players, progress = [], {}
+    for riot_id, data in zip(riot_ids, found):
+        if not data:
+            players.append({"riotId": riot_id, "error": "Could not retrieve challenge data"})
+            continue
+        entries = {
+            entry["challengeId"]: entry
+            for entry in data.get("challenges", [])
+            if entry.get("level", "NONE") != "NONE" and entry.get("challengeId") in config.names
+        }
+        progress[riot_id] = entries
+        ranked = sorted(entries.values(), key=lambda entry: (entry.get("percentile", 1.0), -entry.get("value", 0)))
+        players.append({
+            "riotId": riot_id,
+            "totalPoints": data.get("totalPoints"),
+            "topChallenges": [format_challenge(entry, config, language) for entry in ranked[:top]],
+        })
+
+    comparison = []
+    if len(progress) > 1:
+        compared = challenge_ids or list(dict.fromkeys(
+            challenge["challengeId"] for player in players for challenge in player.get("topChallenges", [])
+        ))
+        for challenge_id in compared:
+            standings = {
+                riot_id: format_challenge(entries[challenge_id], config, language)
+                for riot_id, entries in progress.items()
+                if challenge_id in entries
+            }
+            leader = min(
+                standings,
+                key=lambda riot_id: (
+                    progress[riot_id][challenge_id].get("percentile", 1.0),
+                    -progress[riot_id][challenge_id].get("value", 0),
+                ),
+                default=None,
+            )
+            comparison.append({
+                "challengeId": challenge_id,
+                "name": config.name(challenge_id, language)[0],
+                "leader": leader,
+                "players": [
+                    {"riotId": riot_id, **{key: standings[riot_id][key] for key in ("level", "value", "topPercent")}}
+                    if riot_id in standings
+                    else {"riotId": riot_id, "level": "NONE", "value": 0, "topPercent": None}
+                    for riot_id in progress
+                ],
+            })
+
+    return {"platform": platform, "players": players, "comparison": comparison}
+
+
 @mcp.tool()
 async def lol_get_league_entries(
     tier: Literal["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER"],
@@ -554,7 +3092,7 @@ async def lol_get_league_entries(
 
     Returns players at a specific tier/rank. Pagination through pages.
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
+    platform_routing = resolve_route(platform)
     
     if tier in ["MASTER", "GRANDMASTER", "CHALLENGER"]:
         # These tiers don't have divisions
@@ -607,8 +3145,13 @@ async def lol_get_server_status(platform: str = "na") -> dict[str, Any]:
 
     Returns platform status, incidents, and maintenance schedules.
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    status = await riot_request(f"/lol/status/v4/platform-data", platform_routing=platform_routing)
+    platform_routing = resolve_route(platform)
+    status = await riot_request(
+        "/lol/status/v4/platform-data",
+        platform_routing=platform_routing,
+        cache_ttl=STATUS_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
 
     if not status:
         return {"error": "Could not retrieve server status"}
@@ -617,6 +3160,7 @@ async def lol_get_server_status(platform: str = "na") -> dict[str, Any]:
         "platform": platform,
         "platformId": status.get("id"),
         "platformName": status.get("name"),
+        "freshness": cache_freshness(),
         "maintenances": [
             {
                 "id": m.get("id"),
@@ -653,7 +3197,7 @@ async def lol_get_all_champions(language: str = "en_US") -> dict[str, Any]:
     """
     try:
         champ_map = await get_champion_map(language)
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=cassette_transport()) as client:
             version_res = await client.get("https://ddragon.leagueoflegends.com/api/versions.json")
             version = version_res.json()[0]
             champ_full_res = await client.get(
@@ -687,7 +3231,7 @@ async def lol_get_clash_tournaments(platform: str = "na") -> dict[str, Any]:
 
     Returns ongoing and upcoming Clash tournaments.
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
+    platform_routing = resolve_route(platform)
     tournaments = await riot_request(f"/lol/clash/v1/tournaments", platform_routing=platform_routing)
 
     if tournaments is None:
@@ -715,46 +3259,711 @@ async def lol_get_clash_tournaments(platform: str = "na") -> dict[str, Any]:
     }
 
 
+# ============================================================================
+# LEAGUE OF LEGENDS - CLASH SCOUTING
+# ============================================================================
+
+
+def format_rank(entry: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Shape a league-v4 entry for tool output"""
+    if not entry:
+        return None
+    wins, losses = entry.get("wins", 0), entry.get("losses", 0)
+    return {
+        "tier": entry.get("tier"),
+        "rank": entry.get("rank"),
+        "lp": entry.get("leaguePoints"),
+        "wins": wins,
+        "losses": losses,
+        "winRate": round(wins / (wins + losses) * 100) if wins + losses else None,
+    }
+
+
+def summarize_champion_pool(puuid: str, matches: list[dict[str, Any]], top: int = 10) -> dict[str, Any]:
+    """Compute a player's champion pool and role tendencies from a set of LoL matches"""
+    champions: dict[str, dict[str, int]] = {}
+    positions: dict[str, int] = {}
+    games = 0
+    for match in matches:
+        participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
+        if not participant:
+            continue
+        games += 1
+        stats = champions.setdefault(
+            participant["championName"], {"games": 0, "wins": 0, "kills": 0, "deaths": 0, "assists": 0}
+        )
+        stats["games"] += 1
+        stats["wins"] += 1 if participant["win"] else 0
+        stats["kills"] += participant["kills"]
+        stats["deaths"] += participant["deaths"]
+        stats["assists"] += participant["assists"]
+        position = participant.get("teamPosition") or "UNKNOWN"
+        positions[position] = positions.get(position, 0) + 1
+
+    pool = sorted(champions.items(), key=lambda c: (c[1]["games"], c[1]["wins"]), reverse=True)[:top]
+    return {
+        "gamesAnalyzed": games,
+        "championPool": [
+            {
+                "champion": name,
+                "games": stats["games"],
+                "winRate": round(stats["wins"] / stats["games"] * 100),
+                "kda": round((stats["kills"] + stats["assists"]) / max(stats["deaths"], 1), 2),
+            }
+            for name, stats in pool
+        ],
+        "roleTendencies": {
+            position: round(count / games * 100)
+            for position, count in sorted(positions.items(), key=lambda p: p[1], reverse=True)
+        },
+    }
+
+
+@mcp.tool()
+async def lol_scout_clash_team(
+    team_id: str | None = None,
+    riot_ids: list[str] | None = None,
+    platform: str = "na",
+    match_count: int = 20,
+    language: str = "en_US",
+    ctx: Context = None,
+) -> dict[str, Any]:
+    """
+    🛡️ Scout a League of Legends Clash team.
+
+    Takes a Clash team id or a list of Riot IDs ("gameName#tagLine"). Fetches every player's
+    rank, full mastery and recent matches concurrently; matches shared by teammates are
+    fetched once. Returns per-player champion pools and role tendencies.
+    """
+    platform_routing = resolve_route(platform)
+    regional_routing = resolve_route(platform, "match")
+
+    roster: list[dict[str, Any]] = []
+    if team_id:
+        team = await riot_request(f"/lol/clash/v1/teams/{team_id}", platform_routing=platform_routing)
+        if not team:
+            return {"error": f"Clash team '{team_id}' not found"}
+        roster = [
+            {"puuid": p.get("puuid"), "clashPosition": p.get("position"), "clashRole": p.get("role")}
+            for p in team.get("players", [])
+            if p.get("puuid")
+        ]
+    elif riot_ids:
+        parsed = [split_riot_id(riot_id) for riot_id in riot_ids]
+        invalid = [riot_id for riot_id, parts in zip(riot_ids, parsed) if parts is None]
+        if invalid:
+            return {"error": f"Invalid Riot IDs (expected gameName#tagLine): {invalid}"}
+        puuids = await fan_out(parsed, lambda parts: get_puuid(*parts, platform), ctx=ctx, label="players")
+        missing = [riot_id for riot_id, puuid in zip(riot_ids, puuids) if not puuid]
+        if missing:
+            return {"error": f"Failed to find players: {missing}"}
+        roster = [{"puuid": puuid} for puuid in puuids]
+    else:
+        return {"error": "Provide a Clash team_id or a list of riot_ids"}
+
+    champ_map = await get_champion_map(language)
+
+    async def scout_player(player: dict[str, Any]) -> dict[str, Any]:
+        puuid = player["puuid"]
+        lookups = [
+            get_account_by_puuid(puuid, platform),
+            get_rank_by_puuid(puuid, platform),
+            get_mastery_snapshot(puuid, platform),
+            get_match_ids(puuid, regional_routing=regional_routing, game="lol", count=match_count),
+        ]
+        if "clashPosition" not in player:
+            lookups.append(
+                riot_request(f"/lol/clash/v1/players/by-puuid/{puuid}", platform_routing=platform_routing)
+            )
+        account, rank_data, snapshot, match_ids, *clash = await asyncio.gather(*lookups)
+        clash_entries = clash[0] if clash else None
+        if clash_entries:
+            player.setdefault("clashPosition", clash_entries[0].get("position"))
+            player.setdefault("clashRole", clash_entries[0].get("role"))
+            player.setdefault("teamId", clash_entries[0].get("teamId"))
+        solo = next((e for e in rank_data or [] if e.get("queueType") == "RANKED_SOLO_5x5"), None)
+        masteries = sorted(
+            (snapshot or {}).get("masteries", {}).values(), key=lambda c: c.get("championPoints", 0), reverse=True
+        )
+        return {
+            **player,
+            "riotId": f"{account['gameName']}#{account['tagLine']}" if account else None,
+            "soloRank": format_rank(solo),
+            "topMastery": [
+                {
+                    "champion": champ_map.get(c["championId"], f"ID({c['championId']})"),
+                    "level": c.get("championLevel"),
+                    "points": c.get("championPoints"),
+                }
+                for c in masteries[:5]
+            ],
+            "matchIds": match_ids or [],
+        }
+
+    players = await fan_out(roster, scout_player, ctx=ctx, label="players")
+
+    # Teammates who queued together share match ids; fetch each match once
+    unique_ids = list(dict.fromkeys(match_id for p in players for match_id in p["matchIds"]))
+    fetched = await fan_out(
+        unique_ids, lambda match_id: get_match(match_id, regional_routing=regional_routing), ctx=ctx, label="matches"
+    )
+    matches = {match_id: match for match_id, match in zip(unique_ids, fetched) if match}
+
+    team_puuids = {p["puuid"] for p in players}
+    shared_matches = sum(
+        1
+        for match in matches.values()
+        if sum(1 for p in match["info"]["participants"] if p["puuid"] in team_puuids) > 1
+    )
+
+    return {
+        "teamId": team_id or next((p.get("teamId") for p in players if p.get("teamId")), None),
+        "platform": platform,
+        "matchesFetched": len(matches),
+        "matchesPlayedTogether": shared_matches,
+        "players": [
+            {
+                **{k: v for k, v in p.items() if k != "matchIds"},
+                **summarize_champion_pool(p["puuid"], [matches[m] for m in p["matchIds"] if m in matches]),
+            }
+            for p in players
+        ],
+        "freshness": cache_freshness(),
+    }
+
+
+# ============================================================================
+# LEAGUE OF LEGENDS - CHAMPION LEADERBOARDS
+# ============================================================================
+
+
+class ChampionLeaderboard:
+    """
+    Rolling per-(champion, queue, player) stats for a tracked player pool.
+
+    Games are bucketed by day; running totals are updated as matches are ingested and
+    expired days are subtracted again, so the window slides without a rebuild. Rankings
+    are kept per (champion, queue) and only recomputed after that champion's totals change.
+    """
+
+    def __init__(self, window_days: int = LEADERBOARD_WINDOW_DAYS, top_k: int = LEADERBOARD_TOP_K):
+        self.window = window_days * 86400
+        self.top_k = top_k
+        # puuid -> Riot ID, filled in from match payloads for ladder players
+        self.tracked: dict[str, str | None] = {}
+        # day -> (match id, puuid, champion id, queue id, win, kills, deaths, assists)
+        self.days: dict[int, list[tuple[str, str, int, int, bool, int, int, int]]] = {}
+        self.counted: set[tuple[str, str]] = set()
+        # (champion id, queue id) -> puuid -> [games, wins, kills, deaths, assists]
+        self.totals: dict[tuple[int, int], dict[str, list[int]]] = {}
+        # (champion id, queue id) -> (metric, min games) -> best players
+        self.rankings: dict[tuple[int, int], dict[tuple[str, int], list[tuple[str, list[int]]]]] = {}
+
+    def track(self, puuids: list[str]) -> None:
+        for puuid in puuids:
+            self.tracked.setdefault(puuid, None)
+
+    def ingest(self, match: dict[str, Any]) -> int:
+        """Count a match for every tracked participant; returns the number of new player games"""
+        info = match.get("info", {})
+        match_id = match.get("metadata", {}).get("matchId")
+        ended_ms = info.get("gameEndTimestamp") or info.get("gameCreation", 0) + info.get("gameDuration", 0) * 1000
+        ended = ended_ms / 1000
+        if not match_id or ended <= time.time() - self.window:
+            return 0
+        day = int(ended // 86400)
+        added = 0
+        for p in info.get("participants", []):
+            puuid = p.get("puuid")
+            if puuid not in self.tracked or (match_id, puuid) in self.counted:
+                continue
+            if p.get("riotIdGameName"):
+                self.tracked[puuid] = f"{p['riotIdGameName']}#{p.get('riotIdTagline', '')}"
+            outcome = (p["win"], p["kills"], p["deaths"], p["assists"])
+            row = (match_id, puuid, p["championId"], info.get("queueId", 0), *outcome)
+            self.days.setdefault(day, []).append(row)
+            self.counted.add((match_id, puuid))
+            self._apply(row, 1)
+            added += 1
+        return added
+
+    def _apply(self, row: tuple[str, str, int, int, bool, int, int, int], sign: int) -> None:
+        _, puuid, champion_id, queue_id, win, kills, deaths, assists = row
+        for queue in (queue_id, ALL_QUEUES):
+            players = self.totals.setdefault((champion_id, queue), {})
+            stats = players.setdefault(puuid, [0, 0, 0, 0, 0])
+            for i, value in enumerate((1, int(win), kills, deaths, assists)):
+                stats[i] += sign * value
+            if stats[0] == 0:
+                del players[puuid]
+                if not players:
+                    del self.totals[(champion_id, queue)]
+            self.rankings.pop((champion_id, queue), None)
+
+    def expire(self) -> int:
+        """Drop days that slid out of the window; returns the number of player games removed"""
+        oldest = int((time.time() - self.window) // 86400)
+        removed = 0
+        for day in [day for day in self.days if day < oldest]:
+            for row in self.days.pop(day):
+                self.counted.discard((row[0], row[1]))
+                self._apply(row, -1)
+                removed += 1
+        return removed
+
+    def top(self, champion_id: int, queue: int, metric: str, min_games: int) -> list[tuple[str, list[int]]]:
+        """Best players on a champion by "winRate", "kda" or "games", at most top_k"""
+        rankings = self.rankings.setdefault((champion_id, queue), {})
+        if (metric, min_games) not in rankings:
+            totals = self.totals.get((champion_id, queue), {})
+            players = [(puuid, stats) for puuid, stats in totals.items() if stats[0] >= min_games]
+            score = {
+                "winRate": lambda e: (e[1][1] / e[1][0], e[1][0]),
+                "kda": lambda e: ((e[1][2] + e[1][4]) / max(e[1][3], 1), e[1][0]),
+                "games": lambda e: (e[1][0], e[1][1] / e[1][0]),
+            }[metric]
+            rankings[(metric, min_games)] = heapq.nlargest(self.top_k, players, key=score)
+        return rankings[(metric, min_games)]
+
+
+LEADERBOARD = ChampionLeaderboard()
+
+
+def ingest_leaderboard(match: dict[str, Any]) -> None:
+    if LEADERBOARD.tracked:
+        LEADERBOARD.ingest(match)
+
+
+MATCH_INGESTORS["lol"].append(ingest_leaderboard)
+
+
+@mcp.tool(lane="bulk", bounded=False)
+async def lol_track_players(
+    riot_ids: list[str] | None = None,
+    ladder_tier: Literal["CHALLENGER", "GRANDMASTER", "MASTER"] | None = None,
+    ladder_players: int = 50,
+    platform: str = "na",
+    matches_per_player: int = 20,
+    ctx: Context = None,
+) -> dict[str, Any]:
+    """
+    🏆 Add players to the champion leaderboard pool and ingest their recent matches.
+
+    Players come from a Riot ID list and/or an apex ladder snapshot. Every LoL match the
+    server fetches afterwards also counts for tracked players, so later calls only need to
+    fetch new games.
+    """
+    regional_routing = resolve_route(platform, "match")
+    puuids = await get_player_pool(riot_ids, ladder_tier, ladder_players, platform, "lol", ctx)
+    if isinstance(puuids, dict):
+        return puuids
+    LEADERBOARD.track(puuids)
+
+    id_lists = await fan_out(
+        puuids,
+        lambda puuid: get_match_ids(puuid, regional_routing=regional_routing, count=matches_per_player),
+        ctx=ctx,
+        label="match id lists",
+    )
+    match_ids = list(dict.fromkeys(match_id for ids in id_lists if ids for match_id in ids))
+    matches = await fan_out(
+        match_ids,
+        lambda match_id: get_match(match_id, regional_routing=regional_routing),
+        ctx=ctx,
+        label="matches",
+    )
+
+    return {
+        "playersAdded": len(puuids),
+        "trackedPlayers": len(LEADERBOARD.tracked),
+        "matchesFetched": sum(1 for match in matches if match),
+        "gamesInWindow": len(LEADERBOARD.counted),
+        "windowDays": LEADERBOARD_WINDOW_DAYS,
+    }
+
+
+@mcp.tool()
+async def lol_get_champion_leaderboard(
+    champion_name: str,
+    queue_id: int | None = 420,
+    metric: Literal["winRate", "kda", "games"] = "winRate",
+    min_games: int = 5,
+    top: int = 10,
+    language: str = "en_US",
+) -> dict[str, Any]:
+    """
+    🏆 Rank tracked players on a champion by win rate, KDA or games over the last 30 days.
+
+    Reads the rolling stats built by lol_track_players (queue_id 420 is ranked solo,
+    None counts every queue). Players need at least `min_games` games on the champion.
+    """
+    if not LEADERBOARD.tracked:
+        return {"error": "No players tracked yet; run lol_track_players first"}
+    match = (await get_champion_index(language)).lookup(champion_name)
+    champion_id = match.key
+    if champion_id is None:
+        return unknown_champion(champion_name, match)
+    champ_map = await get_champion_map(language)
+
+    LEADERBOARD.expire()
+    queue = ALL_QUEUES if queue_id is None else queue_id
+    ranking = LEADERBOARD.top(champion_id, queue, metric, max(min_games, 1))
+    return {
+        "champion": champ_map.get(champion_id, str(champion_id)),
+        **({"matchedFrom": champion_name} if match.kind == "fuzzy" else {}),
+        "queueId": queue_id,
+        "metric": metric,
+        "windowDays": LEADERBOARD_WINDOW_DAYS,
+        "trackedPlayers": len(LEADERBOARD.tracked),
+        "playersOnChampion": len(LEADERBOARD.totals.get((champion_id, queue), {})),
+        "leaderboard": [
+            {
+                "rank": rank,
+                "riotId": LEADERBOARD.tracked.get(puuid),
+                "puuid": puuid,
+                "games": games,
+                "winRate": round(wins / games * 100, 1),
+                "kda": round((kills + assists) / max(deaths, 1), 2),
+                "avgKills": round(kills / games, 1),
+                "avgDeaths": round(deaths / games, 1),
+                "avgAssists": round(assists / games, 1),
+            }
+            for rank, (puuid, (games, wins, kills, deaths, assists)) in enumerate(ranking[:top], start=1)
+        ],
+    }
+
+
+# ============================================================================
+# LEAGUE OF LEGENDS - BUILD AGGREGATION
+# ============================================================================
+
+
+class LolBuildIndex:
+    """
+    Integer-coded loadouts of recently stored LoL match participants, per champion.
+
+    Item sets, rune pages and summoner spell pairs are interned once at ingest, so build
+    queries count codes in compact arrays instead of re-parsing match JSON. Past
+    `max_matches` the oldest ingested matches are dropped and the codes re-interned.
+    """
+
+    def __init__(self, max_matches: int = LOL_BUILDS_MAX_MATCHES) -> None:
+        self.max_matches = max_matches
+        # match id -> ingest sequence number, oldest first
+        self.match_ids: dict[str, int] = {}
+        self.sequence = 0
+        self.vocab: dict[str, dict[tuple[int, ...], int]] = {"items": {}, "runes": {}, "spells": {}}
+        # champion id -> column -> values, one row per participant, in ingest order
+        self.champions: dict[int, dict[str, array]] = {}
+
+    def _code(self, kind: str, value: tuple[int, ...]) -> int:
+        codes = self.vocab[kind]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def ingest(self, match_id: str, queue_id: int, participants: list[dict[str, Any]]) -> bool:
+        """Append one match's loadouts; returns False if the match was already ingested"""
+        if match_id in self.match_ids:
+            return False
+        self.match_ids[match_id] = self.sequence
+        for p in participants:
+            columns = self.champions.setdefault(
+                p["championId"],
+                {
+                    "items": array("I"),
+                    "runes": array("I"),
+                    "spells": array("I"),
+                    "queue": array("H"),
+                    "position": array("B"),
+                    "win": array("B"),
+                    "match": array("I"),
+                },
+            )
+            # Rune page: primary style, its four runes, secondary style, its two runes
+            page = tuple(
+                value
+                for style in p.get("perks", {}).get("styles", [])
+                for value in [style.get("style", 0)] + [selection["perk"] for selection in style["selections"]]
+            )
+            items = tuple(sorted(p[f"item{i}"] for i in range(6) if p.get(f"item{i}")))
+            spells = tuple(sorted((p.get("summoner1Id", 0), p.get("summoner2Id", 0))))
+            columns["items"].append(self._code("items", items))
+            columns["runes"].append(self._code("runes", page))
+            columns["spells"].append(self._code("spells", spells))
+            columns["queue"].append(queue_id)
+            position = p.get("teamPosition") or ""
+            columns["position"].append(LOL_POSITIONS.index(position) if position in LOL_POSITIONS else 0)
+            columns["win"].append(1 if p.get("win") else 0)
+            columns["match"].append(self.sequence)
+        self.sequence += 1
+        if len(self.match_ids) > self.max_matches:
+            self.trim(int(self.max_matches * (1 - INDEX_TRIM_FRACTION)))
+        return True
+
+    def trim(self, keep: int) -> None:
+        """Drop the oldest ingested matches until `keep` remain"""
+        for match_id in list(self.match_ids)[: max(len(self.match_ids) - keep, 0)]:
+            del self.match_ids[match_id]
+        oldest = next(iter(self.match_ids.values()), self.sequence)
+        for champion_id, columns in list(self.champions.items()):
+            cut = bisect.bisect_left(columns["match"], oldest)
+            for column in columns.values():
+                del column[:cut]
+            if not columns["match"]:
+                del self.champions[champion_id]
+        for kind in self.vocab:
+            self.vocab[kind] = compact_vocab(self.vocab[kind], [columns[kind] for columns in self.champions.values()])
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "matches": len(self.match_ids),
+            "maxMatches": self.max_matches,
+            "rows": sum(len(columns["match"]) for columns in self.champions.values()),
+            "bytes": sum(array_bytes(columns.values()) for columns in self.champions.values())
+            + sum(approximate_size(list(codes)) for codes in self.vocab.values())
+            + approximate_size(list(self.match_ids)),
+        }
+
+    def count(
+        self, champion_id: int, queue_id: int | None = None, position: str | None = None
+    ) -> dict[str, dict[tuple[int, ...], tuple[int, int]]]:
+        """Games and wins per item set, rune page and spell pair for a champion's matching rows"""
+        columns = self.champions.get(champion_id)
+        if not columns:
+            return {}
+        position_code = LOL_POSITIONS.index(position) if position in LOL_POSITIONS else None
+        rows = [
+            row
+            for row in range(len(columns["win"]))
+            if (queue_id is None or columns["queue"][row] == queue_id)
+            and (position_code is None or columns["position"][row] == position_code)
+        ]
+        win = columns["win"]
+        counts = {}
+        for kind, codes in self.vocab.items():
+            values = list(codes)
+            column = columns[kind]
+            games = Counter(column[row] for row in rows)
+            wins = Counter(column[row] for row in rows if win[row])
+            counts[kind] = {values[code]: (n, wins[code]) for code, n in games.items()}
+        counts["total"] = {(): (len(rows), sum(win[row] for row in rows))}
+        return counts
+
+
+LOL_BUILDS = LolBuildIndex()
+
+
+def ingest_lol_builds(match: dict[str, Any]) -> None:
+    info = match.get("info", {})
+    LOL_BUILDS.ingest(match["metadata"]["matchId"], info.get("queueId", 0), info.get("participants", []))
+
+
+MATCH_INGESTORS["lol"].append(ingest_lol_builds)
+
+
+def rank_builds(counts: dict[Any, Any], top: int) -> list[tuple[Any, int, int]]:
+    """Most played values of a {value: (games, wins)} table, as (value, games, wins)"""
+    ranked = sorted(((value, games, wins) for value, (games, wins) in counts.items()), key=lambda b: (-b[1], -b[2]))
+    return ranked[:top]
+
+
+@mcp.tool()
+async def lol_get_champion_builds(
+    champion_name: str,
+    queue_id: int | None = None,
+    position: Literal["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"] | None = None,
+    top: int = 5,
+    language: str = "en_US",
+) -> dict[str, Any]:
+    """
+    🛠️ Get the most common builds for a champion across the LoL matches the server has stored.
+
+    Returns the most played completed-item sets, individual completed items, rune pages and
+    summoner spell pairs with games and win rate, optionally for one queue and position.
+    Matches come from any LoL tool that fetched them (e.g. lol_track_players).
+    """
+    match = (await get_champion_index(language)).lookup(champion_name)
+    champion_id = match.key
+    if champion_id is None:
+        return unknown_champion(champion_name, match)
+    champ_map, static = await asyncio.gather(get_champion_map(language), get_static_data(language))
+    champion = champ_map.get(champion_id, str(champion_id))
+
+    counts = LOL_BUILDS.count(champion_id, queue_id, position)
+    games, wins = counts.get("total", {}).get((), (0, 0))
+    if not games:
+        return {"error": f"No stored matches with {champion}; fetch some first (e.g. with lol_track_players)"}
+
+    # Merge item sets down to their completed items, and count those items on their own
+    builds: dict[tuple[int, ...], list[int]] = {}
+    items: dict[int, list[int]] = {}
+    for item_set, (n, w) in counts["items"].items():
+        completed = tuple(item for item in item_set if item in static.completed_items)
+        for totals in [builds.setdefault(completed, [0, 0])] + [items.setdefault(item, [0, 0]) for item in completed]:
+            totals[0] += n
+            totals[1] += w
+
+    def stats(n: int, w: int) -> dict[str, Any]:
+        return {"games": n, "pickRate": round(n / games * 100, 1), "winRate": round(w / n * 100, 1)}
+
+    return {
+        "champion": champion,
+        **({"matchedFrom": champion_name} if match.kind == "fuzzy" else {}),
+        "queueId": queue_id,
+        "position": position,
+        "games": games,
+        "winRate": round(wins / games * 100, 1),
+        "patch": static.version or None,
+        "builds": [
+            {"items": [static.item(item) for item in build], **stats(n, w)}
+            for build, n, w in rank_builds({build: totals for build, totals in builds.items() if build}, top)
+        ],
+        "items": [{"item": static.item(item), **stats(n, w)} for item, n, w in rank_builds(items, top * 2)],
+        "runePages": [
+            {
+                "keystone": static.rune(page[1]) if len(page) > 1 else None,
+                "runes": [static.rune(rune) for rune in page],
+                **stats(n, w),
+            }
+            for page, n, w in rank_builds(counts["runes"], top)
+            if page
+        ],
+        "summonerSpells": [
+            {"spells": [static.spell(spell) for spell in pair], **stats(n, w)}
+            for pair, n, w in rank_builds(counts["spells"], top)
+        ],
+    }
+
+
 # ============================================================================
 # LEAGUE OF LEGENDS - SPECTATOR TOOLS
 # ============================================================================
 
 
+async def get_active_game(puuid: str, platform: str = "na") -> dict[str, Any] | None:
+    """Get the player's live game from spectator-v5, or None when not in game"""
+    platform_routing = resolve_route(platform)
+    return await riot_request(
+        f"/lol/spectator/v5/active-games/by-summoner/{puuid}",
+        platform_routing=platform_routing,
+        cache_ttl=SPECTATOR_CACHE_TTL,
+    )
+
+
 @mcp.tool()
-async def lol_get_spectator(summoner_name: str, platform: str = "na") -> dict[str, Any]:
+async def lol_get_spectator(
+    game_name: str, tag_line: str, platform: str = "na", language: str = "en_US"
+) -> dict[str, Any]:
     """
     👁️ Get live League of Legends game data for a player.
 
     Returns current game info if player is in a match (champions, teams, etc).
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    
-    # Note: Spectator requires summoner ID, not PUUID
-    spectator = await riot_request(
-        f"/lol/spectator/v5/active-games/by-summoner/{summoner_name}",
-        platform_routing=platform_routing,
-    )
+    puuid = await get_puuid(game_name, tag_line, platform)
+    if not puuid:
+        return {"error": "Failed to find player"}
 
+    spectator = await get_active_game(puuid, platform)
     if not spectator:
-        return {"error": f"No active game found for {summoner_name}"}
+        return {"error": f"No active game found for {game_name}#{tag_line}"}
 
+    champ_map = await get_champion_map(language)
     return {
-        "gameName": summoner_name,
+        "gameName": game_name,
+        "tagLine": tag_line,
         "platform": platform,
         "gameType": spectator.get("gameType"),
         "gameQueueConfigId": spectator.get("gameQueueConfigId"),
         "gameStartTime": spectator.get("gameStartTime"),
         "participants": [
             {
+                "riotId": p.get("riotId"),
                 "championId": p.get("championId"),
+                "championName": champ_map.get(p.get("championId"), f"ID({p.get('championId')})"),
                 "teamId": p.get("teamId"),
-                "summonerName": p.get("summonerName"),
             }
             for p in spectator.get("participants", [])
         ],
     }
 
 
+@mcp.tool()
+async def lol_get_live_game(
+    game_name: str, tag_line: str, platform: str = "na", language: str = "en_US", ctx: Context = None
+) -> dict[str, Any]:
+    """
+    📺 Get a player's live League of Legends game with every participant enriched.
+
+    Returns each participant's champion, solo/flex rank and mastery on the champion they are
+    playing, plus bans. All participants are looked up at once, reusing cached rank and
+    mastery data, so the call takes about one upstream round trip.
+    """
+    puuid = await get_puuid(game_name, tag_line, platform)
+    if not puuid:
+        return {"error": "Failed to find player"}
+
+    spectator, champ_map = await asyncio.gather(get_active_game(puuid, platform), get_champion_map(language))
+    if not spectator:
+        return {"error": f"No active game found for {game_name}#{tag_line}"}
+
+    def champion_name(champion_id: int) -> str:
+        return champ_map.get(champion_id, f"ID({champion_id})")
+
+    async def enrich(participant: dict[str, Any]) -> dict[str, Any]:
+        player_puuid = participant.get("puuid")
+        champion_id = participant.get("championId")
+        rank_data, mastery = None, None
+        if player_puuid and not participant.get("bot"):
+            rank_data, mastery = await asyncio.gather(
+                get_rank_by_puuid(player_puuid, platform),
+                get_champion_mastery_entry(player_puuid, champion_id, platform),
+            )
+        queues = {e.get("queueType"): e for e in rank_data or []}
+        return {
+            "riotId": participant.get("riotId"),
+            "puuid": player_puuid,
+            "teamId": participant.get("teamId"),
+            "championId": champion_id,
+            "championName": champion_name(champion_id),
+            "summonerSpells": [participant.get("spell1Id"), participant.get("spell2Id")],
+            "soloRank": format_rank(queues.get("RANKED_SOLO_5x5")),
+            "flexRank": format_rank(queues.get("RANKED_FLEX_SR")),
+            "championMastery": {
+                "level": mastery.get("championLevel"),
+                "points": mastery.get("championPoints"),
+                "lastPlayTime": datetime.fromtimestamp(mastery["lastPlayTime"] / 1000).isoformat()
+                if mastery.get("lastPlayTime")
+                else None,
+            }
+            if mastery
+            else None,
+        }
+
+    participants = spectator.get("participants", [])
+    enriched = await fan_out(participants, enrich, ctx=ctx, label="participants", concurrency=max(len(participants), 1))
+
+    return {
+        "gameId": spectator.get("gameId"),
+        "platform": platform,
+        "gameMode": spectator.get("gameMode"),
+        "gameQueueConfigId": spectator.get("gameQueueConfigId"),
+        "gameStartTime": spectator.get("gameStartTime"),
+        "gameLength": spectator.get("gameLength"),
+        "participants": enriched,
+        "bans": [
+            {
+                "teamId": b.get("teamId"),
+                "championId": b.get("championId"),
+                "championName": champion_name(b.get("championId")),
+            }
+            for b in spectator.get("bannedChampions", [])
+            if b.get("championId", -1) > 0
+        ],
+        "freshness": cache_freshness(),
+    }
+
+
 # ============================================================================
 # TEAM FIGHT TACTICS (TFT) TOOLS
 # ============================================================================
@@ -762,23 +3971,30 @@ async def lol_get_spectator(summoner_name: str, platform: str = "na") -> dict[st
 
 async def get_tft_summoner(puuid: str, platform: str = "na") -> dict[str, Any] | None:
     """Get TFT summoner info by PUUID"""
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    return await riot_request(f"/tft/summoner/v1/summoners/by-puuid/{puuid}", platform_routing=platform_routing)
+    platform_routing = resolve_route(platform)
+    return await riot_request(
+        f"/tft/summoner/v1/summoners/by-puuid/{puuid}",
+        platform_routing=platform_routing,
+        cache_ttl=SUMMONER_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
 
 
 @mcp.tool()
-async def tft_get_player_summary(game_name: str, tag_line: str, platform: str = "na") -> dict[str, Any]:
+async def tft_get_player_summary(
+    game_name: str, tag_line: str, platform: str = "na", ctx: Context = None
+) -> dict[str, Any]:
     """
     🎲 Get Team Fight Tactics player profile summary.
 
     Returns TFT rank, LP, recent matches, and key stats.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
+    platform_routing = resolve_route(platform)
+    regional_routing = resolve_route(platform, "match")
 
     # Get TFT summoner info
     summoner = await get_tft_summoner(puuid, platform)
@@ -787,7 +4003,10 @@ async def tft_get_player_summary(game_name: str, tag_line: str, platform: str =
 
     # Get TFT rank
     rank_data = await riot_request(
-        f"/tft/league/v1/entries/by-puuid/{puuid}", platform_routing=platform_routing
+        f"/tft/league/v1/entries/by-puuid/{puuid}",
+        platform_routing=platform_routing,
+        cache_ttl=RANK_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
     )
 
     rank_info = None
@@ -797,27 +4016,31 @@ async def tft_get_player_summary(game_name: str, tag_line: str, platform: str =
         elif isinstance(rank_data, dict):
             rank_info = rank_data
 
-    # Get recent TFT matches
-    match_ids = await riot_regional_request(
-        f"/tft/match/v1/matches/by-puuid/{puuid}/ids", regional_routing=regional_routing, params={"count": 10}
-    )
+    def summarize(match_id: str, match: dict[str, Any]) -> dict[str, Any] | None:
+        participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
+        if not participant:
+            return None
+        return {
+            "matchId": match_id,
+            "placement": participant.get("placement"),
+            "level": participant.get("level"),
+            "goldLeft": participant.get("gold_left"),
+            "totalDamageToPlayers": participant.get("total_damage_to_players"),
+        }
 
+    # Recent matches are optional: once the deadline budget runs out, return what was fetched
     recent_matches = []
-    if match_ids:
-        for match_id in match_ids[:5]:
-            match = await riot_regional_request(f"/tft/match/v1/matches/{match_id}", regional_routing=regional_routing)
-            if match:
-                participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
-                if participant:
-                    recent_matches.append(
-                        {
-                            "matchId": match_id,
-                            "placement": participant.get("placement"),
-                            "level": participant.get("level"),
-                            "goldLeft": participant.get("gold_left"),
-                            "totalDamageToPlayers": participant.get("total_damage_to_players"),
-                        }
-                    )
+    with optional_budget():
+        try:
+            match_ids = await get_match_ids(puuid, regional_routing=regional_routing, game="tft", count=10)
+            if match_ids:
+                recent_matches = await fetch_matches(
+                    match_ids[:5], summarize, regional_routing=regional_routing, game="tft", ctx=ctx, partial=True
+                )
+                prefetch_matches(match_ids[5:], regional_routing=regional_routing, game="tft")
+        except DeadlineExceeded:
+            pass
+        partial = budget_exhausted()
 
     return {
         "gameName": game_name,
@@ -839,52 +4062,53 @@ async def tft_get_player_summary(game_name: str, tag_line: str, platform: str =
         if rank_info
         else None,
         "recentMatches": recent_matches,
+        "partial": partial,
+        "freshness": cache_freshness(),
     }
 
 
 @mcp.tool()
-async def tft_get_recent_matches(game_name: str, tag_line: str, platform: str = "na", count: int = 10) -> dict[str, Any]:
+async def tft_get_recent_matches(
+    game_name: str, tag_line: str, platform: str = "na", count: int = 10, ctx: Context = None
+) -> dict[str, Any]:
     """
     🎲 Get recent Team Fight Tactics matches.
 
     Returns placement, composition, and performance data for recent matches.
+    Matches are fetched concurrently; progress and each finished row are streamed to the client.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
-    match_ids = await riot_regional_request(
-        f"/tft/match/v1/matches/by-puuid/{puuid}/ids", regional_routing=regional_routing, params={"count": count}
-    )
+    regional_routing = resolve_route(platform, "match")
+    match_ids = await get_match_ids(puuid, regional_routing=regional_routing, game="tft", count=count)
 
     if not match_ids:
         return {"gameName": game_name, "tagLine": tag_line, "puuid": puuid, "matches": []}
 
-    matches = []
-    for match_id in match_ids:
-        match = await riot_regional_request(f"/tft/match/v1/matches/{match_id}", regional_routing=regional_routing)
-        if match:
-            participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
-            if participant:
-                matches.append(
-                    {
-                        "matchId": match_id,
-                        "placement": participant.get("placement"),
-                        "level": participant.get("level"),
-                        "goldLeft": participant.get("gold_left"),
-                        "totalDamageToPlayers": participant.get("total_damage_to_players"),
-                        "traits": participant.get("traits", []),
-                        "units": [
-                            {
-                                "characterId": u.get("character_id"),
-                                "tier": u.get("tier"),
-                                "itemNames": u.get("itemNames", []),
-                            }
-                            for u in participant.get("units", [])
-                        ],
-                    }
-                )
+    def summarize(match_id: str, match: dict[str, Any]) -> dict[str, Any] | None:
+        participant = next((p for p in match["info"]["participants"] if p["puuid"] == puuid), None)
+        if not participant:
+            return None
+        return {
+            "matchId": match_id,
+            "placement": participant.get("placement"),
+            "level": participant.get("level"),
+            "goldLeft": participant.get("gold_left"),
+            "totalDamageToPlayers": participant.get("total_damage_to_players"),
+            "traits": participant.get("traits", []),
+            "units": [
+                {
+                    "characterId": u.get("character_id"),
+                    "tier": u.get("tier"),
+                    "itemNames": u.get("itemNames", []),
+                }
+                for u in participant.get("units", [])
+            ],
+        }
+
+    matches = await fetch_matches(match_ids, summarize, regional_routing=regional_routing, game="tft", ctx=ctx)
 
     return {
         "gameName": game_name,
@@ -894,6 +4118,265 @@ async def tft_get_recent_matches(game_name: str, tag_line: str, platform: str =
     }
 
 
+# ============================================================================
+# TEAM FIGHT TACTICS (TFT) - META AGGREGATION
+# ============================================================================
+
+
+class TftMetaEngine:
+    """
+    Columnar store of ranked TFT boards for one set, for placement-by-feature queries.
+
+    Each participant is one row; units, traits and carry items are flattened into
+    integer-coded arrays pointing back at their row, so group-bys are single passes
+    over compact arrays instead of walks over match JSON. Past `max_matches` the oldest
+    ingested matches are dropped, rows renumbered and the codes re-interned.
+    """
+
+    def __init__(self, max_matches: int = TFT_META_MAX_MATCHES) -> None:
+        self.max_matches = max_matches
+        # match id -> its first row, oldest first
+        self.match_ids: dict[str, int] = {}
+        self.vocab: dict[str, dict[Any, int]] = {"unit": {}, "item": {}, "trait": {}, "combo": {}}
+        self.placement = array("B")
+        self.combo_code = array("I")
+        self.unit_code, self.unit_row = array("H"), array("I")
+        self.trait_code, self.trait_tier, self.trait_row = array("H"), array("B"), array("I")
+        self.carry_unit, self.carry_item, self.carry_row = array("H"), array("H"), array("I")
+
+    def _code(self, kind: str, value: Any) -> int:
+        codes = self.vocab[kind]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def ingest(self, match_id: str, participants: list[dict[str, Any]]) -> bool:
+        """Append one match's boards; returns False if the match was already ingested"""
+        if match_id in self.match_ids:
+            return False
+        self.match_ids[match_id] = len(self.placement)
+        for participant in participants:
+            row = len(self.placement)
+            self.placement.append(participant.get("placement", 8))
+
+            active = sorted(
+                (t["name"], t.get("tier_current", 0)) for t in participant.get("traits", []) if t.get("style", 0) > 0
+            )
+            for name, tier in active:
+                self.trait_code.append(self._code("trait", name))
+                self.trait_tier.append(tier)
+                self.trait_row.append(row)
+            # A board's identity is its silver-or-better traits
+            core = tuple(
+                (t["name"], t.get("tier_current", 0)) for t in participant.get("traits", []) if t.get("style", 0) >= 2
+            )
+            self.combo_code.append(self._code("combo", tuple(sorted(core))))
+
+            seen_units = set()
+            for unit in participant.get("units", []):
+                unit_code = self._code("unit", unit.get("character_id"))
+                if unit_code not in seen_units:
+                    seen_units.add(unit_code)
+                    self.unit_code.append(unit_code)
+                    self.unit_row.append(row)
+                items = unit.get("itemNames", [])
+                if len(items) >= 3:
+                    for item in items:
+                        self.carry_unit.append(unit_code)
+                        self.carry_item.append(self._code("item", item))
+                        self.carry_row.append(row)
+        if len(self.match_ids) > self.max_matches:
+            self.trim(int(self.max_matches * (1 - INDEX_TRIM_FRACTION)))
+        return True
+
+    def trim(self, keep: int) -> None:
+        """Drop the oldest ingested matches until `keep` remain"""
+        for match_id in list(self.match_ids)[: max(len(self.match_ids) - keep, 0)]:
+            del self.match_ids[match_id]
+        first_row = next(iter(self.match_ids.values()), len(self.placement))
+        del self.placement[:first_row]
+        del self.combo_code[:first_row]
+        for rows, *columns in (
+            (self.unit_row, self.unit_code),
+            (self.trait_row, self.trait_code, self.trait_tier),
+            (self.carry_row, self.carry_unit, self.carry_item),
+        ):
+            cut = bisect.bisect_left(rows, first_row)
+            for column in (rows, *columns):
+                del column[:cut]
+            rows[:] = array(rows.typecode, (row - first_row for row in rows))
+        self.match_ids = {match_id: row - first_row for match_id, row in self.match_ids.items()}
+        self.vocab["unit"] = compact_vocab(self.vocab["unit"], [self.unit_code, self.carry_unit])
+        self.vocab["trait"] = compact_vocab(self.vocab["trait"], [self.trait_code])
+        self.vocab["item"] = compact_vocab(self.vocab["item"], [self.carry_item])
+        self.vocab["combo"] = compact_vocab(self.vocab["combo"], [self.combo_code])
+
+    def stats(self) -> dict[str, Any]:
+        columns = (
+            self.placement, self.combo_code, self.unit_code, self.unit_row, self.trait_code, self.trait_tier,
+            self.trait_row, self.carry_unit, self.carry_item, self.carry_row,
+        )
+        return {
+            "matches": len(self.match_ids),
+            "maxMatches": self.max_matches,
+            "rows": len(self.placement),
+            "bytes": array_bytes(columns)
+            + sum(approximate_size(list(codes)) for codes in self.vocab.values())
+            + approximate_size(list(self.match_ids)),
+        }
+
+    def _group(self, keys: Any, rows: Any) -> dict[int, tuple[int, int, int, int]]:
+        """Group rows by key: (games, placement sum, top 4 count, wins)"""
+        placement = self.placement
+        games = Counter(keys)
+        totals: dict[int, int] = dict.fromkeys(games, 0)
+        top4: dict[int, int] = dict.fromkeys(games, 0)
+        wins: dict[int, int] = dict.fromkeys(games, 0)
+        for key, row in zip(keys, rows):
+            place = placement[row]
+            totals[key] += place
+            if place <= 4:
+                top4[key] += 1
+                if place == 1:
+                    wins[key] += 1
+        return {key: (count, totals[key], top4[key], wins[key]) for key, count in games.items()}
+
+    def placement_by(self, feature: str) -> list[tuple[Any, tuple[int, int, int, int]]]:
+        """Placement aggregates for "unit", "trait", "trait_combo", "item" or "carry_item" features"""
+        names = {kind: list(codes) for kind, codes in self.vocab.items()}
+        if feature == "unit":
+            grouped = self._group(self.unit_code, self.unit_row)
+            return [(names["unit"][k], v) for k, v in grouped.items()]
+        if feature == "trait":
+            keys = array("I", (code << 4 | tier for code, tier in zip(self.trait_code, self.trait_tier)))
+            grouped = self._group(keys, self.trait_row)
+            return [((names["trait"][k >> 4], k & 15), v) for k, v in grouped.items()]
+        if feature == "trait_combo":
+            grouped = self._group(self.combo_code, range(len(self.placement)))
+            return [(names["combo"][k], v) for k, v in grouped.items()]
+        if feature == "item":
+            grouped = self._group(self.carry_item, self.carry_row)
+            return [(names["item"][k], v) for k, v in grouped.items()]
+        if feature == "carry_item":
+            keys = array("I", (unit << 16 | item for unit, item in zip(self.carry_unit, self.carry_item)))
+            grouped = self._group(keys, self.carry_row)
+            return [((names["unit"][k >> 16], names["item"][k & 0xFFFF]), v) for k, v in grouped.items()]
+        raise ValueError(f"Unknown feature: {feature}")
+
+
+# TFT set number -> meta engine
+TFT_META: dict[int, TftMetaEngine] = {}
+
+
+def ingest_tft_meta(match: dict[str, Any]) -> None:
+    info = match.get("info", {})
+    if info.get("queue_id") != TFT_RANKED_QUEUE_ID:
+        return
+    engine = TFT_META.setdefault(info.get("tft_set_number", 0), TftMetaEngine())
+    engine.ingest(match["metadata"]["match_id"], info.get("participants", []))
+
+
+MATCH_INGESTORS["tft"].append(ingest_tft_meta)
+
+
+@mcp.tool(lane="bulk", bounded=False)
+async def tft_crawl_ladder(
+    platform: str = "na",
+    tier: Literal["CHALLENGER", "GRANDMASTER", "MASTER"] = "CHALLENGER",
+    players: int = 20,
+    matches_per_player: int = 20,
+    ctx: Context = None,
+) -> dict[str, Any]:
+    """
+    🕸️ Crawl recent ranked TFT matches of top ladder players into the meta aggregation.
+
+    Fetches the ladder, each player's recent match ids, then every unique match
+    concurrently. Matches feed tft_get_meta_stats incrementally.
+    """
+    regional_routing = resolve_route(platform, "match")
+    puuids = await get_ladder_puuids("tft", tier, platform, players)
+    if puuids is None:
+        return {"error": "Could not retrieve TFT ladder"}
+
+    id_lists = await fan_out(
+        puuids,
+        lambda puuid: get_match_ids(puuid, regional_routing=regional_routing, game="tft", count=matches_per_player),
+        ctx=ctx,
+        label="players",
+    )
+    match_ids = list(dict.fromkeys(match_id for ids in id_lists if ids for match_id in ids))
+    matches = await fan_out(
+        match_ids,
+        lambda match_id: get_match(match_id, regional_routing=regional_routing, game="tft"),
+        ctx=ctx,
+        label="matches",
+    )
+
+    return {
+        "platform": platform,
+        "tier": tier,
+        "playersCrawled": len(puuids),
+        "matchesFetched": sum(1 for match in matches if match),
+        "matchesIndexed": {set_number: len(engine.match_ids) for set_number, engine in TFT_META.items()},
+    }
+
+
+@mcp.tool()
+async def tft_get_meta_stats(
+    feature: Literal["unit", "trait", "trait_combo", "item", "carry_item"] = "unit",
+    set_number: int | None = None,
+    min_games: int = 10,
+    top: int = 20,
+) -> dict[str, Any]:
+    """
+    📊 Get TFT meta statistics from locally aggregated ranked matches.
+
+    Returns average placement, top 4 rate and win rate per unit, trait tier, trait
+    combination, item on a carry (3-item unit) or unit+item pair, best first.
+    Matches come from tft_crawl_ladder and any TFT match the server has fetched.
+    """
+    if not TFT_META:
+        return {"error": "No ranked TFT matches aggregated yet; run tft_crawl_ladder first"}
+    if set_number is None:
+        set_number = max(TFT_META)
+    engine = TFT_META.get(set_number)
+    if engine is None:
+        return {"error": f"No matches aggregated for TFT set {set_number}", "availableSets": sorted(TFT_META)}
+
+    stats = [
+        (value, games, total, top4, wins)
+        for value, (games, total, top4, wins) in engine.placement_by(feature)
+        if games >= min_games
+    ]
+    stats.sort(key=lambda s: s[2] / s[1])
+
+    def label(value: Any) -> Any:
+        if feature == "trait":
+            return {"trait": value[0], "tier": value[1]}
+        if feature == "trait_combo":
+            return [{"trait": name, "tier": tier} for name, tier in value]
+        if feature == "carry_item":
+            return {"unit": value[0], "item": value[1]}
+        return value
+
+    return {
+        "setNumber": set_number,
+        "feature": feature,
+        "matches": len(engine.match_ids),
+        "boards": len(engine.placement),
+        "stats": [
+            {
+                "value": label(value),
+                "games": games,
+                "avgPlacement": round(total / games, 2),
+                "top4Rate": round(top4 / games * 100, 1),
+                "winRate": round(wins / games * 100, 1),
+            }
+            for value, games, total, top4, wins in stats[:top]
+        ],
+    }
+
+
 @mcp.tool()
 async def tft_get_server_status(platform: str = "na") -> dict[str, Any]:
     """
@@ -901,8 +4384,13 @@ async def tft_get_server_status(platform: str = "na") -> dict[str, Any]:
 
     Returns TFT platform status and incidents.
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    status = await riot_request(f"/tft/status/v1/platform-data", platform_routing=platform_routing)
+    platform_routing = resolve_route(platform)
+    status = await riot_request(
+        "/tft/status/v1/platform-data",
+        platform_routing=platform_routing,
+        cache_ttl=STATUS_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
 
     if not status:
         return {"error": "Could not retrieve TFT server status"}
@@ -911,6 +4399,7 @@ async def tft_get_server_status(platform: str = "na") -> dict[str, Any]:
         "platform": platform,
         "platformId": status.get("id"),
         "platformName": status.get("name"),
+        "freshness": cache_freshness(),
         "maintenances": [
             {
                 "id": m.get("id"),
@@ -935,29 +4424,36 @@ async def tft_get_server_status(platform: str = "na") -> dict[str, Any]:
 
 
 @mcp.tool()
-async def tft_get_spectator(summoner_name: str, platform: str = "na") -> dict[str, Any]:
+async def tft_get_spectator(game_name: str, tag_line: str, platform: str = "na") -> dict[str, Any]:
     """
     👁️ Get live Team Fight Tactics game data for a player.
 
     Returns current TFT match info if player is playing.
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    
+    puuid = await get_puuid(game_name, tag_line, platform)
+    if not puuid:
+        return {"error": "Failed to find player"}
+
+    platform_routing = resolve_route(platform)
     spectator = await riot_request(
-        f"/tft/spectator/v5/active-games/by-summoner/{summoner_name}",
+        f"/lol/spectator/tft/v5/active-games/by-puuid/{puuid}",
         platform_routing=platform_routing,
+        cache_ttl=SPECTATOR_CACHE_TTL,
     )
-
     if not spectator:
-        return {"error": f"No active TFT game found for {summoner_name}"}
+        return {"error": f"No active TFT game found for {game_name}#{tag_line}"}
 
     return {
-        "gameName": summoner_name,
+        "gameName": game_name,
+        "tagLine": tag_line,
         "platform": platform,
         "gameType": spectator.get("gameType"),
+        "gameQueueConfigId": spectator.get("gameQueueConfigId"),
+        "gameStartTime": spectator.get("gameStartTime"),
         "participants": [
             {
-                "summonerName": p.get("summonerName"),
+                "riotId": p.get("riotId"),
+                "puuid": p.get("puuid"),
                 "teamId": p.get("teamId"),
             }
             for p in spectator.get("participants", [])
@@ -970,44 +4466,173 @@ async def tft_get_spectator(summoner_name: str, platform: str = "na") -> dict[st
 # ============================================================================
 
 
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def decode_deck_code(deck_code: str) -> dict[str, int]:
+    """
+    Decode a Legends of Runeterra deck code into {card code: count}.
+
+    The code is unpadded base32 of a format/version byte followed by varints: card groups
+    of 3, 2 and 1 copies (each group shares a set and faction), then cards with 4+ copies.
+    Raises ValueError for malformed codes.
+    """
+    try:
+        data = base64.b32decode(deck_code.upper() + "=" * (-len(deck_code) % 8))
+        cards: dict[str, int] = {}
+        offset = 1
+        for copies in (3, 2, 1):
+            groups, offset = _read_varint(data, offset)
+            for _ in range(groups):
+                group_size, offset = _read_varint(data, offset)
+                card_set, offset = _read_varint(data, offset)
+                faction, offset = _read_varint(data, offset)
+                for _ in range(group_size):
+                    number, offset = _read_varint(data, offset)
+                    cards[f"{card_set:02d}{LOR_FACTIONS[faction]}{number:03d}"] = copies
+        while offset < len(data):
+            copies, offset = _read_varint(data, offset)
+            card_set, offset = _read_varint(data, offset)
+            faction, offset = _read_varint(data, offset)
+            number, offset = _read_varint(data, offset)
+            cards[f"{card_set:02d}{LOR_FACTIONS[faction]}{number:03d}"] = copies
+    except (ValueError, IndexError, KeyError) as e:
+        raise ValueError(f"Invalid deck code: {deck_code}") from e
+    return cards
+
+
+def deck_fingerprint(cards: dict[str, int]) -> str:
+    """Canonical deck id: the same cards hash the same regardless of how the code was encoded"""
+    canonical = ",".join(f"{count}:{code}" for code, count in sorted(cards.items()))
+    return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
+
+def describe_deck(deck_code: str | None, with_cards: bool = False) -> dict[str, Any] | None:
+    """Decode a deck code into its fingerprint, regions and (optionally) card list"""
+    if not deck_code:
+        return None
+    try:
+        cards = decode_deck_code(deck_code)
+    except ValueError:
+        return None
+    deck = {
+        "fingerprint": deck_fingerprint(cards),
+        "factions": sorted({code[2:4] for code in cards}),
+        "cardCount": sum(cards.values()),
+    }
+    if with_cards:
+        deck["cards"] = [{"cardCode": code, "count": count} for code, count in sorted(cards.items())]
+    return deck
+
+
+# Deck fingerprint -> aggregated results from the LoR matches the server fetched most recently
+LOR_DECK_INDEX: dict[str, dict[str, Any]] = {}
+# Indexed match id -> (fingerprint, puuid, outcome) it added, oldest first, so old matches can be subtracted
+LOR_INDEXED_MATCHES: dict[str, list[tuple[str, str | None, str]]] = {}
+
+
+def ingest_lor_decks(match: dict[str, Any]) -> None:
+    match_id = match["metadata"]["match_id"]
+    if match_id in LOR_INDEXED_MATCHES:
+        return
+    added = LOR_INDEXED_MATCHES[match_id] = []
+    for player in match.get("info", {}).get("players", []):
+        deck = describe_deck(player.get("deck_code"))
+        if not deck:
+            continue
+        entry = LOR_DECK_INDEX.setdefault(
+            deck["fingerprint"],
+            {"deckCode": player["deck_code"], "factions": deck["factions"], "results": Counter(), "players": {}},
+        )
+        outcome = player.get("game_outcome", "unknown")
+        entry["results"][outcome] += 1
+        entry["players"].setdefault(player.get("puuid"), Counter())[outcome] += 1
+        added.append((deck["fingerprint"], player.get("puuid"), outcome))
+    if len(LOR_INDEXED_MATCHES) > LOR_DECKS_MAX_MATCHES:
+        trim_lor_decks(int(LOR_DECKS_MAX_MATCHES * (1 - INDEX_TRIM_FRACTION)))
+
+
+def trim_lor_decks(keep: int) -> None:
+    """Subtract the oldest indexed matches from the deck index until `keep` remain"""
+    for match_id in list(LOR_INDEXED_MATCHES)[: max(len(LOR_INDEXED_MATCHES) - keep, 0)]:
+        for fingerprint, puuid, outcome in LOR_INDEXED_MATCHES.pop(match_id):
+            entry = LOR_DECK_INDEX[fingerprint]
+            entry["results"][outcome] -= 1
+            players = entry["players"]
+            players[puuid][outcome] -= 1
+            players[puuid] = +players[puuid]
+            if not players[puuid]:
+                del players[puuid]
+            entry["results"] = +entry["results"]
+            if not entry["results"]:
+                del LOR_DECK_INDEX[fingerprint]
+
+
+def lor_deck_index_stats() -> dict[str, Any]:
+    return {
+        "matches": len(LOR_INDEXED_MATCHES),
+        "maxMatches": LOR_DECKS_MAX_MATCHES,
+        "decks": len(LOR_DECK_INDEX),
+        "bytes": approximate_size(LOR_DECK_INDEX) + approximate_size(LOR_INDEXED_MATCHES),
+    }
+
+
+MATCH_INGESTORS["lor"].append(ingest_lor_decks)
+
+
 @mcp.tool()
-async def lor_get_player_summary(game_name: str, tag_line: str, platform: str = "na") -> dict[str, Any]:
+async def lor_get_player_summary(
+    game_name: str, tag_line: str, platform: str = "na", ctx: Context = None
+) -> dict[str, Any]:
     """
     🃏 Get Legends of Runeterra player profile summary.
 
     Returns ranked tier, LP, and recent match data.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
+    regional_routing = resolve_route(platform, "lor")
 
     # Get LOR ranked stats
     ranked = await riot_regional_request(
         f"/lor/ranked/v1/leaderboards/by-puuid/{puuid}", regional_routing=regional_routing
     )
 
-    # Get recent LOR matches
-    match_ids = await riot_regional_request(
-        f"/lor/match/v1/matches/by-puuid/{puuid}/ids", regional_routing=regional_routing, params={"count": 10}
-    )
+    def summarize(match_id: str, match: dict[str, Any]) -> dict[str, Any] | None:
+        participant = next((p for p in match["info"]["players"] if p["puuid"] == puuid), None)
+        if not participant:
+            return None
+        return {
+            "matchId": match_id,
+            "placement": participant.get("placement"),
+            "factionId": participant.get("factionId"),
+            "deckCode": participant.get("deck_code"),
+            "deck": describe_deck(participant.get("deck_code")),
+        }
 
+    # Recent matches are optional: once the deadline budget runs out, return what was fetched
     recent_matches = []
-    if match_ids:
-        for match_id in match_ids[:5]:
-            match = await riot_regional_request(f"/lor/match/v1/matches/{match_id}", regional_routing=regional_routing)
-            if match:
-                participant = next((p for p in match["info"]["players"] if p["puuid"] == puuid), None)
-                if participant:
-                    recent_matches.append(
-                        {
-                            "matchId": match_id,
-                            "placement": participant.get("placement"),
-                            "factionId": participant.get("factionId"),
-                            "deckCode": participant.get("deck_code"),
-                        }
-                    )
+    with optional_budget():
+        try:
+            match_ids = await get_match_ids(puuid, regional_routing=regional_routing, game="lor", count=10)
+            if match_ids:
+                recent_matches = await fetch_matches(
+                    match_ids[:5], summarize, regional_routing=regional_routing, game="lor", ctx=ctx, partial=True
+                )
+                prefetch_matches(match_ids[5:], regional_routing=regional_routing, game="lor")
+        except DeadlineExceeded:
+            pass
+        partial = budget_exhausted()
 
     return {
         "gameName": game_name,
@@ -1019,43 +4644,44 @@ async def lor_get_player_summary(game_name: str, tag_line: str, platform: str =
             "lp": ranked.get("leaguePoints") if ranked else None,
         } if ranked else None,
         "recentMatches": recent_matches,
+        "partial": partial,
     }
 
 
 @mcp.tool()
-async def lor_get_recent_matches(game_name: str, tag_line: str, platform: str = "na", count: int = 10) -> dict[str, Any]:
+async def lor_get_recent_matches(
+    game_name: str, tag_line: str, platform: str = "na", count: int = 10, ctx: Context = None
+) -> dict[str, Any]:
     """
     🃏 Get Legends of Runeterra recent matches.
 
     Returns player's recent match history with deck and placement data.
+    Matches are fetched concurrently; progress and each finished row are streamed to the client.
     """
-    puuid = await get_puuid(game_name, tag_line)
+    puuid = await get_puuid(game_name, tag_line, platform)
     if not puuid:
         return {"error": "Failed to find player"}
 
-    regional_routing = PLATFORM_TO_REGION.get(platform, "americas")
-    match_ids = await riot_regional_request(
-        f"/lor/match/v1/matches/by-puuid/{puuid}/ids", regional_routing=regional_routing, params={"count": count}
-    )
+    regional_routing = resolve_route(platform, "lor")
+    match_ids = await get_match_ids(puuid, regional_routing=regional_routing, game="lor", count=count)
 
     if not match_ids:
         return {"gameName": game_name, "tagLine": tag_line, "puuid": puuid, "matches": []}
 
-    matches = []
-    for match_id in match_ids:
-        match = await riot_regional_request(f"/lor/match/v1/matches/{match_id}", regional_routing=regional_routing)
-        if match:
-            participant = next((p for p in match["info"]["players"] if p["puuid"] == puuid), None)
-            if participant:
-                matches.append(
-                    {
-                        "matchId": match_id,
-                        "placement": participant.get("placement"),
-                        "factionId": participant.get("factionId"),
-                        "deckCode": participant.get("deck_code"),
-                        "playerOrder": participant.get("player_order"),
-                    }
-                )
+    def summarize(match_id: str, match: dict[str, Any]) -> dict[str, Any] | None:
+        participant = next((p for p in match["info"]["players"] if p["puuid"] == puuid), None)
+        if not participant:
+            return None
+        return {
+            "matchId": match_id,
+            "placement": participant.get("placement"),
+            "factionId": participant.get("factionId"),
+            "deckCode": participant.get("deck_code"),
+            "deck": describe_deck(participant.get("deck_code"), with_cards=True),
+            "playerOrder": participant.get("player_order"),
+        }
+
+    matches = await fetch_matches(match_ids, summarize, regional_routing=regional_routing, game="lor", ctx=ctx)
 
     return {
         "gameName": game_name,
@@ -1065,6 +4691,59 @@ async def lor_get_recent_matches(game_name: str, tag_line: str, platform: str =
     }
 
 
+@mcp.tool()
+async def lor_get_deck_stats(
+    game_name: str | None = None,
+    tag_line: str | None = None,
+    platform: str = "na",
+    min_games: int = 3,
+    top: int = 10,
+) -> dict[str, Any]:
+    """
+    🃏 Get the best-performing Legends of Runeterra decks from the local deck index.
+
+    With a Riot ID, ranks that player's decks by their own record; otherwise ranks decks
+    across every indexed match. No matches are fetched: the index is built from LoR
+    matches the server has already loaded (lor_get_recent_matches, summaries). There is
+    no per-ladder view: the LoR leaderboard lists names without tag lines or PUUIDs.
+    """
+    puuid = None
+    if game_name and tag_line:
+        puuid = await get_puuid(game_name, tag_line, platform)
+        if not puuid:
+            return {"error": "Failed to find player"}
+
+    decks = []
+    for fingerprint, entry in LOR_DECK_INDEX.items():
+        results = entry["players"].get(puuid) if puuid else entry["results"]
+        if not results:
+            continue
+        games = sum(results.values())
+        if games < min_games:
+            continue
+        decks.append(
+            {
+                "fingerprint": fingerprint,
+                "deckCode": entry["deckCode"],
+                "factions": entry["factions"],
+                "games": games,
+                "wins": results["win"],
+                "losses": results["loss"],
+                "winRate": round(results["win"] / games * 100, 1),
+            }
+        )
+    decks.sort(key=lambda d: (d["winRate"], d["games"]), reverse=True)
+
+    return {
+        "gameName": game_name,
+        "tagLine": tag_line,
+        "puuid": puuid,
+        "platform": platform,
+        "indexedMatches": len(LOR_INDEXED_MATCHES),
+        "decks": decks[:top],
+    }
+
+
 @mcp.tool()
 async def lor_get_server_status(platform: str = "na") -> dict[str, Any]:
     """
@@ -1072,8 +4751,13 @@ async def lor_get_server_status(platform: str = "na") -> dict[str, Any]:
 
     Returns LoR platform status and incidents.
     """
-    platform_routing = PLATFORM_ROUTING.get(platform, "na1")
-    status = await riot_request(f"/lor/status/v1/platform-data", platform_routing=platform_routing)
+    platform_routing = resolve_route(platform)
+    status = await riot_request(
+        "/lor/status/v1/platform-data",
+        platform_routing=platform_routing,
+        cache_ttl=STATUS_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
 
     if not status:
         return {"error": "Could not retrieve LoR server status"}
@@ -1082,6 +4766,7 @@ async def lor_get_server_status(platform: str = "na") -> dict[str, Any]:
         "platform": platform,
         "platformId": status.get("id"),
         "platformName": status.get("name"),
+        "freshness": cache_freshness(),
     }
 
 
@@ -1099,10 +4784,11 @@ async def valorant_get_player_by_name(
 
     Returns player PUUID and account details.
     """
-    val_region = VALORANT_REGIONS.get(region, "na")
+    val_region = resolve_route(region, "valorant")
     
     try:
-        async with httpx.AsyncClient() as client:
+        require_api_key()
+        async with httpx.AsyncClient(transport=cassette_transport()) as client:
             headers = {"X-Riot-Token": RIOT_API_KEY}
             res = await client.get(
                 f"https://{val_region}.api.riotgames.com/valorant/v1/player-lookups/by-riot-id/{player_name}/{tag_line}",
@@ -1129,10 +4815,11 @@ async def valorant_get_ranked_stats(
 
     Returns ranked tier, RR points, and win/loss data.
     """
-    val_region = VALORANT_REGIONS.get(region, "na")
+    val_region = resolve_route(region, "valorant")
     
     try:
-        async with httpx.AsyncClient() as client:
+        require_api_key()
+        async with httpx.AsyncClient(transport=cassette_transport()) as client:
             headers = {"X-Riot-Token": RIOT_API_KEY}
             # First get PUUID
             res = await client.get(
@@ -1174,10 +4861,11 @@ async def valorant_get_match_history(
 
     Returns recent matches with placement and stats.
     """
-    val_region = VALORANT_REGIONS.get(region, "na")
+    val_region = resolve_route(region, "valorant")
     
     try:
-        async with httpx.AsyncClient() as client:
+        require_api_key()
+        async with httpx.AsyncClient(transport=cassette_transport()) as client:
             headers = {"X-Riot-Token": RIOT_API_KEY}
             # Get PUUID
             res = await client.get(
@@ -1224,45 +4912,402 @@ async def valorant_get_server_status(region: str = "na") -> dict[str, Any]:
 
     Returns VALORANT platform status and incidents.
     """
-    val_region = VALORANT_REGIONS.get(region, "na")
-    
+    val_region = resolve_route(region, "valorant")
+    status = await riot_request(
+        "/val/status/v1/platform-data",
+        platform_routing=val_region,
+        cache_ttl=STATUS_CACHE_TTL,
+        stale_ttl=SWR_MAX_STALE,
+    )
+
+    if not status:
+        return {"error": "Could not retrieve VALORANT server status"}
+
+    return {
+        "region": region,
+        "platformId": status.get("id"),
+        "platformName": status.get("name"),
+        "freshness": cache_freshness(),
+        "maintenances": [
+            {
+                "id": m.get("id"),
+                "title": next(
+                    (t.get("content") for t in m.get("titles", []) if t.get("locale") == "en_US"),
+                    "Maintenance"
+                ),
+            }
+            for m in status.get("maintenances", [])
+        ],
+        "incidents": [
+            {
+                "id": i.get("id"),
+                "title": next(
+                    (t.get("content") for t in i.get("titles", []) if t.get("locale") == "en_US"),
+                    "Incident"
+                ),
+            }
+            for i in status.get("incidents", [])
+        ],
+    }
+
+
+# ============================================================================
+# MATCH EXPORT
+# ============================================================================
+
+
+def flatten_lol_match(match: dict[str, Any]) -> list[dict[str, Any]]:
+    """One export row per participant of a LoL match"""
+    info = match["info"]
+    return [
+        {
+            "matchId": match["metadata"]["matchId"],
+            "gameCreation": info.get("gameCreation"),
+            "gameDuration": info.get("gameDuration"),
+            "gameVersion": info.get("gameVersion"),
+            "queueId": info.get("queueId"),
+            "puuid": p.get("puuid"),
+            "riotId": f"{p['riotIdGameName']}#{p.get('riotIdTagline', '')}" if p.get("riotIdGameName") else None,
+            "teamId": p.get("teamId"),
+            "win": p.get("win"),
+            "championId": p.get("championId"),
+            "championName": p.get("championName"),
+            "teamPosition": p.get("teamPosition"),
+            "champLevel": p.get("champLevel"),
+            "kills": p.get("kills"),
+            "deaths": p.get("deaths"),
+            "assists": p.get("assists"),
+            "cs": p.get("totalMinionsKilled", 0) + p.get("neutralMinionsKilled", 0),
+            "goldEarned": p.get("goldEarned"),
+            "damageToChampions": p.get("totalDamageDealtToChampions"),
+            "visionScore": p.get("visionScore"),
+            "items": [p.get(f"item{slot}", 0) for slot in range(7)],
+            "summonerSpells": [p.get("summoner1Id"), p.get("summoner2Id")],
+        }
+        for p in info.get("participants", [])
+    ]
+
+
+def flatten_tft_match(match: dict[str, Any]) -> list[dict[str, Any]]:
+    """One export row per participant of a TFT match; active traits and units as "name:tier" strings"""
+    info = match["info"]
+    return [
+        {
+            "matchId": match["metadata"]["match_id"],
+            "gameDatetime": info.get("game_datetime"),
+            "gameLength": info.get("game_length"),
+            "gameVersion": info.get("game_version"),
+            "queueId": info.get("queue_id"),
+            "setNumber": info.get("tft_set_number"),
+            "puuid": p.get("puuid"),
+            "placement": p.get("placement"),
+            "level": p.get("level"),
+            "goldLeft": p.get("gold_left"),
+            "lastRound": p.get("last_round"),
+            "totalDamageToPlayers": p.get("total_damage_to_players"),
+            "traits": [f"{t['name']}:{t.get('tier_current', 0)}" for t in p.get("traits", []) if t.get("tier_current")],
+            "units": [f"{u['character_id']}:{u.get('tier', 1)}" for u in p.get("units", [])],
+        }
+        for p in info.get("participants", [])
+    ]
+
+
+EXPORT_FLATTENERS = {"lol": flatten_lol_match, "tft": flatten_tft_match}
+
+
+class NdjsonExportWriter:
+    """Write export rows as newline-delimited JSON"""
+
+    def __init__(self, path: str, columns: list[tuple[str, str]]):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self.file.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ParquetExportWriter:
+    """Write export rows to a Parquet file, one row group per chunk"""
+
+    def __init__(self, path: str, columns: list[tuple[str, str]]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs the 'pyarrow' package (pip install pyarrow)") from e
+        types = {
+            "string": pa.string(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+            "list<int>": pa.list_(pa.int64()),
+            "list<string>": pa.list_(pa.string()),
+        }
+        self.table = pa.Table
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            self.writer.write_table(self.table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+EXPORT_WRITERS = {"ndjson": NdjsonExportWriter, "parquet": ParquetExportWriter}
+
+
+@mcp.tool(lane="bulk", bounded=False)
+async def riot_export_matches(
+    file_name: str,
+    game: Literal["lol", "tft"] = "lol",
+    riot_ids: list[str] | None = None,
+    ladder_tier: Literal["CHALLENGER", "GRANDMASTER", "MASTER"] | None = None,
+    ladder_players: int = 50,
+    platform: str = "na",
+    matches_per_player: int = 20,
+    file_format: Literal["ndjson", "parquet"] = "ndjson",
+    ctx: Context = None,
+) -> dict[str, Any]:
+    """
+    📦 Export LoL/TFT matches of a player list and/or ladder snapshot to an NDJSON or Parquet file.
+
+    Writes one flattened row per participant into the server's export directory. Matches are
+    fetched concurrently (from cache when already stored) and written in bounded chunks, so
+    large exports run at rate-limit speed without holding every match in memory.
+    """
+    if not file_name or os.path.basename(file_name) != file_name:
+        return {"error": "file_name must be a plain file name inside the export directory"}
+
+    regional_routing = resolve_route(platform, "match")
+    puuids = await get_player_pool(riot_ids, ladder_tier, ladder_players, platform, game, ctx)
+    if isinstance(puuids, dict):
+        return puuids
+
+    id_lists = await fan_out(
+        puuids,
+        lambda puuid: get_match_ids(puuid, regional_routing=regional_routing, game=game, count=matches_per_player),
+        ctx=ctx,
+        label="match id lists",
+    )
+    match_ids = list(dict.fromkeys(match_id for ids in id_lists for match_id in ids))
+
+    path = os.path.join(RIOT_EXPORT_DIR, file_name)
+    partial_path = f"{path}.partial"
+    await asyncio.to_thread(os.makedirs, RIOT_EXPORT_DIR, exist_ok=True)
     try:
-        async with httpx.AsyncClient() as client:
-            headers = {"X-Riot-Token": RIOT_API_KEY}
-            res = await client.get(
-                f"https://{val_region}.api.riotgames.com/val/status/v1/platform-data",
-                headers=headers,
-            )
-            res.raise_for_status()
-            status = res.json()
-            
-            return {
-                "region": region,
-                "platformId": status.get("id"),
-                "platformName": status.get("name"),
-                "maintenances": [
-                    {
-                        "id": m.get("id"),
-                        "title": next(
-                            (t.get("content") for t in m.get("titles", []) if t.get("locale") == "en_US"),
-                            "Maintenance"
-                        ),
-                    }
-                    for m in status.get("maintenances", [])
-                ],
-                "incidents": [
-                    {
-                        "id": i.get("id"),
-                        "title": next(
-                            (t.get("content") for t in i.get("titles", []) if t.get("locale") == "en_US"),
-                            "Incident"
-                        ),
-                    }
-                    for i in status.get("incidents", [])
-                ],
+        writer = await asyncio.to_thread(EXPORT_WRITERS[file_format], partial_path, EXPORT_COLUMNS[game])
+    except ImportError as e:
+        return {"error": str(e)}
+
+    flatten = EXPORT_FLATTENERS[game]
+    started = time.monotonic()
+    exported = rows = 0
+    try:
+        try:
+            for offset in range(0, len(match_ids), EXPORT_CHUNK_SIZE):
+                chunk = match_ids[offset : offset + EXPORT_CHUNK_SIZE]
+                matches = await fan_out(
+                    chunk, lambda match_id: get_match(match_id, regional_routing=regional_routing, game=game)
+                )
+                chunk_rows = [row for match in matches if match for row in flatten(match)]
+                await asyncio.to_thread(writer.write, chunk_rows)
+                exported += sum(1 for match in matches if match)
+                rows += len(chunk_rows)
+                done = offset + len(chunk)
+                await report_progress(ctx, done, len(match_ids), f"exported {done}/{len(match_ids)} matches")
+        finally:
+            await asyncio.to_thread(writer.close)
+    except BaseException:
+        # A failed, cancelled or timed-out export leaves no half-written file behind
+        try:
+            os.unlink(partial_path)
+        except OSError:
+            pass
+        raise
+    await asyncio.to_thread(os.replace, partial_path, path)
+
+    return {
+        "path": os.path.abspath(path),
+        "format": file_format,
+        "game": game,
+        "players": len(puuids),
+        "matchIds": len(match_ids),
+        "matchesExported": exported,
+        "rows": rows,
+        "bytes": os.path.getsize(path),
+        "elapsedSeconds": round(time.monotonic() - started, 1),
+    }
+
+
+# ============================================================================
+# SERVER DIAGNOSTICS
+# ============================================================================
+
+
+def process_usage() -> dict[str, float | None]:
+    """CPU seconds used by this process and its resident memory in MB (peak memory where /proc is missing)"""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            rss = peak / 2**20 if sys.platform == "darwin" else peak / 1024
+        except ImportError:
+            pass
+    return {"cpuSeconds": round(time.process_time(), 3), "rssMb": None if rss is None else round(rss, 1)}
+
+
+@mcp.tool()
+async def riot_profile_tool(
+    tool_name: str,
+    mode: Literal["sampling", "deterministic"] = "sampling",
+    calls: int = 10,
+    seconds: float | None = None,
+) -> dict[str, Any]:
+    """
+    🔬 Profile a tool's next `calls` calls (or its calls for the next `seconds`).
+
+    Sampling shows where each call spends wall time, CPU and waiting on the network alike;
+    deterministic runs calls under cProfile for exact per-function times. calls=0 profiles every
+    call until `seconds` pass. Fetch the result with riot_get_profile. Tools that are not being
+    profiled pay no overhead.
+    """
+    fn = mcp.tool_function(tool_name)
+    if fn is None:
+        return {"error": f"Unknown tool: {tool_name}"}
+    PROFILES[tool_name] = ToolProfile(tool_name, fn, mode, calls if calls > 0 else sys.maxsize, seconds)
+    return {"tool": tool_name, "mode": mode, "calls": calls, "seconds": seconds, "status": "armed"}
+
+
+@mcp.tool()
+async def riot_get_profile(
+    tool_name: str, file_name: str | None = None, top: int = 20, stop: bool = True
+) -> dict[str, Any]:
+    """
+    🔬 Get the profile collected by riot_profile_tool.
+
+    Sampling profiles return the hottest collapsed stacks and functions and the share of time spent
+    waiting; deterministic profiles return the top functions by cumulative time. With a file name
+    the full profile is written to the profile directory: collapsed stacks (flamegraph.pl, inferno,
+    speedscope) or a .prof file (snakeviz, flameprof). `stop` disarms the profile afterwards.
+    """
+    profile = PROFILES.pop(tool_name, None) if stop else PROFILES.get(tool_name)
+    if profile is None:
+        return {"error": f"No profile for {tool_name}; start one with riot_profile_tool"}
+    if file_name is not None and (not file_name or os.path.basename(file_name) != file_name):
+        return {"error": "file_name must be a plain file name inside the profile directory"}
+
+    result: dict[str, Any] = {
+        "tool": tool_name,
+        "mode": profile.mode,
+        "callsProfiled": profile.calls,
+        "avgCallMs": round(profile.wall_time / profile.calls * 1000, 1) if profile.calls else None,
+        "armed": profile.armed and not stop,
+    }
+    if profile.mode == "deterministic":
+        if profile.profiler is None:
+            return {**result, "functions": []}
+        import pstats
+
+        stats = pstats.Stats(profile.profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        result["functions"] = [
+            {
+                "function": f"{name} ({os.path.basename(path)}:{line})",
+                "calls": calls,
+                "ownMs": round(own * 1000, 2),
+                "cumulativeMs": round(cumulative * 1000, 2),
             }
-    except Exception as e:
-        return {"error": f"Failed to retrieve server status: {str(e)}"}
+            for (path, line, name), (_, calls, own, cumulative, _) in rows
+        ]
+    else:
+        # The sampler thread may still be adding samples; dict.copy is atomic
+        stacks = Counter(dict.copy(profile.stacks))
+        samples = sum(stacks.values())
+        waiting = sum(n for stack, n in stacks.items() if stack.endswith(";(waiting)"))
+        own: Counter[str] = Counter()
+        for stack, n in stacks.items():
+            if not stack.endswith(";(waiting)"):
+                own[stack.rpartition(";")[2]] += n
+        result.update(
+            {
+                "samples": samples,
+                "sampleIntervalMs": PROFILE_SAMPLE_INTERVAL * 1000,
+                "waitingShare": round(waiting / samples, 3) if samples else None,
+                "topStacks": [{"stack": stack, "samples": n} for stack, n in stacks.most_common(top)],
+                "topFunctions": [{"function": name, "samples": n} for name, n in own.most_common(top)],
+            }
+        )
+
+    if file_name:
+        os.makedirs(RIOT_PROFILE_DIR, exist_ok=True)
+        path = os.path.join(RIOT_PROFILE_DIR, file_name)
+        if profile.mode == "deterministic" and profile.profiler is not None:
+            profile.profiler.dump_stats(path)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(f"{stack} {n}\n" for stack, n in dict.copy(profile.stacks).items())
+        result["path"] = os.path.abspath(path)
+    return result
+
+
+@mcp.tool()
+async def riot_get_diagnostics() -> dict[str, Any]:
+    """
+    🩺 Get the server's cache and background work counters.
+
+    Returns process CPU time and memory, per-cache resident size and eviction counts, the size of
+    the local match indexes, upstream calls avoided by negative caching, stale-while-revalidate hits,
+    prefetch activity, per-lane request queue depth and wait times, and each host's adaptive
+    concurrency limit.
+    """
+    return {
+        "process": process_usage(),
+        "sharedBackend": RIOT_BACKEND.shared,
+        "memory": {
+            **(
+                {
+                    "budgetBytes": int(RIOT_BACKEND.memory_budget),
+                    "residentBytes": RIOT_BACKEND.resident_bytes,
+                    "caches": {name: cache.stats() for name, cache in RIOT_BACKEND.caches.items()},
+                }
+                if not RIOT_BACKEND.shared
+                else {}
+            ),
+            "championIndexLanguages": sorted(CHAMPION_INDEX),
+            "challengeConfigPlatforms": sorted(CHALLENGE_CONFIGS),
+            "masterySnapshotPlayers": len(MASTERY_SNAPSHOTS),
+            "indexes": {
+                "lolBuilds": LOL_BUILDS.stats(),
+                "tftMeta": {set_number: engine.stats() for set_number, engine in sorted(TFT_META.items())},
+                "lorDecks": lor_deck_index_stats(),
+            },
+        },
+        "notFoundCache": {
+            **NOT_FOUND_STATS,
+            "ttls": {"default": NOT_FOUND_CACHE_TTL, "spectator": SPECTATOR_NOT_FOUND_TTL, "riotId": RIOT_ID_NOT_FOUND_TTL},
+        },
+        "staleWhileRevalidate": {**SWR_STATS, "revalidating": len(_REVALIDATIONS)},
+        "prefetch": {**PREFETCH_STATS, "enabled": PREFETCH_ENABLED, "pending": len(_PREFETCH_PENDING)},
+        "matchIdCache": {**MATCH_IDS_STATS},
+        "leaderboard": {
+            "trackedPlayers": len(LEADERBOARD.tracked),
+            "gamesInWindow": len(LEADERBOARD.counted),
+            "championQueues": len(LEADERBOARD.totals),
+            "cachedRankings": sum(len(rankings) for rankings in LEADERBOARD.rankings.values()),
+        },
+        "lanes": lane_metrics(),
+        "concurrency": concurrency_metrics(),
+        "cassette": {"mode": _CASSETTE.mode, "path": _CASSETTE.path, "misses": _CASSETTE.misses} if _CASSETTE else None,
+    }
 
 
 # ============================================================================
@@ -1358,4 +5403,11 @@ async def get_match_summary(match_id: str, puuid: str) -> dict[str, Any] | str:
 
 
 if __name__ == "__main__":
-    mcp.run()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Riot Games MCP server")
+    parser.add_argument("--transport", choices=["stdio", "sse"], default="stdio")
+    args = parser.parse_args()
+
+    require_api_key()
+    mcp.run(transport=args.transport)
@@ -0,0 +1,42 @@
+"""Shared fixtures: the server module runs against the synthetic Riot API (RIOT_CASSETTE_MODE=stub)."""
+
+import asyncio
+import os
+
+os.environ.setdefault("RIOT_CASSETTE_MODE", "stub")
+os.environ.setdefault("RIOT_STUB_LATENCY", "0.02")
+os.environ.setdefault("RIOT_PREFETCH", "0")
+
+import httpx
+import pytest
+
+import riot_stub
+import server
+
+
+class CountingStub(riot_stub.StubRiotTransport):
+    """Stub transport that records the path and host of every request it receives"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+        self.hosts: list[str] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        self.hosts.append(request.url.host)
+        return await super().handle_async_request(request)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """A fresh in-memory backend, host queues and HTTP client answered by a CountingStub"""
+    transport = CountingStub()
+    monkeypatch.setattr(server, "RIOT_BACKEND", server.MemoryBackend())
+    monkeypatch.setattr(server, "_HTTP_CLIENT", httpx.AsyncClient(transport=transport))
+    monkeypatch.setattr(server, "_HOST_LANES", {})
+    monkeypatch.setattr(server, "_HOST_CONCURRENCY", {})
+    monkeypatch.setattr(server, "APP_RATE_LIMITS", {})
+    monkeypatch.setattr(server, "METHOD_RATE_LIMITS", {})
+    yield transport
+    asyncio.run(server._HTTP_CLIENT.aclose())
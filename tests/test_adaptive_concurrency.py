@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import server
+
+FAST = 0.01
+
+
+async def succeed(limiter: server.AdaptiveConcurrency, times: int) -> None:
+    """Complete `times` fast requests, keeping every slot of the limit in use, then drop the rest"""
+    for _ in range(times):
+        while limiter.in_flight < int(limiter.limit):
+            await limiter.acquire()
+        limiter.release(time.monotonic() - FAST, "ok")
+    while limiter.in_flight:
+        limiter.release(time.monotonic(), "error")
+
+
+def test_limit_halves_on_429_once_per_burst():
+    limiter = server.AdaptiveConcurrency()
+    start = limiter.limit
+
+    async def run():
+        await succeed(limiter, 1)
+        sent = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        for _ in range(3):
+            limiter.release(sent, "throttled")
+
+    asyncio.run(run())
+    assert limiter.limit < start
+    assert limiter.decreases == 1
+    assert limiter.last_signal == "throttled"
+
+
+def test_limit_drops_on_a_latency_spike():
+    limiter = server.AdaptiveConcurrency()
+
+    async def run():
+        await succeed(limiter, 5)
+        before = limiter.limit
+        await limiter.acquire()
+        limiter.release(time.monotonic() - server.LATENCY_SPIKE_FLOOR * 4, "ok")
+        return before
+
+    before = asyncio.run(run())
+    assert limiter.limit == max(before * server.ADAPTIVE_BACKOFF, server.ADAPTIVE_MIN_CONCURRENCY)
+    assert limiter.last_signal == "latency"
+
+
+def test_limit_recovers_after_successes():
+    limiter = server.AdaptiveConcurrency()
+    start = limiter.limit
+
+    async def run():
+        await limiter.acquire()
+        limiter.release(time.monotonic(), "throttled")
+        cut = limiter.limit
+        await succeed(limiter, 40)
+        return cut
+
+    cut = asyncio.run(run())
+    assert cut < start
+    assert limiter.limit > start
+    assert limiter.increases >= 40
@@ -0,0 +1,106 @@
+import asyncio
+import random
+
+import server
+
+
+def stats(backend, partition):
+    return backend.caches[partition].stats()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = server.BoundedCache("test", "lru")
+    for key in ("a", "b", "c"):
+        cache.put(key, key, expires_at=100.0, size=10)
+    cache.get("a", now=0.0)
+    cache.evict_one()
+    assert list(cache.entries) == ["c", "a"]
+    assert cache.bytes == 20
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lfu_evicts_least_used():
+    cache = server.BoundedCache("test", "lfu")
+    for key in ("a", "b", "c"):
+        cache.put(key, key, expires_at=100.0, size=10)
+    cache.get("a", now=0.0)
+    cache.get("b", now=0.0)
+    cache.evict_one()
+    assert set(cache.entries) == {"a", "b"}
+
+
+def test_expired_entries_count_as_misses():
+    cache = server.BoundedCache("test")
+    cache.put("a", 1, expires_at=10.0, size=5)
+    assert cache.get("a", now=5.0) == 1
+    assert cache.get("a", now=20.0) is None
+    assert cache.stats() | {"policy": None} == {
+        "policy": None, "entries": 0, "bytes": 0, "hits": 1, "misses": 1, "evictions": 0, "expirations": 1
+    }
+
+
+def test_memory_budget_evicts_from_largest_partition():
+    async def run():
+        backend = server.MemoryBackend(memory_budget=2000)
+        await backend.set("ddragon:version", "1.0", 60)
+        for i in range(20):
+            await backend.set(f"https://americas.api.riotgames.com/lol/match/v5/matches/NA1_{i}", {"i": "x" * 50}, 60)
+        assert backend.resident_bytes <= 2000
+        assert stats(backend, "matches")["evictions"] > 0
+        assert await backend.get("ddragon:version") == "1.0"
+
+    asyncio.run(run())
+
+
+def test_control_keys_are_not_counted_as_cache_traffic(upstream):
+    url = "/lol/match/v5/matches/STUB_player_0"
+
+    async def run():
+        for _ in range(3):
+            await server.riot_regional_request(url, "americas", cache_ttl=60)
+        await server.riot_regional_request("/lol/match/v5/matches/NA1_missing", "americas", cache_ttl=60)
+
+    asyncio.run(run())
+    matches = stats(server.RIOT_BACKEND, "matches")
+    assert (matches["hits"], matches["misses"], matches["entries"]) == (2, 2, 1)
+    assert stats(server.RIOT_BACKEND, "other")["misses"] == 0
+    assert any(key.startswith("404:") for key in server.RIOT_BACKEND.control)
+
+
+def test_lfu_eviction_matches_a_full_scan():
+    rng = random.Random(7)
+    cache = server.BoundedCache("test", "lfu")
+    uses: dict[str, int] = {}
+    for step in range(2000):
+        key = f"k{rng.randrange(50)}"
+        action = rng.random()
+        if action < 0.4:
+            cache.put(key, step, expires_at=100.0, size=1)
+            uses.pop(key, None)
+            uses[key] = 1
+        elif action < 0.8:
+            if cache.get(key, now=0.0) is not None:
+                uses[key] += 1
+        elif action < 0.9:
+            cache.discard(key)
+            uses.pop(key, None)
+        elif uses:
+            fewest = min(uses.values())
+            cache.evict_one()
+            evicted = set(uses) - set(cache.entries)
+            assert len(evicted) == 1 and uses.pop(evicted.pop()) == fewest
+    assert cache.uses == uses
+
+
+def test_fetched_responses_are_sized_from_their_body(upstream, monkeypatch):
+    sized = []
+    approximate_size = server.approximate_size
+
+    def spy(value, encoded_size=None):
+        sized.append(encoded_size)
+        return approximate_size(value, encoded_size)
+
+    monkeypatch.setattr(server, "approximate_size", spy)
+    asyncio.run(server.riot_regional_request("/lol/match/v5/matches/STUB_player_0", "americas", cache_ttl=60))
+    assert len(sized) == 1 and sized[0] > 0
+    assert stats(server.RIOT_BACKEND, "matches")["bytes"] == sized[0] * server.CACHE_OBJECT_OVERHEAD
@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+import httpx
+
+import riot_stub
+import server
+
+URLS = [
+    "https://americas.api.riotgames.com/riot/account/v1/accounts/by-riot-id/A/B",
+    "https://na1.api.riotgames.com/lol/league/v4/entries/by-puuid/stub-A",
+    "https://americas.api.riotgames.com/lol/match/v5/matches/STUB_stub-A_0",
+]
+
+
+def test_replay_serves_recorded_responses_and_counts_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "CASSETTE_FLUSH_RECORDS", 2)
+    path = str(tmp_path / "cassette.jsonl.gz")
+
+    async def record():
+        recorder = server.Cassette(path, "record")
+        transport = server.CassetteTransport(recorder)
+        await transport.inner.aclose()
+        transport.inner = riot_stub.StubRiotTransport(latency=0)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [(await client.get(url)).json() for url in URLS]
+
+    async def replay():
+        player = server.Cassette(path, "replay", latency_scale=0)
+        async with httpx.AsyncClient(transport=server.CassetteTransport(player)) as client:
+            served = [(await client.get(url)).json() for url in URLS]
+            missing = await client.get(URLS[0].replace("/A/B", "/C/D"))
+        return player, served, missing
+
+    recorded = asyncio.run(record())
+    player, served, missing = asyncio.run(replay())
+    assert served == recorded
+    assert missing.status_code == 404
+    assert player.misses == 1
+    assert sum(len(entries) for entries in player.responses.values()) == len(URLS)
+    assert json.loads(player.responses[f"GET {URLS[1]}"][0]["body"]) == recorded[1]
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+import riot_stub
+import server
+
+CONFIG_PATHS = {"/lol/challenges/v1/challenges/config", "/lol/challenges/v1/challenges/percentiles"}
+
+
+@pytest.fixture
+def challenges(upstream, monkeypatch):
+    """The stub with an empty per-process challenge config cache"""
+    monkeypatch.setattr(server, "CHALLENGE_CONFIGS", {})
+    return upstream
+
+
+def config_hosts(transport) -> list[str]:
+    return [host for path, host in zip(transport.calls, transport.hosts) if path in CONFIG_PATHS]
+
+
+def test_challenge_config_is_loaded_once_per_platform(challenges):
+    async def run():
+        await server.lol_get_challenges("Faker", "KR1", "na")
+        await server.lol_get_top_challenges(["Faker#KR1", "Chovy#KR1"], "na")
+        await server.lol_get_challenges("Faker", "KR1", "euw")
+
+    asyncio.run(run())
+    assert sorted(config_hosts(challenges)) == sorted(["na1.api.riotgames.com"] * 2 + ["euw1.api.riotgames.com"] * 2)
+    assert set(server.CHALLENGE_CONFIGS) == {"na1", "euw1"}
+
+
+def test_challenge_config_is_shared_through_the_backend(challenges, monkeypatch):
+    asyncio.run(server.get_challenge_config("na"))
+    monkeypatch.setattr(server, "CHALLENGE_CONFIGS", {})
+
+    config = asyncio.run(server.get_challenge_config("na"))
+    assert len(config_hosts(challenges)) == 2
+    assert config.name(202303) == ("Jungle Diff", "Stub challenge Jungle Diff")
+
+
+def test_challenge_entries_have_name_and_next_threshold(challenges):
+    result = asyncio.run(server.lol_get_challenges("Faker", "KR1", "na"))
+
+    entries = {entry["challengeId"]: entry for entry in result["challenges"]}
+    assert entries.keys() == riot_stub.STUB_CHALLENGES.keys()
+    assert entries[101000]["name"] == "ARAM Authority"
+    assert entries[101000]["nextThreshold"] == 250
+    assert entries[202303]["nextThreshold"] == 75
+    assert entries[301100]["nextThreshold"] is None
+
+
+def test_top_challenges_are_ranked_by_percentile(challenges):
+    result = asyncio.run(server.lol_get_top_challenges(["Faker#KR1"], "na", top=2))
+
+    top = result["players"][0]["topChallenges"]
+    assert [entry["name"] for entry in top] == ["ARAM Authority", "Jungle Diff"]
+    assert top[0]["nextLevel"] == "PLATINUM"
+    assert top[0]["levelTopPercent"] == 50.0
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import server
+
+CHAMPIONS = {
+    "Kayn": ("141", "Kayn"),
+    "Kayle": ("10", "Kayle"),
+    "Kaisa": ("145", "Kai'Sa"),
+    "Karma": ("43", "Karma"),
+    "XinZhao": ("5", "Xin Zhao"),
+    "Yasuo": ("157", "Yasuo"),
+    "Yone": ("777", "Yone"),
+    "MonkeyKing": ("62", "Wukong"),
+    "Ezreal": ("81", "Ezreal"),
+}
+
+
+def champion_data():
+    return {
+        champion_id: {"key": key, "id": champion_id, "name": name} for champion_id, (key, name) in CHAMPIONS.items()
+    }
+
+
+@pytest.fixture(scope="module")
+def index():
+    return server.build_champion_index(champion_data())
+
+
+@pytest.mark.parametrize("query, key", [("Kai'Sa", 145), ("kaisa", 145), ("MonkeyKing", 62), ("ez", 81), ("157", 157)])
+def test_exact_names_ids_aliases_and_keys(index, query, key):
+    match = index.lookup(query)
+    assert (match.key, match.kind) == (key, "exact")
+
+
+def test_clear_typo_resolves_as_fuzzy(index):
+    match = index.lookup("Yasou")
+    assert (match.key, match.kind) == (157, "fuzzy")
+
+
+def test_tied_candidates_are_ambiguous_and_ordered(index):
+    match = index.lookup("Kayne")
+    assert (match.key, match.kind) == (None, "ambiguous")
+    assert match.alternatives == ["Kayle", "Kayn"]
+
+
+@pytest.mark.parametrize("query, alternatives", [("ka", ["Kai'Sa", "Karma", "Kayle", "Kayn"]), ("xi", ["Xin Zhao"])])
+def test_short_queries_are_never_guessed(index, query, alternatives):
+    match = index.lookup(query)
+    assert match.key is None
+    assert match.alternatives == alternatives
+
+
+def test_unknown_champion_error_suggests_alternatives(index):
+    assert server.unknown_champion("Kayne", index.lookup("Kayne")) == {
+        "error": "Champion 'Kayne' not found",
+        "didYouMean": ["Kayle", "Kayn"],
+    }
+    assert server.unknown_champion("Zzzzz", index.lookup("Zzzzz")) == {"error": "Champion 'Zzzzz' not found"}
+
+
+def test_lookup_does_not_depend_on_hash_seed():
+    script = (
+        "import server\n"
+        f"index = server.build_champion_index({champion_data()!r})\n"
+        "print([(m.key, m.kind, m.alternatives) for m in map(index.lookup, ['Kayne', 'Kaysa', 'Yasou', 'Kar'])])"
+    )
+    src = Path(server.__file__).parent
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env={**os.environ, "PYTHONHASHSEED": str(seed), "PYTHONPATH": str(src)},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in range(4)
+    }
+    assert len(outputs) == 1
@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "RIOT_EXPORT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_ndjson_export_writes_one_row_per_participant(upstream, export_dir):
+    result = asyncio.run(
+        server.riot_export_matches("games.ndjson", riot_ids=["player#STUB"], matches_per_player=3)
+    )
+    lines = (export_dir / "games.ndjson").read_text().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert (result["matchesExported"], result["rows"]) == (3, 30)
+    assert len(rows) == 30
+    assert {row["matchId"] for row in rows} == {f"STUB_stub-player_{i}" for i in range(3)}
+    assert set(rows[0]) == {name for name, _ in server.EXPORT_COLUMNS["lol"]}
+    assert [path.name for path in export_dir.iterdir()] == ["games.ndjson"]
+
+
+def test_failed_export_removes_the_partial_file(upstream, export_dir, monkeypatch):
+    def broken(match):
+        raise RuntimeError("flatten failed")
+
+    monkeypatch.setitem(server.EXPORT_FLATTENERS, "lol", broken)
+    with pytest.raises(RuntimeError):
+        asyncio.run(server.riot_export_matches("games.ndjson", riot_ids=["player#STUB"], matches_per_player=3))
+    assert list(export_dir.iterdir()) == []
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+import server
+
+MATCH_IDS = [f"STUB_player_{i}" for i in range(50)]
+
+
+def summarize(match_id, match):
+    return {"matchId": match_id}
+
+
+def test_fan_out_keeps_input_order(upstream):
+    rows = asyncio.run(server.fetch_matches(MATCH_IDS[:10], summarize))
+    assert [row["matchId"] for row in rows] == MATCH_IDS[:10]
+
+
+def test_cancelled_fan_out_stops_upstream_calls(upstream):
+    async def run():
+        call = asyncio.create_task(server.fetch_matches(MATCH_IDS, summarize))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        made = len(upstream.calls)
+        await asyncio.sleep(0.5)
+        assert 0 < made < len(MATCH_IDS)
+        assert len(upstream.calls) == made
+        assert not server._SINGLE_FLIGHT
+
+    asyncio.run(run())
+
+
+def test_fan_out_past_deadline_stops_upstream_calls(upstream):
+    async def run():
+        server._DEADLINE.set(time.monotonic() + 0.05)
+        rows = await server.fetch_matches(MATCH_IDS, summarize, partial=True)
+        made = len(upstream.calls)
+        await asyncio.sleep(0.5)
+        assert len(rows) < len(MATCH_IDS)
+        assert len(upstream.calls) == made
+
+    asyncio.run(run())
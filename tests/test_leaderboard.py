@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import server
+
+DAY = 86400
+
+
+def match(match_id: str, ended: float, participants: list[tuple[str, int, bool]], queue_id: int = 420) -> dict:
+    return {
+        "metadata": {"matchId": match_id},
+        "info": {
+            "gameEndTimestamp": int(ended * 1000),
+            "queueId": queue_id,
+            "participants": [
+                {"puuid": puuid, "championId": champion_id, "win": win, "kills": 5, "deaths": 2, "assists": 3}
+                for puuid, champion_id, win in participants
+            ],
+        },
+    }
+
+
+def test_only_tracked_players_are_counted_once():
+    board = server.ChampionLeaderboard()
+    board.track(["a", "b"])
+    game = match("m1", time.time(), [("a", 103, True), ("b", 103, False), ("c", 103, True)])
+    assert board.ingest(game) == 2
+    assert board.ingest(game) == 0
+    assert board.ingest(match("old", time.time() - 31 * DAY, [("a", 103, True)])) == 0
+    assert board.totals[(103, 420)] == {"a": [1, 1, 5, 2, 3], "b": [1, 0, 5, 2, 3]}
+    assert board.totals[(103, server.ALL_QUEUES)] == board.totals[(103, 420)]
+    assert [puuid for puuid, _ in board.top(103, 420, "winRate", 1)] == ["a", "b"]
+
+
+def test_expired_days_are_subtracted_and_rankings_refreshed(monkeypatch):
+    now = time.time()
+    board = server.ChampionLeaderboard()
+    board.track(["a", "b"])
+    board.ingest(match("early", now - 29 * DAY, [("a", 103, True)]))
+    board.ingest(match("early2", now - 29 * DAY, [("a", 157, True)]))
+    board.ingest(match("late", now - DAY, [("a", 103, False), ("b", 103, True)]))
+    assert board.top(103, 420, "games", 1)[0] == ("a", [2, 1, 10, 4, 6])
+
+    monkeypatch.setattr(server.time, "time", lambda: now + 2 * DAY)
+    assert board.expire() == 2
+    assert board.totals[(103, 420)] == {"a": [1, 0, 5, 2, 3], "b": [1, 1, 5, 2, 3]}
+    assert (157, 420) not in board.totals
+    assert board.top(103, 420, "winRate", 1)[0][0] == "b"
+    assert ("early", "a") not in board.counted
+
+
+def test_tracked_players_rank_from_fetched_matches(upstream, monkeypatch):
+    monkeypatch.setattr(server, "LEADERBOARD", server.ChampionLeaderboard())
+
+    async def run():
+        tracked = await server.lol_track_players(riot_ids=["player#STUB"], matches_per_player=4)
+        board = await server.lol_get_champion_leaderboard("Ahri", min_games=1)
+        return tracked, board
+
+    tracked, board = asyncio.run(run())
+    assert (tracked["trackedPlayers"], tracked["gamesInWindow"]) == (1, 4)
+    assert board["champion"] == "Ahri"
+    assert [(row["puuid"], row["games"], row["winRate"]) for row in board["leaderboard"]] == [("stub-player", 1, 100.0)]
+    assert board["leaderboard"][0]["riotId"] == "player#STUB"
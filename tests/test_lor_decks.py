@@ -0,0 +1,101 @@
+import asyncio
+import base64
+from collections import Counter
+
+import pytest
+
+import server
+
+FACTION_IDS = {faction: faction_id for faction_id, faction in server.LOR_FACTIONS.items()}
+
+
+def varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte, value = value & 0x7F, value >> 7
+        out.append(byte | (0x80 if value else 0))
+        if not value:
+            return bytes(out)
+
+
+def encode_deck_code(cards: dict[str, int], reverse_groups: bool = False) -> str:
+    """Reference encoder following github.com/RiotGames/LoRDeckCodes"""
+    data = bytearray([0x11])
+    for copies in (3, 2, 1):
+        groups: dict[tuple[int, int], list[int]] = {}
+        for code, count in cards.items():
+            if count == copies:
+                groups.setdefault((int(code[:2]), FACTION_IDS[code[2:4]]), []).append(int(code[4:]))
+        data += varint(len(groups))
+        for (card_set, faction), numbers in sorted(groups.items(), reverse=reverse_groups):
+            data += varint(len(numbers)) + varint(card_set) + varint(faction)
+            for number in sorted(numbers, reverse=reverse_groups):
+                data += varint(number)
+    for code, count in sorted(cards.items()):
+        if count > 3:
+            data += varint(count) + varint(int(code[:2])) + varint(FACTION_IDS[code[2:4]]) + varint(int(code[4:]))
+    return base64.b32encode(bytes(data)).decode().rstrip("=")
+
+
+CARDS = {"01DE001": 3, "01DE012": 3, "01NX020": 2, "02BW005": 1, "04SH130": 3, "05BC200": 2, "01IO009": 6}
+
+
+def test_deck_code_round_trip():
+    assert server.decode_deck_code(encode_deck_code(CARDS)) == CARDS
+
+
+def test_fingerprint_ignores_encoding_order():
+    forward, backward = encode_deck_code(CARDS), encode_deck_code(CARDS, reverse_groups=True)
+    assert forward != backward
+    assert server.describe_deck(forward)["fingerprint"] == server.describe_deck(backward)["fingerprint"]
+    deck = server.describe_deck(forward, with_cards=True)
+    assert deck["factions"] == ["BC", "BW", "DE", "IO", "NX", "SH"]
+    assert deck["cardCount"] == sum(CARDS.values())
+
+
+@pytest.mark.parametrize("code", ["", "not-base32!", "CEAAECABAQ"])
+def test_malformed_codes_raise(code):
+    with pytest.raises(ValueError):
+        server.decode_deck_code(code)
+
+
+def test_deck_index_keeps_most_recent_matches(monkeypatch):
+    monkeypatch.setattr(server, "LOR_DECK_INDEX", {})
+    monkeypatch.setattr(server, "LOR_INDEXED_MATCHES", {})
+    monkeypatch.setattr(server, "LOR_DECKS_MAX_MATCHES", 10)
+    decks = [encode_deck_code({"01DE001": 3, f"01NX{n:03d}": 3}) for n in range(4)]
+    for n in range(25):
+        server.ingest_lor_decks({
+            "metadata": {"match_id": f"m{n}"},
+            "info": {"players": [
+                {"puuid": "a", "deck_code": decks[n % 4], "game_outcome": "win"},
+                {"puuid": "b", "deck_code": decks[(n + 1) % 4], "game_outcome": "loss"},
+            ]},
+        })
+    kept = [int(match_id[1:]) for match_id in server.LOR_INDEXED_MATCHES]
+    assert len(kept) <= 10 and kept == list(range(25 - len(kept), 25))
+    expected: Counter = Counter()
+    for n in kept:
+        expected[(server.describe_deck(decks[n % 4])["fingerprint"], "win")] += 1
+        expected[(server.describe_deck(decks[(n + 1) % 4])["fingerprint"], "loss")] += 1
+    actual = Counter({
+        (fingerprint, outcome): count
+        for fingerprint, entry in server.LOR_DECK_INDEX.items()
+        for outcome, count in entry["results"].items()
+    })
+    assert actual == expected
+    assert server.lor_deck_index_stats()["matches"] == len(kept)
+
+
+def test_player_deck_stats_use_the_platform_account_cluster(upstream, monkeypatch):
+    monkeypatch.setattr(server, "LOR_DECK_INDEX", {})
+    monkeypatch.setattr(server, "LOR_INDEXED_MATCHES", {})
+    deck = encode_deck_code({"01DE001": 3, "01NX001": 3})
+    for n in range(3):
+        server.ingest_lor_decks({
+            "metadata": {"match_id": f"m{n}"},
+            "info": {"players": [{"puuid": "stub-A", "deck_code": deck, "game_outcome": "win"}]},
+        })
+    result = asyncio.run(server.lor_get_deck_stats("A", "B", platform="euw"))
+    assert upstream.hosts == ["europe.api.riotgames.com"]
+    assert [d["wins"] for d in result["decks"]] == [3]
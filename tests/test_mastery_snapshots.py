@@ -0,0 +1,33 @@
+import asyncio
+from collections import OrderedDict
+
+import server
+
+
+def test_snapshots_evict_the_least_recently_used_player(upstream, monkeypatch):
+    monkeypatch.setattr(server, "MASTERY_SNAPSHOTS", OrderedDict())
+    monkeypatch.setattr(server, "MASTERY_SNAPSHOT_PLAYERS", 2)
+
+    async def run():
+        await server.get_mastery_snapshot("stub-a")
+        await server.get_mastery_snapshot("stub-b")
+        # Polling a keeps it, so adding c drops b
+        assert server.cached_mastery_snapshot("stub-a") is not None
+        await server.get_mastery_snapshot("stub-c")
+
+    asyncio.run(run())
+    assert [puuid for _, puuid in server.MASTERY_SNAPSHOTS] == ["stub-a", "stub-c"]
+
+
+def test_point_gains_compare_the_oldest_and_latest_snapshot(upstream, monkeypatch):
+    monkeypatch.setattr(server, "MASTERY_SNAPSHOTS", OrderedDict())
+
+    async def run():
+        first = await server.get_mastery_snapshot("stub-a")
+        first["masteries"][103] = {**first["masteries"][103], "championPoints": 1000}
+        await server.get_mastery_snapshot("stub-a", refresh=True)
+
+    asyncio.run(run())
+    since, gains = server.mastery_point_gains("stub-a")
+    assert since is not None
+    assert gains == {103: 103 * 1000 - 1000}
@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+import pytest
+
+import server
+
+PUUID = "stub-player"
+IDS_PATH = f"/lol/match/v5/matches/by-puuid/{PUUID}/ids"
+CACHE_KEY = f"ids:lol:americas:{PUUID}"
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    fresh = {name: 0 for name in server.MATCH_IDS_STATS}
+    monkeypatch.setattr(server, "MATCH_IDS_STATS", fresh)
+    return fresh
+
+
+def expected_ids(count: int) -> list[str]:
+    return [f"STUB_{PUUID}_{i}" for i in range(count)]
+
+
+def test_smaller_windows_reuse_the_cached_page_and_larger_ones_fetch_the_tail(upstream, stats, monkeypatch):
+    requested: list[tuple[int, int]] = []
+    handle = upstream.handle_async_request
+
+    async def recording(request: httpx.Request) -> httpx.Response:
+        requested.append((int(request.url.params["start"]), int(request.url.params["count"])))
+        return await handle(request)
+
+    monkeypatch.setattr(upstream, "handle_async_request", recording)
+
+    async def run():
+        return [await server.get_match_ids(PUUID, count=count) for count in (20, 50, 150)]
+
+    windows = asyncio.run(run())
+    assert windows == [expected_ids(20), expected_ids(50), expected_ids(150)]
+    assert requested == [(0, server.MATCH_IDS_PAGE_SIZE), (server.MATCH_IDS_PAGE_SIZE, 50)]
+    assert stats == {"served": 1, "extended": 1, "headRefreshed": 0, "fetched": 1}
+
+
+def test_failed_head_refresh_is_not_counted(upstream, stats, monkeypatch):
+    async def unavailable(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    async def run():
+        await server.get_match_ids(PUUID, count=20)
+        entry = await server.RIOT_BACKEND.get(CACHE_KEY)
+        entry["fetchedAt"] -= server.MATCH_IDS_FRESH_TTL
+        monkeypatch.setattr(upstream, "handle_async_request", unavailable)
+        return await server.get_match_ids(PUUID, count=20)
+
+    assert asyncio.run(run()) == expected_ids(20)
+    assert stats["headRefreshed"] == 0
@@ -0,0 +1,68 @@
+import server
+
+
+def lol_participants(n: int) -> list[dict]:
+    return [
+        {
+            "championId": 103 if i < 5 else 238,
+            "item0": 3000 + n,
+            "summoner1Id": 4,
+            "summoner2Id": 14,
+            "perks": {"styles": [{"style": 8100, "selections": [{"perk": 8112}]}]},
+            "teamPosition": "MIDDLE",
+            "win": i < 5,
+        }
+        for i in range(10)
+    ]
+
+
+def test_lol_build_index_keeps_most_recent_matches():
+    index = server.LolBuildIndex(max_matches=10)
+    for n in range(25):
+        assert index.ingest(f"NA1_{n}", 420, lol_participants(n))
+    assert len(index.match_ids) <= 10
+    assert list(index.match_ids) == [f"NA1_{n}" for n in range(25 - len(index.match_ids), 25)]
+    items = index.count(103)["items"]
+    assert set(items) == {(3000 + n,) for n in range(25 - len(index.match_ids), 25)}
+    assert all(games == wins == 5 for games, wins in items.values())
+    assert len(index.vocab["items"]) == len(index.match_ids)
+    stats = index.stats()
+    assert stats["rows"] == 10 * len(index.match_ids) and stats["bytes"] > 0
+
+
+def test_trimmed_match_can_be_ingested_again():
+    index = server.LolBuildIndex(max_matches=2)
+    for n in range(3):
+        index.ingest(f"NA1_{n}", 420, lol_participants(n))
+    assert "NA1_0" not in index.match_ids
+    assert index.ingest("NA1_0", 420, lol_participants(0))
+
+
+def tft_participants(n: int) -> list[dict]:
+    return [
+        {
+            "placement": place,
+            "traits": [
+                {"name": f"Trait{n % 3}", "tier_current": 2, "style": 2},
+                {"name": "Sorc", "tier_current": 1, "style": 1},
+            ],
+            "units": [
+                {"character_id": f"Unit{n}", "itemNames": ["A", "B", f"Item{n}"]},
+                {"character_id": "Ahri", "itemNames": []},
+            ],
+        }
+        for place in range(1, 9)
+    ]
+
+
+def test_tft_meta_engine_trim_matches_a_fresh_engine():
+    trimmed = server.TftMetaEngine(max_matches=10)
+    for n in range(25):
+        trimmed.ingest(f"NA1_{n}", tft_participants(n))
+    fresh = server.TftMetaEngine()
+    for match_id in trimmed.match_ids:
+        fresh.ingest(match_id, tft_participants(int(match_id[4:])))
+    assert len(trimmed.match_ids) <= 10
+    for feature in ("unit", "trait", "trait_combo", "item", "carry_item"):
+        assert sorted(trimmed.placement_by(feature)) == sorted(fresh.placement_by(feature))
+    assert trimmed.stats()["rows"] == 8 * len(trimmed.match_ids)
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def not_found(upstream, monkeypatch):
+    """Every upstream path answers 404"""
+    monkeypatch.setattr(upstream, "routes", [])
+    monkeypatch.setattr(server, "NOT_FOUND_STATS", {"cached": 0, "avoided": 0})
+    return upstream
+
+
+def test_repeated_404_is_answered_from_the_negative_cache(not_found):
+    url = "/lol/match/v5/matches/NA1_missing"
+
+    async def run():
+        return [await server.riot_regional_request(url, "americas", cache_ttl=60) for _ in range(3)]
+
+    assert asyncio.run(run()) == [None, None, None]
+    assert not_found.calls == [url]
+    assert server.NOT_FOUND_STATS == {"cached": 1, "avoided": 2}
+
+
+@pytest.mark.parametrize(
+    "url, routing, ttl",
+    [
+        ("/lol/spectator/v5/active-games/by-summoner/stub-A", "na1", server.SPECTATOR_NOT_FOUND_TTL),
+        ("/riot/account/v1/accounts/by-riot-id/A/B", "americas", server.RIOT_ID_NOT_FOUND_TTL),
+        ("/lol/match/v5/matches/NA1_missing", "americas", server.NOT_FOUND_CACHE_TTL),
+    ],
+)
+def test_negative_cache_ttl_follows_the_method_table(not_found, url, routing, ttl):
+    before = time.time()
+    asyncio.run(server.riot_regional_request(url, routing))
+    expires_at, _ = server.RIOT_BACKEND.control[f"404:{server.response_cache_key(routing, url, None)}"]
+    assert before + ttl <= expires_at <= time.time() + ttl
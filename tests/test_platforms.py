@@ -0,0 +1,30 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+def call(name, arguments):
+    return json.loads(asyncio.run(server.mcp.call_tool(name, arguments))[0].text)
+
+
+def test_resolve_route_suggests_close_platform():
+    with pytest.raises(server.UnknownPlatform) as raised:
+        server.resolve_route("euw9")
+    assert raised.value.suggestion == "Did you mean 'euw'?"
+
+
+def test_resolve_route_lists_platforms_with_the_family():
+    with pytest.raises(server.UnknownPlatform) as raised:
+        server.resolve_route("pbe", "valorant")
+    assert "pbe" not in raised.value.suggestion
+    assert "na" in raised.value.suggestion
+
+
+def test_unknown_platform_is_a_tool_result(upstream):
+    result = call("lol_get_player_summary", {"game_name": "A", "tag_line": "B", "platform": "nax"})
+    assert result["error"].startswith("Unknown platform 'nax'")
+    assert result["suggestion"] == "Did you mean 'na'?"
+    assert upstream.calls == []
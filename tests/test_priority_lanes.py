@@ -0,0 +1,33 @@
+import asyncio
+
+import server
+
+
+def test_bulk_lane_keeps_its_share_while_interactive_work_is_queued(monkeypatch):
+    monkeypatch.setattr(server, "LANE_STATS", {lane: dict(stats) for lane, stats in server.LANE_STATS.items()})
+    order: list[str] = []
+
+    async def run():
+        lanes = server.PriorityLanes()
+        await lanes.admit("interactive")
+
+        async def request(lane: str) -> None:
+            await lanes.admit(lane)
+            order.append(lane)
+            lanes.release()
+
+        tasks = [asyncio.create_task(request("interactive")) for _ in range(50)]
+        tasks += [asyncio.create_task(request("bulk")) for _ in range(20)]
+        await asyncio.sleep(0)
+        lanes.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert len(order) == 70
+    assert order[0] == "interactive"
+    share = server.LANE_MIN_SHARE["bulk"]
+    for admitted in range(1, 56):
+        assert order[:admitted].count("bulk") >= int(admitted * share)
+    # Outside its share the bulk lane waits until no interactive request is queued
+    assert order[:55].count("bulk") == 5
+    assert order[55:] == ["bulk"] * 15
@@ -0,0 +1,39 @@
+import asyncio
+
+import server
+
+
+def window_counts(window: int) -> int:
+    return sum(count for key, (_, count) in server.RIOT_BACKEND.counters.items() if f":{window}:" in key)
+
+
+def test_waiting_requests_are_counted_once(upstream):
+    server.APP_RATE_LIMITS["na1"] = [(3, 1), (100, 10)]
+
+    async def run():
+        await asyncio.gather(*(server.acquire_rate_limit("na1", "/lol/status/v4/platform-data") for _ in range(6)))
+
+    asyncio.run(run())
+    assert window_counts(10) == 6
+    assert max(count for key, (_, count) in server.RIOT_BACKEND.counters.items() if ":1:" in key) <= 3
+
+
+def test_method_window_rejection_rolls_back_app_window(upstream):
+    server.APP_RATE_LIMITS["na1"] = [(100, 10)]
+    server.METHOD_RATE_LIMITS[("na1", "/m")] = [(2, 1)]
+
+    async def run():
+        await asyncio.gather(*(server.acquire_rate_limit("na1", "/m") for _ in range(4)))
+
+    asyncio.run(run())
+    assert window_counts(10) == 4
+
+
+def test_rollback_never_goes_below_zero():
+    async def run():
+        backend = server.MemoryBackend()
+        assert await backend.incr("rl:key", ttl=5) == 1
+        assert await backend.incr("rl:key", ttl=5, amount=-1) == 0
+        assert await backend.incr("rl:key", ttl=5, amount=-1) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+def test_shared_fetch_survives_one_cancelled_caller():
+    async def run():
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "value"
+
+        first = asyncio.create_task(server.single_flight("key", fetch))
+        second = asyncio.create_task(server.single_flight("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "value"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert calls == 1
+        assert not server._SINGLE_FLIGHT and not server._SINGLE_FLIGHT_WAITERS
+
+    asyncio.run(run())
+
+
+def test_shared_fetch_cancelled_with_last_caller():
+    async def run():
+        started, finished = asyncio.Event(), False
+
+        async def fetch():
+            nonlocal finished
+            started.set()
+            await asyncio.sleep(0.05)
+            finished = True
+
+        callers = [asyncio.create_task(server.single_flight("key", fetch)) for _ in range(3)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.1)
+        assert not finished
+        assert not server._SINGLE_FLIGHT and not server._SINGLE_FLIGHT_WAITERS
+
+    asyncio.run(run())
+
+
+def test_new_caller_after_cancellation_starts_a_new_fetch():
+    async def run():
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "value"
+
+        caller = asyncio.create_task(server.single_flight("key", fetch))
+        await asyncio.sleep(0)
+        caller.cancel()
+        assert await server.single_flight("key", fetch) == "value"
+
+    asyncio.run(run())
+
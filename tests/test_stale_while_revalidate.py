@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import httpx
+
+import server
+
+STATUS_PATH = "/lol/status/v4/platform-data"
+SWR_KEY = "swr:" + server.response_cache_key("na1", STATUS_PATH, None)
+
+
+async def server_status() -> dict:
+    result = await server.mcp.call_tool("lol_get_server_status", {})
+    return json.loads(result[0].text)
+
+
+async def make_stale() -> None:
+    entry = await server.RIOT_BACKEND.get(SWR_KEY)
+    entry = {**entry, "fetchedAt": entry["fetchedAt"] - server.STATUS_CACHE_TTL - 1}
+    await server.RIOT_BACKEND.set(SWR_KEY, entry, server.STATUS_CACHE_TTL + server.SWR_MAX_STALE)
+
+
+def test_stale_entry_is_served_and_revalidated_once(upstream):
+    async def run():
+        assert (await server_status())["freshness"] == {"ageSeconds": 0, "stale": False}
+        await make_stale()
+        served = await asyncio.gather(*(server_status() for _ in range(5)))
+        await asyncio.gather(*server._REVALIDATIONS)
+        return served, await server_status()
+
+    served, refreshed = asyncio.run(run())
+    assert all(result["freshness"]["stale"] for result in served)
+    assert all(result["freshness"]["ageSeconds"] > server.STATUS_CACHE_TTL for result in served)
+    assert upstream.calls.count(STATUS_PATH) == 2
+    assert refreshed["freshness"]["stale"] is False
+
+
+def test_failed_revalidation_keeps_the_stale_entry(upstream, monkeypatch):
+    async def unavailable(request: httpx.Request) -> httpx.Response:
+        upstream.calls.append(request.url.path)
+        return httpx.Response(503)
+
+    async def run():
+        await server_status()
+        await make_stale()
+        stale_entry = await server.RIOT_BACKEND.get(SWR_KEY)
+        monkeypatch.setattr(upstream, "handle_async_request", unavailable)
+        served = await server_status()
+        await asyncio.gather(*server._REVALIDATIONS)
+        return stale_entry, await server.RIOT_BACKEND.get(SWR_KEY), served
+
+    stale_entry, kept_entry, served = asyncio.run(run())
+    assert upstream.calls.count(STATUS_PATH) == 2
+    assert kept_entry == stale_entry
+    assert "error" not in served
+    assert served["freshness"]["stale"] is True